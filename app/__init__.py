@@ -1,38 +1,72 @@
+import os
+
 from flask import Flask
-from .config import Config
-from .extensions import db, migrate, jwt, cache, limiter
+from .config import CONFIGS
+from .extensions import db, jwt, cache, limiter, hasher, metrics, profiler, sql_instrumentation, writer
 from .models import User, Task  # 🔹 import models BEFORE create_all
 from .errors import register_error_handlers
-import flask_monitoringdashboard as dashboard
-import logging
-from flasgger import Swagger
-from logging.handlers import RotatingFileHandler
-import os
+from .commands import register_commands
+from .logging_setup import configure_logging
+from .db_profile import configure_engine_options, init_engine_profile
+from .db_routing import init_read_engines
+from .json_provider import JSON_PROVIDERS
+from .auth.context import init_app as init_auth_context
+from .capture import init_app as init_capture
+from .sql_instrumentation import observe_engines
+from .startup import init_fork_safety, freeze_heap
+
+
+def _loaded_by_flask_cli():
+    """True when the ``flask`` command is loading the app (e.g. for ``flask db``)."""
+    import click
+    from flask.cli import ScriptInfo
+
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and ctx.find_object(ScriptInfo) is not None
 
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
+    if config_class is None:
+        config_class = CONFIGS[os.getenv("APP_CONFIG", "development")]
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = JSON_PROVIDERS[app.config["JSON_PROVIDER"]](app)
 
     # --- Security / JWT ---
     app.config["JWT_SECRET_KEY"] = "super-secret-key"  # ⚠️ change in production
 
-    # --- Cache defaults (set BEFORE init_app) ---
-    app.config.setdefault("CACHE_TYPE", "SimpleCache")
-    app.config.setdefault("CACHE_DEFAULT_TIMEOUT", 60)
-
     # --- Initialize extensions ---
     from app.extensions import db,jwt, cache, limiter
+    configure_engine_options(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    writer.init_app(app)  # may tighten SQLITE_PRAGMAS, so before the profile is applied
+    with app.app_context():
+        engines = list(db.engines.values()) + init_read_engines(app)
+    init_engine_profile(app, engines)
+    # 🔹 Flask-Migrate pulls in alembic; only the `flask db` commands need it
+    if _loaded_by_flask_cli():
+        from flask_migrate import Migrate
+        Migrate(app, db)
     jwt.init_app(app)
     cache.init_app(app)
+    if not app.config["RATELIMIT_STORAGE_URI"]:
+        os.makedirs(app.instance_path, exist_ok=True)
+        app.config["RATELIMIT_STORAGE_URI"] = f"sqlite:///{os.path.join(app.instance_path, 'ratelimit.db')}"
     limiter.init_app(app)
-    Swagger(app)
+    hasher.init_app(app)
+    init_auth_context(app)
+    metrics.init_app(app)
+    sql_instrumentation.init_app(app)
+    profiler.init_app(app)
+    observe_engines(app, engines)  # after the observers above are added
+    if app.config["SWAGGER_ENABLED"]:
+        from flasgger import Swagger
+        Swagger(app)
 
     # 🔹 Rebuild tables (make sure models are imported before this!)
-    with app.app_context():
-        db.create_all()
+    if app.config["AUTO_CREATE_TABLES"]:
+        with app.app_context():
+            db.create_all()
 
     # --- Blueprints ---
     from app.routes.tasks import task_bp
@@ -41,34 +75,37 @@ def create_app(config_class=Config):
     app.register_blueprint(task_bp, url_prefix="/tasks")
     app.register_blueprint(auth_bp, url_prefix="/auth")
 
-    # --- Flask Monitoring Dashboard ---
-    dashboard.bind(app)
+    # --- Flask Monitoring Dashboard (optional; writes a SQLite row per request) ---
+    if app.config["MONITORING_DASHBOARD_ENABLED"]:
+        import flask_monitoringdashboard as dashboard
+        dashboard.bind(app)
 
     # --- Root health check ---
     @app.route("/")
     def home():
-        return {"status": "ok", "service": "Task Manager API"}
+        from app.services.cache_service import cache_stats
+        return {
+            "status": "ok",
+            "service": "Task Manager API",
+            "cache": cache_stats(),
+        }
 
     # --- Error handlers ---
     register_error_handlers(app)
 
+    # --- CLI commands ---
+    register_commands(app)
+
+    # --- Traffic capture (opt-in WSGI middleware) ---
+    init_capture(app)
+
     # --- Logging Setup ---
-    if not os.path.exists("logs"):
-        os.mkdir("logs")
-
-    file_handler = RotatingFileHandler(
-        "logs/app.log", maxBytes=10240, backupCount=5
-    )
-    file_handler.setFormatter(logging.Formatter(
-        "%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]"
-    ))
-    file_handler.setLevel(logging.INFO)
-
-    # Prevent duplicate handlers in debug/reload
-    if not app.logger.handlers:
-        app.logger.addHandler(file_handler)
-
-    app.logger.setLevel(logging.INFO)
+    configure_logging(app)
     app.logger.info("App startup")
 
+    # --- Preload/fork support (gunicorn --preload) ---
+    init_fork_safety(app)
+    if app.config["GC_FREEZE"]:
+        freeze_heap()
+
     return app
@@ -0,0 +1,430 @@
+"""ASGI serving mode: async handlers for the hot /tasks and /auth routes.
+
+Reads run on an async SQLAlchemy engine (aiosqlite for SQLite files), so a
+request waiting on the database no longer holds a thread. Writes reuse the
+synchronous services in a worker thread inside a Flask app context, and
+password hashing runs in an executor. Every other route (search, stats,
+export/import, batch, /metrics, the API docs) is served by the Flask app
+through a WSGI bridge, so the HTTP contract is the same in both modes.
+
+The native handlers report latency, status and in-flight requests to
+/metrics, but skip the other Flask request hooks: they are not captured
+for replay (CAPTURE_ENABLED), get no X-SQL-* headers or N+1 warnings from
+the SQL instrumentation (slow statements are still logged) and are never
+profiled. Use the WSGI mode to capture or profile those routes.
+
+Run with ``uvicorn asgi:app`` (see ``asgi.py`` at the repo root).
+"""
+import time
+from contextlib import asynccontextmanager
+
+import sqlalchemy as sa
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import create_access_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from limits import parse as parse_limit
+from marshmallow import ValidationError
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from werkzeug.http import parse_etags
+
+from app import create_app
+from app.auth.context import verify_token
+from app.db_profile import apply_sqlite_pragmas
+from app.extensions import db, hasher, limiter
+from app.group_commit import WriteTimeout
+from app.hashing import HashingBusy
+from app.models import Task, TaskStats, User
+from app.schemas.task_schema import task_rows, task_schema, task_update_schema
+from app.services.etag_service import url_etag
+from app.services.pagination import MAX_ID, InvalidCursor, decode_cursor, encode_cursor, keyset_per_page
+from app.services.task_service import create_task, remove_task, update_task
+from app.sql_instrumentation import observe_engines
+
+# sync driver -> async driver for the same database
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(uri):
+    url = make_url(uri)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}")
+    return url.set(drivername=driver)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+
+class AsyncTaskAPI:
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        config = flask_app.config
+        options = {
+            k: v for k, v in config["SQLALCHEMY_ENGINE_OPTIONS"].items()
+            if k in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle",
+                     "pool_pre_ping", "connect_args")
+        }
+        self.engine = create_async_engine(async_database_url(config["SQLALCHEMY_DATABASE_URI"]), **options)
+        if config["DB_ENGINE_PROFILE_RESOLVED"] == "sqlite":
+            apply_sqlite_pragmas(self.engine.sync_engine, config["SQLITE_PRAGMAS"], flask_app.logger)
+        observe_engines(flask_app, [self.engine.sync_engine])
+        self.metrics = flask_app.extensions.get("metrics")
+
+    # --- Plumbing ---
+
+    def json(self, data, status=200, headers=None):
+        body = self.flask_app.json.response(data).get_data()
+        return Response(body, status, headers=headers, media_type="application/json")
+
+    def unavailable(self, message):
+        return self.json({"error": "Service unavailable", "message": message}, 503, {"Retry-After": "1"})
+
+    def in_app_context(self, fn, *args):
+        """Run sync Flask/SQLAlchemy code in a worker thread with an app context."""
+        def call():
+            with self.flask_app.app_context():
+                return fn(*args)
+        return run_in_threadpool(call)
+
+    def route(self, path, endpoint, handler, methods):
+        """Starlette route that reports to /metrics under the Flask rule name."""
+        async def endpoint_fn(request):
+            metrics = self.metrics if self.flask_app.config["METRICS_ENABLED"] else None
+            start = time.perf_counter()
+            if metrics is not None:
+                metrics.request_started()  # on the event loop thread, like request_finished
+            try:
+                response = await handler(request)
+            except HTTPError as e:
+                response = self.json(e.body, e.status)
+            except HashingBusy:
+                response = self.unavailable("Password hashing is overloaded, retry shortly")
+            except WriteTimeout:
+                response = self.unavailable("Write queue is overloaded, retry shortly")
+            finally:
+                if metrics is not None:
+                    metrics.request_finished()
+            if metrics is not None:
+                metrics.observe_request(request.method, endpoint, response.status_code,
+                                        time.perf_counter() - start)
+            return response
+        return Route(path, endpoint_fn, methods=methods)
+
+    async def rate_limit(self, name, endpoint, key):
+        """Hit the ``name`` limit in the bucket Flask-Limiter uses for ``endpoint``."""
+        if not self.flask_app.config.get("RATELIMIT_ENABLED", True):
+            return
+        item = parse_limit(self.flask_app.config[name])
+        allowed = await run_in_threadpool(limiter.limiter.hit, item, key, endpoint)
+        if not allowed:
+            raise HTTPError(429, {"error": "Too many requests", "message": str(item)})
+
+    def token_error(self, e):
+        """The Flask app's reply to a token error (flask_jwt_extended's handlers)."""
+        with self.flask_app.test_request_context():
+            try:
+                response = self.flask_app.make_response(self.flask_app.handle_user_exception(e))
+            except Exception:
+                return HTTPError(422, {"msg": str(e)})
+        return HTTPError(response.status_code, response.get_json())
+
+    def authenticate(self, request):
+        """Claims of the request's access token, with flask_jwt_extended's error replies."""
+        parts = request.headers.get("authorization", "").split()
+        if not parts:
+            raise HTTPError(401, {"msg": "Missing Authorization Header"})
+        if len(parts) != 2 or parts[0] != "Bearer":
+            raise HTTPError(422, {"msg": "Bad Authorization header. Expected 'Authorization: Bearer <JWT>'"})
+        try:
+            with self.flask_app.app_context():
+                _, claims = verify_token(parts[1])
+        except (PyJWTError, JWTExtendedException) as e:
+            raise self.token_error(e) from None
+        return claims
+
+    async def etag_check(self, conn, request, user_id):
+        """``(etag, not_modified_response)`` for a conditional task read."""
+        version = await conn.scalar(sa.select(User.tasks_version).where(User.id == user_id))
+        if version is None:
+            return None, None
+        etag = url_etag(user_id, version, request.url.path, sorted(request.query_params.multi_items()))
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "private, no-cache"}
+        if parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+            return headers, Response(status_code=304, headers=headers)
+        return headers, None
+
+    # --- /tasks ---
+
+    async def list_tasks(self, request):
+        claims = self.authenticate(request)
+        user_id = claims["sub"]
+        await self.rate_limit("RATELIMIT_TASKS", "tasks.list_tasks", f"user:{user_id}")
+        args = request.query_params
+
+        page = _int_arg(args, "page", 1)
+        per_page = _int_arg(args, "per_page", 5)
+        done = {"true": True, "1": True, "false": False, "0": False}.get((args.get("done") or "").lower())
+
+        query = sa.select(*task_rows.columns).where(Task.user_id == user_id)
+        if done is not None:
+            query = query.where(Task.done == done)
+
+        async with self.engine.connect() as conn:
+            headers, not_modified = await self.etag_check(conn, request, user_id)
+            if not_modified is not None:
+                return not_modified
+
+            if "cursor" in args or "after_id" in args:
+                try:
+                    after_id = decode_cursor(args.get("cursor"))
+                except InvalidCursor:
+                    return self.json({"errors": {"cursor": "Invalid cursor"}}, 400)
+                if after_id is None:
+                    after_id = _int_arg(args, "after_id", None)
+                    if after_id is not None and not 0 <= after_id <= MAX_ID:
+                        return self.json({"errors": {"after_id": "Invalid after_id"}}, 400)
+                per_page = keyset_per_page(per_page)
+                if after_id is not None:
+                    query = query.where(Task.id > after_id)
+                rows = (await conn.execute(query.order_by(Task.id).limit(per_page + 1))).all()
+                next_cursor = None
+                if len(rows) > per_page:
+                    rows = rows[:per_page]
+                    next_cursor = encode_cursor(rows[-1].id)
+                result = {"tasks": task_rows.dump_many(rows), "per_page": per_page, "next_cursor": next_cursor}
+                if (args.get("with_total") or "").lower() in ["true", "1"]:
+                    result["total"] = await self._task_total(conn, user_id, done)
+                self.flask_app.logger.info("Tasks listed for user %s, after %s", user_id, after_id,
+                                           extra={"sample": True})
+                return self.json(result, headers=headers)
+
+            # Same page/per_page fallbacks as Flask-SQLAlchemy's paginate(error_out=False)
+            page = page if page >= 1 else 1
+            per_page = per_page if per_page >= 1 else 20
+            rows = (await conn.execute(
+                query.order_by(Task.id).limit(per_page).offset((page - 1) * per_page)
+            )).all()
+            total = await self._task_total(conn, user_id, done)
+
+        self.flask_app.logger.info("Tasks listed for user %s, page %s", user_id, page, extra={"sample": True})
+        return self.json({
+            "tasks": task_rows.dump_many(rows),
+            "total": total,
+            "page": page,
+            "pages": -(-total // per_page) if total else 0,
+            "per_page": per_page,
+        }, headers=headers)
+
+    @staticmethod
+    async def _task_total(conn, user_id, done):
+        row = (await conn.execute(
+            sa.select(TaskStats.total, TaskStats.done).where(TaskStats.user_id == user_id)
+        )).first()
+        total, done_count = row if row else (0, 0)
+        if done is None:
+            return total
+        return done_count if done else total - done_count
+
+    async def get_task(self, request):
+        claims = self.authenticate(request)
+        user_id, task_id = claims["sub"], request.path_params["task_id"]
+        async with self.engine.connect() as conn:
+            headers, not_modified = await self.etag_check(conn, request, user_id)
+            if not_modified is not None:
+                return not_modified
+            row = (await conn.execute(
+                sa.select(*task_rows.columns).where(Task.id == task_id, Task.user_id == user_id)
+            )).first()
+        if row is None:
+            self.flask_app.logger.warning("Task %s not found for user %s", task_id, user_id)
+            return self.json({"errors": {"task": "Not found"}}, 404)
+        self.flask_app.logger.info("Task %s retrieved by user %s", task_id, user_id)
+        return self.json(task_rows.dump(row), headers=headers)
+
+    async def add_task(self, request):
+        claims = self.authenticate(request)
+        user_id = claims["sub"]
+        await self.rate_limit("RATELIMIT_TASKS", "tasks.add_task", f"user:{user_id}")
+        try:
+            validated = task_schema.load(await _json_body(request))
+        except ValidationError as err:
+            self.flask_app.logger.warning("Validation failed for user %s: %s", user_id, err.messages)
+            return self.json({"errors": err.messages}, 422)
+
+        try:
+            task = await self.in_app_context(create_task, user_id, validated)
+        except WriteTimeout:
+            raise
+        except Exception as e:
+            self.flask_app.logger.error("DB error creating task: %s", e)
+            return self.json({"errors": {"db": "Internal server error"}}, 500)
+        self.flask_app.logger.info("Task created by user %s: %s", user_id, task["title"])
+        return self.json(task, 201)
+
+    async def edit_task(self, request):
+        claims = self.authenticate(request)
+        user_id, task_id = claims["sub"], request.path_params["task_id"]
+        async with self.engine.connect() as conn:
+            exists = await conn.scalar(sa.select(Task.id).where(Task.id == task_id, Task.user_id == user_id))
+        if exists is None:
+            self.flask_app.logger.warning("Update failed: Task %s not found for user %s", task_id, user_id)
+            return self.json({"errors": {"task": "Not found"}}, 404)
+
+        try:
+            validated = task_update_schema.load(await _json_body(request))
+        except ValidationError as err:
+            self.flask_app.logger.warning("Validation failed on update by user %s: %s", user_id, err.messages)
+            return self.json({"errors": err.messages}, 422)
+
+        def edit():
+            task = Task.query.filter_by(id=task_id, user_id=user_id).first()
+            return update_task(task, validated) if task else None
+
+        try:
+            task = await self.in_app_context(edit)
+        except WriteTimeout:
+            raise
+        except Exception as e:
+            self.flask_app.logger.error("DB error updating task: %s", e)
+            return self.json({"errors": {"db": "Internal server error"}}, 500)
+        if task is None:
+            return self.json({"errors": {"task": "Not found"}}, 404)
+        self.flask_app.logger.info("Task %s updated by user %s", task_id, user_id)
+        return self.json(task)
+
+    async def delete_task(self, request):
+        claims = self.authenticate(request)
+        if claims.get("role") != "admin":
+            return self.json({"error": "Forbidden"}, 403)
+        user_id, task_id = claims["sub"], request.path_params["task_id"]
+
+        def delete():
+            task = Task.query.filter_by(id=task_id, user_id=user_id).first()
+            if task:
+                try:
+                    remove_task(task)
+                except Exception:
+                    db.session.rollback()
+                    raise
+            return task is not None
+
+        try:
+            deleted = await self.in_app_context(delete)
+        except Exception as e:
+            self.flask_app.logger.error("DB error deleting task: %s", e)
+            return self.json({"errors": {"db": "Internal server error"}}, 500)
+        if not deleted:
+            self.flask_app.logger.warning("Delete failed: Task %s not found for user %s", task_id, user_id)
+            return self.json({"errors": {"task": "Not found"}}, 404)
+        self.flask_app.logger.info("Task %s deleted by user %s", task_id, user_id)
+        return self.json({"message": "Task deleted"})
+
+    # --- /auth ---
+
+    async def register(self, request):
+        data = await _json_body(request)
+        username, password = data.get("username"), data.get("password")
+        if not username or not password:
+            return self.json({"error": "username and password required"}, 400)
+
+        async with self.engine.connect() as conn:
+            if await conn.scalar(sa.select(User.id).where(User.username == username)) is not None:
+                return self.json({"error": "username taken"}, 400)
+        password_hash = await run_in_threadpool(hasher.hash, password)
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(sa.insert(User).values(username=username, password_hash=password_hash))
+        except IntegrityError:
+            return self.json({"error": "username taken"}, 400)
+        return self.json({"message": "user created"}, 201)
+
+    async def login(self, request):
+        await self.rate_limit("RATELIMIT_LOGIN", "auth.login", f"ip:{request.client.host if request.client else ''}")
+        data = await _json_body(request)
+        username, password = data.get("username"), data.get("password")
+
+        async with self.engine.connect() as conn:
+            user = (await conn.execute(
+                sa.select(User.id, User.username, User.role, User.password_hash).where(User.username == username)
+            )).first()
+        if not user or not password or not await run_in_threadpool(hasher.verify, user.password_hash, password):
+            return self.json({"error": "invalid credentials"}, 401)
+
+        # The first call hashes once to learn the configured parameters: not on the loop
+        if await run_in_threadpool(hasher.needs_rehash, user.password_hash):
+            password_hash = await run_in_threadpool(hasher.hash, password)
+            async with self.engine.begin() as conn:
+                await conn.execute(sa.update(User).where(User.id == user.id).values(password_hash=password_hash))
+
+        with self.flask_app.app_context():
+            access_token = create_access_token(
+                identity=str(user.id), additional_claims={"role": user.role, "username": user.username}
+            )
+        return self.json({"access_token": access_token, "role": user.role})
+
+    async def me(self, request):
+        claims = self.authenticate(request)
+        username = claims.get("username")
+        if username is None:
+            async with self.engine.connect() as conn:
+                username = await conn.scalar(sa.select(User.username).where(User.id == int(claims["sub"])))
+            if username is None:
+                return self.json({"error": "user not found"}, 404)
+        return self.json({"id": int(claims["sub"]), "username": username, "role": claims.get("role")})
+
+    def routes(self):
+        return [
+            self.route("/tasks/", "/tasks/", self.list_tasks, ["GET"]),
+            self.route("/tasks/", "/tasks/", self.add_task, ["POST"]),
+            self.route("/tasks/{task_id:int}", "/tasks/<int:task_id>", self.get_task, ["GET"]),
+            self.route("/tasks/{task_id:int}", "/tasks/<int:task_id>", self.edit_task, ["PATCH"]),
+            self.route("/tasks/{task_id:int}", "/tasks/<int:task_id>", self.delete_task, ["DELETE"]),
+            self.route("/auth/register", "/auth/register", self.register, ["POST"]),
+            self.route("/auth/login", "/auth/login", self.login, ["POST"]),
+            self.route("/auth/me", "/auth/me", self.me, ["GET"]),
+        ]
+
+
+def _int_arg(args, name, default):
+    try:
+        return int(args[name])
+    except (KeyError, ValueError):
+        return default
+
+
+async def _json_body(request):
+    """Like ``request.get_json() or {}`` for a JSON body."""
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPError(400, {"error": "Bad request", "message": "Failed to decode JSON object"})
+    return data if isinstance(data, dict) else {}
+
+
+def create_asgi_app(config_class=None):
+    flask_app = create_app(config_class)
+    api = AsyncTaskAPI(flask_app)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await api.engine.dispose()
+
+    app = Starlette(
+        routes=api.routes() + [Mount("/", app=WSGIMiddleware(flask_app))],
+        lifespan=lifespan,
+    )
+    app.state.flask_app = flask_app
+    app.state.api = api
+    return app
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, g, request
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import InvalidHeaderError, NoAuthorizationError, UserLookupError
+from flask_jwt_extended.internal_utils import (
+    custom_verification_for_token,
+    has_user_lookup,
+    user_lookup,
+    verify_token_not_blocklisted,
+    verify_token_type,
+)
+from flask_jwt_extended.utils import get_unverified_jwt_headers
+
+
+_CONTEXT_KEY = "taskmanager.auth_context"
+
+
+class AuthContext:
+    """Claims of the verified token for the current request."""
+
+    __slots__ = ("user_id", "role", "claims")
+
+    def __init__(self, claims):
+        self.claims = claims
+        self.user_id = claims.get("sub")
+        self.role = claims.get("role")
+
+
+class VerifiedTokenCache:
+    """Small LRU of ``token -> (header, claims)`` for tokens already verified.
+
+    Entries live for at most ``ttl`` seconds and never past the token's ``exp``,
+    so hot tokens skip the signature check without outliving their validity.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        if not self.maxsize:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            header, claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return header, claims
+
+    def put(self, token, header, claims):
+        if not self.maxsize:
+            return
+        expires_at = time.time() + self.ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, claims["exp"])
+        with self._lock:
+            self._entries[token] = (header, claims, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def init_app(app):
+    app.extensions["jwt_verify_cache"] = VerifiedTokenCache(
+        app.config["JWT_VERIFY_CACHE_SIZE"], app.config["JWT_VERIFY_CACHE_TTL"]
+    )
+
+
+def _token_from_header():
+    header_name = current_app.config.get("JWT_HEADER_NAME", "Authorization")
+    auth_header = request.headers.get(header_name, "").strip()
+    if not auth_header:
+        raise NoAuthorizationError(f"Missing {header_name} Header")
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0] != "Bearer":
+        raise InvalidHeaderError(
+            f"Bad {header_name} header. Expected '{header_name}: Bearer <JWT>'"
+        )
+    return parts[1]
+
+
+def verify_token(token, refresh=False):
+    """``(header, claims)`` of a verified token; needs an app context."""
+    token_cache = current_app.extensions["jwt_verify_cache"]
+    cached = token_cache.get(token)
+    if cached is None:
+        claims = decode_token(token)
+        header = get_unverified_jwt_headers(token)
+        token_cache.put(token, header, claims)
+    else:
+        header, claims = cached
+
+    # Cheap per-request checks still run on cache hits
+    verify_token_type(claims, refresh)
+    verify_token_not_blocklisted(header, claims)
+    custom_verification_for_token(header, claims)
+    return header, claims
+
+
+def load_auth_context(optional=False, refresh=False):
+    """Verify the request's JWT once and memoize its claims for the request.
+
+    Also fills flask_jwt_extended's request state, so ``get_jwt()`` and
+    ``get_jwt_identity()`` keep working in views. The memo lives in the WSGI
+    environ, which (unlike ``g``) is never shared between requests.
+    """
+    if _CONTEXT_KEY in request.environ:
+        return request.environ[_CONTEXT_KEY]
+
+    try:
+        header, claims = verify_token(_token_from_header(), refresh)
+    except NoAuthorizationError:
+        if not optional:
+            raise
+        header, claims = {}, {}
+
+    # Same state as flask_jwt_extended.verify_jwt_in_request (pinned, see test_auth)
+    jwt_user = None
+    if claims and has_user_lookup():
+        loaded_user = user_lookup(header, claims)
+        if loaded_user is None:
+            raise UserLookupError(f"user_lookup returned None for {claims.get('sub')}", header, claims)
+        jwt_user = {"loaded_user": loaded_user}
+    elif not claims:
+        jwt_user = {"loaded_user": None}
+
+    g._jwt_extended_jwt_user = jwt_user
+    g._jwt_extended_jwt_header = header
+    g._jwt_extended_jwt = claims
+    g._jwt_extended_jwt_location = "headers" if claims else None
+    auth = request.environ[_CONTEXT_KEY] = AuthContext(claims) if claims else None
+    return auth
+
+
+def current_auth():
+    """The request's AuthContext (``None`` for an optional, anonymous request)."""
+    if _CONTEXT_KEY not in request.environ:
+        raise RuntimeError("You must call `@auth_required()` before using this method")
+    return request.environ[_CONTEXT_KEY]
+
+
+def auth_required(optional=False, refresh=False):
+    """Drop-in for ``@jwt_required()`` that verifies each token at most once."""
+    def wrapper(fn):
+        @wraps(fn)
+        def decorated(*args, **kwargs):
+            load_auth_context(optional=optional, refresh=refresh)
+            return fn(*args, **kwargs)
+        return decorated
+    return wrapper
@@ -1,14 +1,15 @@
 from functools import wraps
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
 from flask import jsonify
 
+from .context import load_auth_context
+
 def role_required(required_role):
     def wrapper(fn):
         @wraps(fn)
         def decorated(*args, **kwargs):
-            verify_jwt_in_request()
-            claims = get_jwt()
-            if claims.get("role") != required_role:
+            # Reuses the claims verified by @auth_required() for this request
+            auth = load_auth_context()
+            if auth is None or auth.role != required_role:
                 return jsonify({"error": "Forbidden"}), 403
             return fn(*args, **kwargs)
         return decorated
@@ -0,0 +1,117 @@
+import base64
+import hashlib
+import hmac
+import io
+import json
+import os
+import random
+import threading
+import time
+
+from werkzeug.wsgi import ClosingIterator
+
+# Body fields never written to the capture file
+REDACTED_FIELDS = {"password", "old_password", "new_password", "access_token", "refresh_token"}
+
+
+def user_ref(auth_header, secret):
+    """Stable pseudonymous reference to the user behind a bearer token.
+
+    The token's ``sub`` is read without verification (only to group a user's
+    requests) and HMAC'd with ``secret``, so neither the token nor the user
+    id is stored, and ids can't be recovered by hashing 1..N.
+    """
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0] != "Bearer":
+        return None
+    try:
+        payload = parts[1].split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return "invalid"
+    if not isinstance(claims, dict):
+        return "invalid"
+    return hmac.new(secret, str(claims.get("sub")).encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {k: "***" if k in REDACTED_FIELDS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+class CaptureMiddleware:
+    """WSGI middleware appending a sample of requests to a JSONL file.
+
+    Each line holds the method, path, query string, (redacted) JSON body,
+    status, duration and a hashed user reference; ``benchmarks.replay``
+    re-issues them. Unsampled requests pass straight through.
+    """
+
+    def __init__(self, wsgi_app, path, secret, sample_rate=1.0, max_body=65536):
+        self.wsgi_app = wsgi_app
+        self.secret = secret.encode("utf-8") if isinstance(secret, str) else secret
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_body = max_body
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def __call__(self, environ, start_response):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return self.wsgi_app(environ, start_response)
+
+        record = {
+            "ts": time.time(),
+            "method": environ.get("REQUEST_METHOD"),
+            "path": environ.get("PATH_INFO", ""),
+            "query": environ.get("QUERY_STRING", ""),
+            "user": user_ref(environ.get("HTTP_AUTHORIZATION", ""), self.secret),
+            "body": self._read_body(environ),
+        }
+        start = time.perf_counter()
+
+        def capture_start_response(status, headers, exc_info=None):
+            record["status"] = int(status.split(" ", 1)[0])
+            return start_response(status, headers, exc_info)
+
+        def finish():
+            record["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            self._write(record)
+
+        return ClosingIterator(self.wsgi_app(environ, capture_start_response), finish)
+
+    def _read_body(self, environ):
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return None
+        if not length:
+            return None
+        if length > self.max_body or "json" not in environ.get("CONTENT_TYPE", ""):
+            return {"_omitted": length}  # the stream is left for the app, unread
+        data = environ["wsgi.input"].read(length)
+        environ["wsgi.input"] = io.BytesIO(data)  # the app still gets the full body
+        try:
+            return redact(json.loads(data))
+        except ValueError:
+            return {"_omitted": length}
+
+    def _write(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def init_app(app):
+    if not app.config.get("CAPTURE_ENABLED"):
+        return
+    app.wsgi_app = CaptureMiddleware(
+        app.wsgi_app,
+        app.config["CAPTURE_FILE"],
+        app.config.get("CAPTURE_SECRET") or app.config["SECRET_KEY"],
+        sample_rate=app.config["CAPTURE_SAMPLE_RATE"],
+        max_body=app.config["CAPTURE_MAX_BODY"],
+    )
@@ -0,0 +1,45 @@
+import click
+
+from app.profiling import profile_token
+from app.query_plan import check_query_plans
+from app.services.search_service import rebuild_search_index
+from app.services.stats_service import reconcile_stats
+
+
+def register_commands(app):
+    @app.cli.command("check-query-plans")
+    def check_query_plans_command():
+        """Fail if a hot task query falls back to a full scan."""
+        problems = check_query_plans()
+        for name, plan in problems.items():
+            click.echo(f"{name}: " + " | ".join(plan), err=True)
+        if problems:
+            raise SystemExit(1)
+        click.echo("All hot queries use an index.")
+
+    @app.cli.command("profile-token")
+    def profile_token_command():
+        """Print a header value that asks for a request profile."""
+        if not app.config["PROFILING_ENABLED"]:
+            click.echo("Note: PROFILING_ENABLED is off, the header is ignored.", err=True)
+        click.echo(f"{app.config['PROFILING_HEADER']}: {profile_token(app)}")
+
+    @app.cli.command("search-backfill")
+    def search_backfill_command():
+        """Rebuild the task full-text search index from the tasks table."""
+        count = rebuild_search_index()
+        if count is None:
+            click.echo("Full-text index is SQLite only; search uses LIKE on this database.")
+        else:
+            click.echo(f"Indexed {count} tasks.")
+
+    @app.cli.command("reconcile-stats")
+    @click.option("--user-id", type=int, default=None, help="Only this user.")
+    def reconcile_stats_command(user_id):
+        """Recompute task counters from the tasks table, repairing drift."""
+        drifted = reconcile_stats(user_id)
+        if drifted:
+            click.echo(f"Repaired counters for {len(drifted)} user(s): "
+                       + ", ".join(map(str, drifted)))
+        else:
+            click.echo("Task counters are consistent.")
@@ -10,11 +10,141 @@ class Config:
         f"sqlite:///{os.path.join(basedir, '..', 'tasks.db')}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Read engines (replicas) for GET handlers, comma separated. For a read-only view of
+    # the SQLite file: sqlite:///file:/abs/path/tasks.db?mode=ro&uri=true
+    READ_DATABASE_URLS = [u for u in os.getenv("READ_DATABASE_URLS", "").split(",") if u]
+    # A user's reads stay on the primary this long after their own write
+    READ_YOUR_WRITES_SECONDS = 5
+
+    # Engine profile: "auto" picks "sqlite" for file databases, "server" for
+    # PostgreSQL/MySQL URLs and "default" (stock settings) for :memory:
+    DB_ENGINE_PROFILE = os.getenv("DB_ENGINE_PROFILE", "auto")
+    # Applied on connect under the "sqlite" profile
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",      # readers no longer block behind the writer
+        "synchronous": "NORMAL",    # fsync at checkpoints only; safe with WAL
+        "busy_timeout": 5000,       # ms to wait on a lock instead of failing
+        "cache_size": -65536,       # 64 MiB page cache per connection
+        "mmap_size": 268435456,     # 256 MiB memory-mapped reads
+        "temp_store": "MEMORY",
+    }
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-jwt-secret")
+    # LRU of already-verified tokens (size 0 disables); TTL in seconds
+    JWT_VERIFY_CACHE_SIZE = 1024
+    JWT_VERIFY_CACHE_TTL = 30
+
+    # Password hashing (werkzeug method string, e.g. "pbkdf2:sha256:600000")
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+    PASSWORD_HASH_QUEUE_TIMEOUT = 2.0  # seconds to wait for a slot before 503
 
-    # Caching (safe default for local dev)
-    CACHE_TYPE = "SimpleCache"
+    # Caching: a per-process LRU (L1) in front of a cache shared by all workers (L2).
+    # CACHE_L2_TYPE "FileSystemCache" shares across workers on one host (CACHE_DIR);
+    # "RedisCache" (CACHE_REDIS_URL) across hosts. CACHE_TYPE="SimpleCache" = per process only.
+    CACHE_TYPE = os.getenv("CACHE_TYPE", "app.two_tier_cache.TwoTierCache")
     CACHE_DEFAULT_TIMEOUT = 60
+    CACHE_L2_TYPE = os.getenv("CACHE_L2_TYPE", "FileSystemCache")
+    CACHE_DIR = os.getenv("CACHE_DIR")  # default: a directory per database under the temp dir
+    CACHE_THRESHOLD = 10000  # max L2 entries (FileSystemCache)
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+    CACHE_L1_MAX_ITEMS = 2048
+    CACHE_L1_TTL = 60  # seconds; only for keys that are never rewritten (versioned pages)
+    # Mutable keys stay in L1 at most CACHE_L1_VOLATILE_TTL seconds. The version stamps
+    # carry invalidations between workers, so the default 0 always reads them from L2.
+    CACHE_L1_VOLATILE_PREFIXES = ("tasks:ver:", "tasks:rw:")
+    CACHE_L1_VOLATILE_TTL = 0
+    CACHE_L1_GENERATION_CHECK = 1.0  # seconds between checks for a clear() in another worker
+
+    # Rate limiting, keyed by JWT identity (client IP when anonymous). Unset: a SQLite file
+    # in the app's instance folder, shared by all workers of this deployment on the host;
+    # use redis://... to share limits between hosts.
+    RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI")
+    # "local-budget": fixed window that spends hits from an in-process lease while a
+    # client is under half its quota (see app.rate_limit)
+    RATELIMIT_STRATEGY = "local-budget"
+    RATELIMIT_HEADERS_ENABLED = True
+    RATELIMIT_LOGIN = os.getenv("RATELIMIT_LOGIN", "10 per minute")
+    RATELIMIT_TASKS = os.getenv("RATELIMIT_TASKS", "300 per minute")
+
+    # Logging: "queue" hands records to a background writer thread, "sync" writes inline
+    LOG_MODE = os.getenv("LOG_MODE", "queue")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" or "json"
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_DIR = "logs"
+    LOG_FILE = "app.log"
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = 5
+    # Fraction kept of high-volume records logged with extra={"sample": True}
+    LOG_SAMPLE_RATES = {"INFO": float(os.getenv("LOG_SAMPLE_INFO", 1.0))}
+    # Also log to stderr (Flask's default handler), written inline on the request thread
+    LOG_STDERR = os.getenv("LOG_STDERR", "1") == "1"
+
+    # Monitoring: built-in /metrics (in memory) and the optional SQLite-backed dashboard
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    MONITORING_DASHBOARD_ENABLED = os.getenv("MONITORING_DASHBOARD_ENABLED", "0") == "1"
+
+    # SQL instrumentation: statement count/time per request, slow statements logged (with
+    # parameter types only) on the "app.sql" logger, and N+1 hints when one SELECT
+    # repeats N+1_THRESHOLD times in a request. DEBUG_HEADERS adds the X-SQL-* totals.
+    SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "1") == "1"
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 100))
+    SQL_N_PLUS_ONE_THRESHOLD = 5
+    SQL_DEBUG_HEADERS = os.getenv("SQL_DEBUG_HEADERS", "0") == "1"
+
+    # Per-request profiling (opt-in): a request is profiled when it carries a valid signed
+    # PROFILING_HEADER (`flask profile-token`) or is picked at PROFILING_SAMPLE_RATE.
+    # Collapsed stacks + a JSON summary (endpoint, SQL time) land in PROFILING_DIR.
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+    PROFILING_MODE = os.getenv("PROFILING_MODE", "sampling")  # or "cprofile" (exact, slower)
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0.0))
+    PROFILING_INTERVAL_MS = 1.0  # stack sampling period
+    PROFILING_HEADER = "X-Profile"
+    PROFILING_SECRET = os.getenv("PROFILING_SECRET")  # signs the header; SECRET_KEY if unset
+    PROFILING_TOKEN_MAX_AGE = 3600  # seconds a profile token stays valid
+    PROFILING_DIR = os.path.join("logs", "profiles")
+
+    # Traffic capture for benchmarks.replay (opt-in): sampled requests appended as JSONL,
+    # with bearer tokens replaced by a keyed hash of the user id and passwords redacted
+    CAPTURE_ENABLED = os.getenv("CAPTURE_ENABLED", "0") == "1"
+    CAPTURE_FILE = os.getenv("CAPTURE_FILE", os.path.join("logs", "capture.jsonl"))
+    CAPTURE_SAMPLE_RATE = float(os.getenv("CAPTURE_SAMPLE_RATE", 0.01))
+    CAPTURE_MAX_BODY = 64 * 1024  # larger bodies are recorded by size only
+    CAPTURE_SECRET = os.getenv("CAPTURE_SECRET")  # keys the user references; SECRET_KEY if unset
+
+    # Response JSON encoder: "default" (stdlib json) or "orjson" (opt-in, faster; same bytes
+    # except floats, which may be spelled differently, and NaN/Infinity, which become null)
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "default")
+
+    # Group commit (opt-in): task creates/updates are queued to one writer thread that
+    # commits them together, up to MAX_BATCH per transaction, waiting at most MAX_WAIT_MS
+    # for company. SYNCHRONOUS overrides SQLITE_PRAGMAS["synchronous"] while enabled:
+    # "FULL" makes every acknowledged write survive power loss, "NORMAL" (WAL) may lose
+    # the last commits on power loss but never corrupts; None keeps the profile's value.
+    GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "0") == "1"
+    GROUP_COMMIT_MAX_BATCH = 64
+    GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv("GROUP_COMMIT_MAX_WAIT_MS", 2))
+    GROUP_COMMIT_TIMEOUT = 30  # seconds a request waits for its write before a 503
+    GROUP_COMMIT_SYNCHRONOUS = os.getenv("GROUP_COMMIT_SYNCHRONOUS", "FULL")
+
+    # Startup: create missing tables in create_app (production leaves the schema to
+    # `flask db upgrade`) and serve the API docs at /apidocs (imports flasgger)
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "1") == "1"
+    SWAGGER_ENABLED = os.getenv("SWAGGER_ENABLED", "1") == "1"
+    # gc.freeze() once the app is built, so a preloaded app's objects stay shared
+    # copy-on-write with forked workers (gunicorn --preload) instead of being
+    # dirtied by the collector in every child
+    GC_FREEZE = os.getenv("GC_FREEZE", "0") == "1"
+
+    # Batch endpoint
+    TASK_BATCH_MAX_SIZE = 500
+
+    # Streaming export: rows fetched per server-side chunk
+    EXPORT_CHUNK_SIZE = 1000
+
+    # Streaming import: rows validated and inserted per transaction
+    IMPORT_CHUNK_SIZE = 1000
 
 
 class TestingConfig(Config):
@@ -22,3 +152,21 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"  # in-memory DB for tests
     WTF_CSRF_ENABLED = False  # skip CSRF for tests (if using Flask-WTF)
     CACHE_TYPE = "NullCache"  # disable caching during tests
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"  # cheap hashes keep tests fast
+    PASSWORD_HASH_WORKERS = 0  # hash inline
+    RATELIMIT_ENABLED = False
+    RATELIMIT_STORAGE_URI = "memory://"
+    SWAGGER_ENABLED = False
+
+
+# e.g. APP_CONFIG=production gunicorn --preload -w 4 "app:create_app()" (after `flask db upgrade`)
+class ProductionConfig(Config):
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "0") == "1"  # run migrations instead
+    SWAGGER_ENABLED = os.getenv("SWAGGER_ENABLED", "0") == "1"
+    MONITORING_DASHBOARD_ENABLED = False
+    GC_FREEZE = os.getenv("GC_FREEZE", "1") == "1"
+    LOG_STDERR = os.getenv("LOG_STDERR", "0") == "1"  # the file log only, written off-thread
+
+
+# APP_CONFIG selects the config used by create_app() when none is passed
+CONFIGS = {"development": Config, "testing": TestingConfig, "production": ProductionConfig}
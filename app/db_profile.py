@@ -0,0 +1,78 @@
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Engine options per profile; merged under any explicit SQLALCHEMY_ENGINE_OPTIONS
+PROFILES = {
+    # Stock SQLAlchemy/driver settings
+    "default": {},
+    # File-backed SQLite: a small pool of long-lived connections, plus the
+    # driver-level lock timeout (seconds) as a second line of defence
+    "sqlite": {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "connect_args": {"timeout": 5},
+    },
+    # PostgreSQL/MySQL given through DATABASE_URL
+    "server": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+}
+
+
+def resolve_profile(name, uri):
+    """Map ``"auto"`` to a concrete profile for the database URI."""
+    if name != "auto":
+        if name not in PROFILES:
+            raise ValueError(f"Unknown DB_ENGINE_PROFILE {name!r}")
+        return name
+    url = make_url(uri)
+    if url.get_backend_name() != "sqlite":
+        return "server"
+    if url.database in (None, "", ":memory:"):
+        return "default"
+    return "sqlite"
+
+
+def configure_engine_options(app):
+    """Fill SQLALCHEMY_ENGINE_OPTIONS from DB_ENGINE_PROFILE (before db.init_app)."""
+    profile = resolve_profile(
+        app.config["DB_ENGINE_PROFILE"], app.config["SQLALCHEMY_DATABASE_URI"]
+    )
+    options = {**PROFILES[profile], **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})}
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    app.config["DB_ENGINE_PROFILE_RESOLVED"] = profile
+    return profile
+
+
+def apply_sqlite_pragmas(engine, pragmas, logger=None):
+    """Run ``PRAGMA name=value`` on every new DBAPI connection of ``engine``."""
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                try:
+                    cursor.execute(f"PRAGMA {name}={value}")
+                except sqlite3.DatabaseError as e:
+                    # e.g. journal_mode on a read-only connection
+                    if logger is not None:
+                        logger.debug("PRAGMA %s=%s skipped: %s", name, value, e)
+        finally:
+            cursor.close()
+
+
+def init_engine_profile(app, engines):
+    """Attach the SQLite pragmas to the app's engines (after they are created)."""
+    if app.config["DB_ENGINE_PROFILE_RESOLVED"] != "sqlite":
+        return
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            apply_sqlite_pragmas(engine, app.config["SQLITE_PRAGMAS"], app.logger)
@@ -0,0 +1,47 @@
+import random
+
+import sqlalchemy as sa
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+# Set in the WSGI environ by @use_read_replica for the current request
+READ_ONLY_KEY = "taskmanager.db_read_only"
+
+
+def init_read_engines(app):
+    """Create one engine per READ_DATABASE_URLS entry (after db.init_app).
+
+    They are kept apart from SQLALCHEMY_BINDS on purpose: ``create_all``/
+    ``drop_all`` must never run DDL against a replica.
+    """
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
+    engines = [
+        sa.create_engine(url, **options)
+        for url in app.config.get("READ_DATABASE_URLS") or []
+    ]
+    app.extensions["read_engines"] = engines
+    return engines
+
+
+def read_engines(app=None):
+    return (app or current_app).extensions.get("read_engines", [])
+
+
+class RoutingSession(Session):
+    """Send reads of ``@use_read_replica`` requests to a read engine.
+
+    Flushes (every INSERT/UPDATE/DELETE) and all other requests keep using the
+    primary, as do explicit ``bind=`` arguments.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_request_context()
+            and request.environ.get(READ_ONLY_KEY)
+        ):
+            engines = read_engines()
+            if engines:
+                return random.choice(engines)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -1,4 +1,6 @@
 from flask import jsonify
+from .hashing import HashingBusy
+from .group_commit import WriteTimeout
 
 def register_error_handlers(app):
     @app.errorhandler(400)
@@ -17,6 +19,22 @@ def register_error_handlers(app):
     def unprocessable_entity(e):
         return jsonify({"error": "Unprocessable entity", "message": e.description}), 422
 
+    @app.errorhandler(429)
+    def too_many_requests(e):
+        return jsonify({"error": "Too many requests", "message": e.description}), 429
+
+    @app.errorhandler(HashingBusy)
+    def hashing_busy(e):
+        response = jsonify({"error": "Service unavailable", "message": "Password hashing is overloaded, retry shortly"})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+
+    @app.errorhandler(WriteTimeout)
+    def write_timeout(e):
+        response = jsonify({"error": "Service unavailable", "message": "Write queue is overloaded, retry shortly"})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+
     @app.errorhandler(500)
     def internal_error(e):
         return jsonify({"error": "Internal server error"}), 500
@@ -1,12 +1,21 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_caching import Cache
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
+from .hashing import PasswordHasher
+from .group_commit import GroupCommitWriter
+from .metrics import Metrics
+from .profiling import RequestProfiler
+from .sql_instrumentation import SQLInstrumentation
+from .db_routing import RoutingSession
+from .rate_limit import rate_limit_key
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 jwt = JWTManager()
 cache = Cache()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=rate_limit_key)
+hasher = PasswordHasher()
+metrics = Metrics()
+profiler = RequestProfiler()
+sql_instrumentation = SQLInstrumentation()
+writer = GroupCommitWriter()
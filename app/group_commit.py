@@ -0,0 +1,157 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+
+class WriteTimeout(Exception):
+    """Raised when a queued write got no result within GROUP_COMMIT_TIMEOUT.
+
+    The write may still be committed later by the writer thread.
+    """
+
+
+class GroupCommitWriter:
+    """Commit concurrent writes together from one writer thread.
+
+    ``run(stage, *args)`` calls ``stage`` to stage changes in ``db.session``
+    without committing; ``stage`` returns ``(result, user_id)`` (``user_id``
+    ``None`` when nothing changed). Disabled
+    (the default), every call commits on its own, on the calling thread.
+    With ``GROUP_COMMIT_ENABLED`` calls are queued: the writer collects up
+    to ``GROUP_COMMIT_MAX_BATCH`` of them, waiting at most
+    ``GROUP_COMMIT_MAX_WAIT_MS`` for more after the first, and commits them
+    in one transaction (one lock acquisition and one fsync). If the batch
+    fails it is rolled back and retried one commit per call, so each caller
+    gets its own result or its own exception.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self._thread = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Call after ``db.init_app`` and before the engine profile is applied."""
+        self.shutdown()
+        self.app = app
+        self.db = app.extensions["sqlalchemy"]
+        self.enabled = app.config["GROUP_COMMIT_ENABLED"]
+        self.max_batch = app.config["GROUP_COMMIT_MAX_BATCH"]
+        self.max_wait = app.config["GROUP_COMMIT_MAX_WAIT_MS"] / 1000
+        self.timeout = app.config["GROUP_COMMIT_TIMEOUT"]
+        self._queue = queue.Queue()
+        synchronous = app.config.get("GROUP_COMMIT_SYNCHRONOUS")
+        if self.enabled and synchronous:
+            # Batches amortise the fsync, so a stricter level is affordable here
+            app.config["SQLITE_PRAGMAS"] = {**app.config["SQLITE_PRAGMAS"], "synchronous": synchronous}
+        app.extensions["group_commit"] = self
+
+    def run(self, stage, *args):
+        if not self.enabled:
+            return self._commit_one(stage, args)
+
+        future = Future()
+        self._ensure_started()
+        self._queue.put((stage, args, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise WriteTimeout() from None
+
+    def shutdown(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)
+                self._thread.join(timeout=5)
+            self._thread = None
+
+    def after_fork(self):
+        """In a forked child: the writer thread did not survive the fork."""
+        self._thread = None
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+
+    def _ensure_started(self):
+        with self._lock:
+            # Also replaces a writer thread that died
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="group-commit", daemon=True)
+                self._thread.start()
+
+    # --- Writer thread ---
+
+    def _loop(self):
+        with self.app.app_context():
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.max_wait
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                try:
+                    self._commit_batch(batch)
+                except Exception:
+                    # Keep the writer alive; callers still waiting get the error
+                    self.app.logger.exception("Group commit failed for %s writes", len(batch))
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(RuntimeError("group commit failed"))
+
+    def _commit_batch(self, batch):
+        if len(batch) == 1:
+            stage, args, future = batch[0]
+            self._resolve(future, self._commit_one, stage, args)
+            return
+        try:
+            staged = [stage(*args) for stage, args, _ in batch]
+            self.db.session.commit()
+        except Exception:
+            self.db.session.rollback()
+            for stage, args, future in batch:
+                self._resolve(future, self._commit_one, stage, args)
+            return
+
+        for user_id in {user_id for _, user_id in staged if user_id is not None}:
+            self._tasks_changed(user_id)
+        for (result, _), (_, _, future) in zip(staged, batch):
+            future.set_result(result)
+
+    @staticmethod
+    def _resolve(future, fn, *args):
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _commit_one(self, stage, args):
+        try:
+            result, user_id = stage(*args)
+            self.db.session.commit()
+        except Exception:
+            self.db.session.rollback()
+            raise
+        if user_id is not None:
+            self._tasks_changed(user_id)
+        return result
+
+    def _tasks_changed(self, user_id):
+        """Invalidate cached reads; the write is committed, so a failure is only logged."""
+        from app.services.task_service import tasks_changed
+
+        try:
+            tasks_changed(user_id)
+        except Exception:
+            self.app.logger.exception("Cache invalidation failed for user %s", user_id)
@@ -0,0 +1,80 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    """Raised when too many password hashes are already in flight."""
+
+
+class PasswordHasher:
+    """Run password hashing/verification in a bounded process pool.
+
+    Hashing is CPU-bound and holds the GIL, so doing it on the request thread
+    stalls every other request in the worker. Work is handed to a pool of
+    ``PASSWORD_HASH_WORKERS`` processes (``0`` keeps it inline), and at most
+    ``PASSWORD_HASH_MAX_PENDING`` calls may be in flight; callers that cannot
+    get a slot within ``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds get HashingBusy.
+    """
+
+    def __init__(self, app=None):
+        self._executor = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config["PASSWORD_HASH_METHOD"]
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.queue_timeout = app.config["PASSWORD_HASH_QUEUE_TIMEOUT"]
+        self.max_pending = app.config["PASSWORD_HASH_MAX_PENDING"]
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._stored_prefix = None
+        self.shutdown()
+        app.extensions["password_hasher"] = self
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # "spawn": forking a multi-threaded server could copy a lock held by another thread
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def after_fork(self):
+        """In a forked child: the parent's pool processes belong to the parent."""
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingBusy()
+        try:
+            if not self.workers:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True if ``pwhash`` was made with other parameters than configured."""
+        if self._stored_prefix is None:
+            # e.g. "pbkdf2:sha256" is stored as "pbkdf2:sha256:<iterations>"
+            self._stored_prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        return pwhash.split("$", 1)[0] != self._stored_prefix
@@ -0,0 +1,50 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes view responses with orjson.
+
+    Output matches DefaultJSONProvider except for floats: keys are sorted,
+    dates go through Flask's ``default`` (HTTP date), and non-ASCII text
+    (which Flask escapes), non-str keys and huge ints fall back to the
+    standard encoder. Floats parse back to the same value but may be spelled
+    differently (``1e-7`` for ``1e-07``, ``1e16`` for ``1e+16``), and NaN and
+    Infinity become ``null`` instead of the non-standard ``NaN``/``Infinity``.
+    """
+
+    _options = 0
+    if orjson is not None:
+        _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def _orjson_dumps(self, obj, indent=False):
+        if orjson is None or not self.ensure_ascii:
+            return None
+        options = self._options
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        try:
+            data = orjson.dumps(obj, default=self.default, option=options)
+        except TypeError:  # orjson.JSONEncodeError
+            return None
+        return data if data.isascii() else None
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        data = self._orjson_dumps(obj, indent=indent)
+        if data is None:
+            return super().response(obj)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    "default": DefaultJSONProvider,
+    "orjson": OrjsonProvider,
+}
@@ -0,0 +1,154 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from flask.logging import default_handler
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]"
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields are included as keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "where": f"{record.pathname}:{record.lineno}",
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "sample":
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of records logged with ``extra={"sample": True}``.
+
+    ``rates`` maps level names to the fraction kept (missing levels keep all).
+    Unmarked records always pass.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = {logging.getLevelName(level): rate for level, rate in rates.items()}
+
+    def filter(self, record):
+        if not getattr(record, "sample", False):
+            return True
+        rate = self.rates.get(record.levelno, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class LazyQueueHandler(QueueHandler):
+    """Enqueue records unformatted; the listener thread does the formatting."""
+
+    def prepare(self, record):
+        return record
+
+
+class AppQueueListener(QueueListener):
+    """QueueListener whose ``stop`` may be called more than once."""
+
+    running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        if self.running:
+            self.running = False
+            super().stop()
+
+
+def _file_handler(app):
+    log_dir = app.config["LOG_DIR"]
+    os.makedirs(log_dir, exist_ok=True)
+    handler = RotatingFileHandler(
+        os.path.join(log_dir, app.config["LOG_FILE"]),
+        maxBytes=app.config["LOG_MAX_BYTES"],
+        backupCount=app.config["LOG_BACKUP_COUNT"],
+    )
+    if app.config["LOG_FORMAT"] == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def restart_log_listener(app):
+    """In a forked child: the QueueListener thread stayed in the parent.
+
+    Records would pile up on the inherited queue unwritten, so the child gets
+    a fresh queue and a new listener writing to the same handlers.
+    """
+    old = app.extensions.get("log_listener")
+    if old is None:
+        return
+    old.running = False  # its thread is not in this process; nothing to stop
+    log_queue = queue.Queue(-1)
+    listener = AppQueueListener(log_queue, *old.handlers, respect_handler_level=old.respect_handler_level)
+    for handler in app.logger.handlers:
+        if getattr(handler, "_app_listener", None) is old:
+            handler.queue = log_queue
+            handler._app_listener = listener
+    listener.start()
+    atexit.register(listener.stop)
+    app.extensions["log_listener"] = listener
+
+
+def configure_logging(app):
+    """Attach the file log to ``app.logger``.
+
+    With ``LOG_MODE = "queue"`` the request thread only puts records on a
+    queue; a background QueueListener formats them and writes the file.
+    Flask's stderr handler is kept when ``LOG_STDERR`` is on.
+    """
+    installed = [h for h in app.logger.handlers if getattr(h, "_app_file_log", False)]
+    if app.extensions.get("log_handler") in installed:
+        return  # this app is already configured (debug reloader)
+    # The "app" logger is shared by every app in the process: the latest config wins
+    for old in installed:
+        app.logger.removeHandler(old)
+        if getattr(old, "_app_listener", None) is not None:
+            old._app_listener.stop()
+        else:
+            old.close()
+
+    file_handler = _file_handler(app)
+    if app.config["LOG_MODE"] == "queue":
+        log_queue = queue.Queue(-1)
+        handler = LazyQueueHandler(log_queue)
+        listener = AppQueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        handler._app_listener = listener
+        app.extensions["log_listener"] = listener
+    else:
+        handler = file_handler
+
+    if app.config["LOG_STDERR"]:
+        app.logger.addHandler(default_handler)
+    else:
+        # stderr would still be written on the request thread
+        app.logger.removeHandler(default_handler)
+
+    handler._app_file_log = True
+    handler.setLevel(app.config["LOG_LEVEL"])
+    handler.addFilter(SamplingFilter(app.config["LOG_SAMPLE_RATES"]))
+    app.logger.addHandler(handler)
+    app.logger.setLevel(app.config["LOG_LEVEL"])
+    app.extensions["log_handler"] = handler
@@ -0,0 +1,237 @@
+import threading
+import time
+import weakref
+
+from flask import Response, g, has_request_context, request
+
+from app.sql_instrumentation import add_query_observer
+
+# Latency histogram upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard:
+    """Counters written by a single thread only, so no locking is needed."""
+
+    def __init__(self):
+        self.latency = {}     # (method, endpoint) -> [bucket counts..., +Inf, sum]
+        self.status = {}      # (method, endpoint, status) -> count
+        self.in_flight = 0
+        self.db_queries = {}  # endpoint -> [count, seconds]
+
+    def add(self, other):
+        """Add ``other``'s counters into this shard."""
+        self.in_flight += other.in_flight
+        for key, hist in list(other.latency.items()):
+            total = self.latency.setdefault(key, [0] * len(hist))
+            for i, value in enumerate(list(hist)):
+                total[i] += value
+        for key, count in list(other.status.items()):
+            self.status[key] = self.status.get(key, 0) + count
+        for key, (count, seconds) in list(other.db_queries.items()):
+            total = self.db_queries.setdefault(key, [0, 0.0])
+            total[0] += count
+            total[1] += seconds
+
+
+class _ShardOwner:
+    """Held only by a thread's thread-local, so it is collected when the thread ends."""
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard):
+        self.shard = shard
+
+
+def _endpoint_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+class Metrics:
+    """In-memory request/DB metrics, rendered in Prometheus text format.
+
+    Each thread records into its own shard; shards are only summed when
+    ``/metrics`` is scraped. When a thread ends its shard is folded into
+    ``_retired``, so short-lived threads don't grow the list. Values are
+    per process.
+    """
+
+    def __init__(self, app=None):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+        self._shards_lock = threading.RLock()  # _retire may run from GC while held
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["metrics"] = self
+        if not app.config.get("METRICS_ENABLED", True):
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule("/metrics", "metrics", self._metrics_view)
+        add_query_observer(app, self._observe_query)
+
+    def after_fork(self):
+        """In a forked child: start from empty counters (values are per process)."""
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _Shard()
+        self._shards_lock = threading.RLock()  # _retire may run from GC while held
+
+    def _shard(self):
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            owner = self._local.owner = _ShardOwner(_Shard())
+            with self._shards_lock:
+                self._shards.append(owner.shard)
+            weakref.finalize(owner, self._retire, owner.shard)
+        return owner.shard
+
+    def _retire(self, shard):
+        with self._shards_lock:
+            # Not listed: a shard from before after_fork()
+            if any(s is shard for s in self._shards):
+                self._shards = [s for s in self._shards if s is not shard]
+                self._retired.add(shard)
+
+    # --- Recording ---
+
+    def _before_request(self):
+        g._metrics_start = time.perf_counter()
+        g._metrics_in_flight = True
+        self.request_started()
+
+    def _after_request(self, response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            self.observe_request(
+                request.method, _endpoint_label(), response.status_code,
+                time.perf_counter() - start,
+            )
+        return response
+
+    def _teardown_request(self, exc):
+        # Teardown also runs for contexts whose before_request never did
+        if g.pop("_metrics_in_flight", False):
+            self.request_finished()
+
+    def request_started(self):
+        """Count a request in the in-flight gauge (call request_finished on the same thread)."""
+        self._shard().in_flight += 1
+
+    def request_finished(self):
+        self._shard().in_flight -= 1
+
+    def observe_request(self, method, endpoint, status, seconds):
+        shard = self._shard()
+        hist = shard.latency.get((method, endpoint))
+        if hist is None:
+            hist = shard.latency[(method, endpoint)] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+                break
+        else:
+            hist[len(BUCKETS)] += 1
+        hist[-1] += seconds
+
+        key = (method, endpoint, status)
+        shard.status[key] = shard.status.get(key, 0) + 1
+
+    def _observe_query(self, statement, parameters, seconds):
+        endpoint = _endpoint_label() if has_request_context() else "none"
+        queries = self._shard().db_queries
+        entry = queries.get(endpoint)
+        if entry is None:
+            entry = queries[endpoint] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    # --- Exposition ---
+
+    def snapshot(self):
+        """Sum every shard into plain dicts."""
+        total = _Shard()
+        # Under the lock so a shard retiring mid-scrape is not counted twice
+        with self._shards_lock:
+            total.add(self._retired)
+            for shard in self._shards:
+                total.add(shard)
+        return {"latency": total.latency, "status": total.status,
+                "db_queries": total.db_queries, "in_flight": total.in_flight}
+
+    def render(self):
+        from app.services.cache_service import cache_stats
+
+        snap = self.snapshot()
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by endpoint.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, endpoint), hist in sorted(snap["latency"].items()):
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), hist):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {hist[-1]:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+        lines += ["# HELP http_requests_total Responses by endpoint and status.",
+                  "# TYPE http_requests_total counter"]
+        for (method, endpoint, status), count in sorted(snap["status"].items()):
+            lines.append(
+                f'http_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}'
+            )
+
+        lines += ["# HELP http_requests_in_flight Requests currently being handled.",
+                  "# TYPE http_requests_in_flight gauge",
+                  f"http_requests_in_flight {snap['in_flight']}"]
+
+        lines += ["# HELP db_queries_total SQL statements executed, by endpoint.",
+                  "# TYPE db_queries_total counter"]
+        for endpoint, (count, _) in sorted(snap["db_queries"].items()):
+            lines.append(f'db_queries_total{{endpoint="{endpoint}"}} {count}')
+        lines += ["# HELP db_query_seconds_total Time spent in SQL statements, by endpoint.",
+                  "# TYPE db_query_seconds_total counter"]
+        for endpoint, (_, seconds) in sorted(snap["db_queries"].items()):
+            lines.append(f'db_query_seconds_total{{endpoint="{endpoint}"}} {seconds:.6f}')
+
+        stats = cache_stats()
+        lines += ["# HELP task_cache_requests_total Per-user task list cache lookups.",
+                  "# TYPE task_cache_requests_total counter",
+                  f'task_cache_requests_total{{result="hit"}} {stats["hits"]}',
+                  f'task_cache_requests_total{{result="miss"}} {stats["misses"]}']
+        lines += self._render_cache_tiers()
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_cache_tiers():
+        from app.extensions import cache
+
+        backend = cache.cache
+        if not hasattr(backend, "tier_stats"):
+            return []
+        tiers = backend.tier_stats()
+        return [
+            "# HELP cache_tier_requests_total Lookups per cache tier (L2 is only asked on an L1 miss).",
+            "# TYPE cache_tier_requests_total counter",
+            f'cache_tier_requests_total{{tier="l1",result="hit"}} {tiers["l1_hits"]}',
+            f'cache_tier_requests_total{{tier="l1",result="miss"}} {tiers["l1_misses"]}',
+            f'cache_tier_requests_total{{tier="l2",result="hit"}} {tiers["l2_hits"]}',
+            f'cache_tier_requests_total{{tier="l2",result="miss"}} {tiers["l2_misses"]}',
+            "# HELP cache_l1_evictions_total Entries evicted from the in-process LRU.",
+            "# TYPE cache_l1_evictions_total counter",
+            f"cache_l1_evictions_total {tiers['l1_evictions']}",
+            "# HELP cache_l1_items Entries in the in-process LRU, and its limit.",
+            "# TYPE cache_l1_items gauge",
+            f"cache_l1_items {tiers['l1_items']}",
+            f"cache_l1_max_items {tiers['l1_max_items']}",
+        ]
+
+    def _metrics_view(self):
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
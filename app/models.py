@@ -1,6 +1,5 @@
-from .extensions import db
+from .extensions import db, hasher
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 
 
 class User(db.Model):
@@ -11,17 +10,23 @@ class User(db.Model):
     password_hash = db.Column(db.String(200), nullable=False)  # 🔹 clearer naming
     role = db.Column(db.String(20), default="user")            # 🔹 user/admin
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # 🔹 Bumped on every change to the user's tasks (drives task ETags)
+    tasks_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # One-to-many: a user can have many tasks
     tasks = db.relationship("Task", backref="owner", lazy=True)
 
     def set_password(self, password: str):
-        """Hash and store password."""
-        self.password_hash = generate_password_hash(password)
+        """Hash and store password (off the request thread, see app.hashing)."""
+        self.password_hash = hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
         """Verify password hash."""
-        return check_password_hash(self.password_hash, password)
+        return hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        """True if the stored hash uses outdated algorithm/cost settings."""
+        return hasher.needs_rehash(self.password_hash)
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -29,6 +34,11 @@ class User(db.Model):
 
 class Task(db.Model):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # 🔹 Hot path: every route filters on user_id, list_tasks also on done, ordered by id
+        db.Index("ix_tasks_user_id_id", "user_id", "id"),
+        db.Index("ix_tasks_user_id_done_id", "user_id", "done", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -43,4 +53,27 @@ class Task(db.Model):
         return f"<Task {self.title}>"
     
 
-    
\ No newline at end of file
+    
+
+class TaskStats(db.Model):
+    """Per-user task counters, maintained alongside every task write."""
+    __tablename__ = "task_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    done = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TaskStats user={self.user_id} total={self.total} done={self.done}>"
+
+
+class TaskDailyStats(db.Model):
+    """Per-user count of current tasks by the day they were created."""
+    __tablename__ = "task_daily_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    created = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TaskDailyStats user={self.user_id} day={self.day} created={self.created}>"
@@ -0,0 +1,252 @@
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+from flask import g, request
+from itsdangerous import BadSignature, TimestampSigner
+
+from app.sql_instrumentation import add_query_observer
+
+_SIGNER_SALT = "request-profile"
+_SIGNED_VALUE = b"profile"
+_UNSAFE_ID_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _frame_label(code):
+    path = code.co_filename.replace(os.sep, "/").rsplit("/", 2)
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample one thread's Python stack every ``interval`` seconds.
+
+    ``stacks`` maps a collapsed stack (root first, ``;``-separated) to the
+    number of samples in which it was on top.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        labels = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                frames.append(label)
+                frame = frame.f_back
+            if frames:
+                stack = ";".join(reversed(frames))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def collapsed(self):
+        return self.stacks
+
+
+class CProfileCollector:
+    """Deterministic profile of the calling thread, folded into call paths.
+
+    cProfile only records caller -> callee edges, so each function's time is
+    split between its call paths in proportion to the time spent under each
+    caller. Counts are microseconds.
+    """
+
+    def __init__(self):
+        import cProfile
+
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def collapsed(self, max_depth=64, min_fraction=0.001):
+        """Fold the profile into call paths, dropping paths under ``min_fraction`` of the total."""
+        import pstats
+
+        stats = pstats.Stats(self._profile).stats  # func -> (cc, nc, tt, ct, callers)
+        callees = {}
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((func, edge[3]))
+        roots = [func for func, entry in stats.items() if not entry[4]]
+        min_seconds = sum(stats[func][3] for func in roots) * min_fraction
+
+        def label(func):
+            filename, line, name = func
+            path = filename.replace(os.sep, "/").rsplit("/", 2)
+            return f"{name} ({'/'.join(path[-2:])}:{line})" if line else name
+
+        stacks = {}
+        on_path = set()
+
+        def walk(func, path, share, depth):
+            _, _, tt, ct, _ = stats[func]
+            path = f"{path};{label(func)}" if path else label(func)
+            micros = round(tt * share * 1e6)
+            if micros:
+                stacks[path] = stacks.get(path, 0) + micros
+            if depth >= max_depth:
+                return
+            on_path.add(func)
+            for callee, edge_ct in callees.get(func, ()):
+                callee_ct = stats[callee][3]
+                # Recursive calls are not unrolled, and tiny subtrees are dropped
+                if callee in on_path or callee_ct <= 0 or edge_ct * share < min_seconds:
+                    continue
+                walk(callee, path, share * edge_ct / callee_ct, depth + 1)
+            on_path.discard(func)
+
+        for func in roots:
+            walk(func, "", 1.0, 0)
+        return stacks
+
+
+class _ActiveProfile:
+    __slots__ = ("request_id", "collector", "started", "sql_count", "sql_seconds")
+
+    def __init__(self, request_id, collector):
+        self.request_id = request_id
+        self.collector = collector
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+
+
+class RequestProfiler:
+    """Opt-in profiler for single requests.
+
+    A request is profiled when it carries a valid signed ``PROFILING_HEADER``
+    (see ``flask profile-token``) or is picked at ``PROFILING_SAMPLE_RATE``.
+    Its profile is written to ``PROFILING_DIR`` as collapsed stacks
+    (``<id>.folded``, for flamegraph.pl or speedscope) next to a JSON file
+    with the request id, endpoint, status, duration and SQL time. With
+    ``PROFILING_ENABLED`` off nothing is registered on the app.
+    """
+
+    def __init__(self, app=None):
+        self._local = threading.local()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["profiler"] = self
+        if not app.config.get("PROFILING_ENABLED", False):
+            return
+        self.mode = app.config["PROFILING_MODE"]
+        if self.mode not in ("sampling", "cprofile"):
+            raise ValueError(f"Unknown PROFILING_MODE {self.mode!r}")
+        self.directory = app.config["PROFILING_DIR"]
+        self.sample_rate = app.config["PROFILING_SAMPLE_RATE"]
+        self.interval = app.config["PROFILING_INTERVAL_MS"] / 1000
+        self.header = app.config["PROFILING_HEADER"]
+        self.token_max_age = app.config["PROFILING_TOKEN_MAX_AGE"]
+        self.signer = signer_for(app)
+        os.makedirs(self.directory, exist_ok=True)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        add_query_observer(app, self._observe_query)
+
+    def _wanted(self):
+        token = request.headers.get(self.header)
+        if token:
+            try:
+                if self.signer.unsign(token, max_age=self.token_max_age) == _SIGNED_VALUE:
+                    return True
+            except BadSignature:
+                pass
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    # --- Request hooks ---
+
+    def _before_request(self):
+        if not self._wanted():
+            return
+        if self.mode == "cprofile":
+            collector = CProfileCollector()
+        else:
+            collector = StackSampler(threading.get_ident(), self.interval)
+        # The id ends up in a file name, so only a safe subset of a client-sent one is kept
+        request_id = _UNSAFE_ID_CHARS.sub("", request.headers.get("X-Request-ID", ""))[:64] or uuid.uuid4().hex
+        active = self._local.active = _ActiveProfile(request_id, collector)
+        g._profile = active
+        collector.start()
+
+    def _after_request(self, response):
+        active = g.pop("_profile", None)
+        if active is not None:
+            self._finish(active, response.status_code)
+            response.headers["X-Profile-Id"] = active.request_id
+        return response
+
+    def _teardown_request(self, exc):
+        # after_request is skipped when the view raised
+        active = g.pop("_profile", None)
+        if active is not None:
+            self._finish(active, 500)
+
+    def _finish(self, active, status):
+        active.collector.stop()
+        self._local.active = None
+        duration = time.perf_counter() - active.started
+        rule = request.url_rule
+        meta = {
+            "request_id": active.request_id,
+            "method": request.method,
+            "path": request.path,
+            "endpoint": rule.rule if rule is not None else "unmatched",
+            "status": status,
+            "mode": self.mode,
+            "duration_ms": round(duration * 1000, 3),
+            "sql_count": active.sql_count,
+            "sql_ms": round(active.sql_seconds * 1000, 3),
+            "unit": "samples" if self.mode == "sampling" else "microseconds",
+        }
+        base = os.path.join(self.directory, f"{time.strftime('%Y%m%dT%H%M%S')}-{active.request_id}")
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            for stack, count in sorted(active.collector.collapsed().items()):
+                f.write(f"{stack} {count}\n")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    # --- SQL time of the profiled request ---
+
+    def _observe_query(self, statement, parameters, seconds):
+        active = getattr(self._local, "active", None)
+        if active is not None:
+            active.sql_count += 1
+            active.sql_seconds += seconds
+
+
+def signer_for(app):
+    secret = app.config.get("PROFILING_SECRET") or app.config["SECRET_KEY"]
+    return TimestampSigner(secret, salt=_SIGNER_SALT)
+
+
+def profile_token(app):
+    """Header value that asks for a profile (valid for PROFILING_TOKEN_MAX_AGE)."""
+    return signer_for(app).sign(_SIGNED_VALUE).decode("ascii")
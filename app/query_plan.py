@@ -0,0 +1,46 @@
+from app.extensions import db
+from app.models import Task
+
+
+def hot_queries(user_id=1):
+    """The task queries issued on every request, as the routes build them."""
+    by_user = Task.query.filter_by(user_id=user_id)
+    return {
+        "list_tasks": by_user.order_by(Task.id).limit(5).offset(5),
+        "list_tasks_done": by_user.filter_by(done=True).order_by(Task.id).limit(5),
+        "list_tasks_count": by_user.filter_by(done=False).with_entities(
+            db.func.count()
+        ),
+        "list_tasks_keyset": by_user.filter(Task.id > 100).order_by(Task.id).limit(6),
+        "get_task": Task.query.filter_by(id=1, user_id=user_id),
+    }
+
+
+def explain(query, engine):
+    sql = query.statement.compile(
+        dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row[-1] for row in rows]
+
+
+def check_query_plans(engine=None):
+    """Return ``{query_name: [plan lines]}`` for hot queries that scan or sort.
+
+    Only SQLite is checked (``EXPLAIN QUERY PLAN``); other databases return ``{}``.
+    """
+    engine = engine or db.engine
+    if engine.dialect.name != "sqlite":
+        return {}
+
+    problems = {}
+    for name, query in hot_queries().items():
+        plan = explain(query, engine)
+        bad = [
+            line for line in plan
+            if line.startswith("SCAN") or "TEMP B-TREE" in line
+        ]
+        if bad:
+            problems[name] = plan
+    return problems
@@ -0,0 +1,195 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from flask import request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from flask_limiter.util import get_remote_address
+from jwt.exceptions import PyJWTError
+from limits.storage import Storage
+from limits.strategies import STRATEGIES, FixedWindowRateLimiter
+
+
+def rate_limit_key():
+    """Limit per JWT identity when the request has a valid token, else per client IP.
+
+    The token check goes through the auth context, so the view's
+    ``@auth_required()`` reuses it instead of verifying again.
+    """
+    if request.headers.get("Authorization"):
+        from app.auth.context import load_auth_context  # app.auth imports the models
+
+        try:
+            auth = load_auth_context(optional=True)
+        except (JWTExtendedException, PyJWTError):
+            auth = None  # the view reports the bad token itself
+        if auth is not None:
+            return f"user:{auth.user_id}"
+    return f"ip:{get_remote_address()}"
+
+
+class SQLiteStorage(Storage):
+    """limits storage in a SQLite file, shared by every process on the host.
+
+    ``RATELIMIT_STORAGE_URI = "sqlite:////abs/path/ratelimit.db"``. Each
+    counter update is a single upsert statement, so it is atomic across
+    processes; use a Redis URI to share limits between hosts.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+    PURGE_EVERY = 1000  # increments between sweeps of expired counters
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = urlparse(uri).path[1:] or ":memory:"
+        self._local = threading.local()
+        self._increments = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS limits "
+                "(key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+            )
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connect(self):
+        # One connection per thread, reopened after a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # counters need no durability
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        conn = self._connect()
+        count = conn.execute(
+            "INSERT INTO limits (key, count, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "count = CASE WHEN expires_at <= ? THEN excluded.count ELSE max(count + ?, 0) END, "
+            "expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END "
+            "RETURNING count",
+            (key, max(amount, 0), now + expiry, now, amount, now),  # refunds never go below 0
+        ).fetchone()[0]
+        self._increments += 1
+        if self._increments % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM limits WHERE expires_at <= ?", (now,))
+        return count
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT count FROM limits WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connect().execute(
+            "SELECT expires_at FROM limits WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self._connect().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._connect().execute("DELETE FROM limits").rowcount
+
+    def clear(self, key):
+        self._connect().execute("DELETE FROM limits WHERE key = ?", (key,))
+
+
+class LocalBudgetRateLimiter(FixedWindowRateLimiter):
+    """Fixed window where clients well under quota skip the storage round trip.
+
+    A hit that goes to storage leases ``BUDGET_FRACTION`` of the limit in the
+    same increment when this process last saw the shared count below half
+    the limit. If the count the increment returns shows other processes got
+    there first, the part of the lease above half the limit is handed back,
+    so at most half the limit is ever leased per window. Later hits in this
+    process spend the lease locally until it runs out or the window ends.
+    From half the limit on every hit goes to storage. Leased but unused hits
+    count against the window, which can only make the limit stricter, never
+    looser.
+    """
+
+    BUDGET_FRACTION = 0.1
+    MAX_KEYS = 10000
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        self._budgets = {}  # key -> [tokens, window_ends_at, last_shared_count]
+        self._lock = threading.Lock()
+
+    def after_fork(self):
+        """In a forked child: leases were taken by the parent, spend none of them twice."""
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    def _local_budget(self, key, now):
+        budget = self._budgets.get(key)
+        if budget is not None and budget[1] <= now:
+            del self._budgets[key]
+            return None
+        return budget
+
+    def hit(self, item, *identifiers, cost=1):
+        key = item.key_for(*identifiers)
+        now = time.time()
+        half = item.amount / 2
+        with self._lock:
+            budget = self._local_budget(key, now)
+            if budget is not None and budget[0] >= cost:
+                budget[0] -= cost
+                return True
+            lease = cost
+            if budget is not None and budget[2] + cost < half:
+                lease = max(cost, int(item.amount * self.BUDGET_FRACTION))
+
+        count = self.storage.incr(key, item.get_expiry(), amount=lease)
+        if lease > cost and count > half:
+            # Hand back only into the window the lease went to: that window has
+            # not ended yet, and any window started after it ends later
+            leased_at = time.time()
+            expires = self.storage.get_expiry(key)  # "now" once the window has ended
+            if time.time() < expires <= leased_at + item.get_expiry():
+                excess = min(lease - cost, math.ceil(count - half))
+                count = self.storage.incr(key, item.get_expiry(), amount=-excess)
+                lease -= excess
+        before = count - lease
+        allowed = before + cost <= item.amount
+        spare = min(lease, item.amount - before) - cost if allowed else 0
+        window_ends_at = self.storage.get_expiry(key) if spare > 0 else now + item.get_expiry()
+
+        with self._lock:
+            if len(self._budgets) >= self.MAX_KEYS:
+                self._budgets = {k: b for k, b in self._budgets.items() if b[1] > now}
+            self._budgets[key] = [spare, window_ends_at, count]
+        return allowed
+
+    def test(self, item, *identifiers, cost=1):
+        with self._lock:
+            budget = self._local_budget(item.key_for(*identifiers), time.time())
+            if budget is not None and budget[0] >= cost:
+                return True
+        return super().test(item, *identifiers, cost=cost)
+
+    def clear(self, item, *identifiers):
+        with self._lock:
+            self._budgets.pop(item.key_for(*identifiers), None)
+        return super().clear(item, *identifiers)
+
+
+# Makes RATELIMIT_STRATEGY = "local-budget" available to flask_limiter
+STRATEGIES["local-budget"] = LocalBudgetRateLimiter
@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify
-from ..extensions import db
+from flask import Blueprint, request, jsonify, current_app
+from ..extensions import db, limiter
 from ..models import User
 from flask_jwt_extended import create_access_token
+from ..auth.context import auth_required, current_auth
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -50,6 +51,7 @@ def register():
 
 
 @auth_bp.route("/login", methods=["POST"])
+@limiter.limit(lambda: current_app.config["RATELIMIT_LOGIN"])
 def login():
     """
     User login to get JWT token
@@ -83,13 +85,45 @@ def login():
     if not user or not user.check_password(password):
         return {"error": "invalid credentials"}, 401
 
+    # 🔹 Upgrade hashes made with old algorithm/cost settings
+    if user.password_needs_rehash():
+        user.set_password(password)
+        db.session.commit()
+
     # 🔹 Add role as custom claim in JWT
     access_token = create_access_token(
         identity=str(user.id),
-        additional_claims={"role": user.role}
+        additional_claims={"role": user.role, "username": user.username}
     )
 
     return {
         "access_token": access_token,
         "role": user.role   # optional: helpful for frontend
     }, 200
+
+
+@auth_bp.route("/me", methods=["GET"])
+@auth_required()
+def me():
+    """
+    Current user, read from the verified token claims
+    ---
+    tags:
+      - Auth
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: id, username and role of the caller
+      401:
+        description: Missing or invalid token
+    """
+    auth = current_auth()
+    username = auth.claims.get("username")
+    if username is None:
+        # Tokens issued before the username claim existed
+        user = db.session.get(User, int(auth.user_id))
+        if not user:
+            return {"error": "user not found"}, 404
+        username = user.username
+    return {"id": int(auth.user_id), "username": username, "role": auth.role}, 200
@@ -1,19 +1,35 @@
-from flask import Blueprint, request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import json
+import math
+
+from flask import Blueprint, request, current_app, stream_with_context
+from flask_jwt_extended import get_jwt_identity
 from marshmallow import ValidationError
 
-from app.schemas.task_schema import task_schema, tasks_schema, task_update_schema
-from app.services.task_service import create_task, update_task
+from app.schemas.task_schema import task_schema, task_update_schema, task_rows
+from app.services.task_service import create_task, update_task, remove_task, apply_batch
+from app.services.etag_service import conditional_task_read
+from app.services.cache_service import user_cached
+from app.services.read_routing import use_read_replica
+from app.services.export_service import ndjson_chunks, csv_chunks
+from app.services.import_service import import_tasks, ndjson_records, csv_records
+from app.services.pagination import decode_cursor, keyset_page, keyset_per_page, InvalidCursor, MAX_ID
+from app.services.search_service import search_terms, search_tasks
+from app.services.stats_service import get_stats, task_total, today
 from app.models import Task
-from app.extensions import db, cache
+from app.extensions import db, limiter
+from app.group_commit import WriteTimeout
+from app.auth.context import auth_required, current_auth
 from app.auth.decorators import role_required
 
 task_bp = Blueprint("tasks", __name__)
 
 # 🔹 LIST tasks with pagination/filter
 @task_bp.route("/", methods=["GET"])
-@jwt_required()
-@cache.cached(timeout=60, query_string=True)
+@limiter.limit(lambda: current_app.config["RATELIMIT_TASKS"])
+@auth_required()
+@use_read_replica
+@conditional_task_read
+@user_cached("tasks:list", timeout=60)
 def list_tasks():
     user_id = get_jwt_identity()
 
@@ -23,31 +39,103 @@ def list_tasks():
 
     query = Task.query.filter_by(user_id=user_id)
 
+    done = None
     if done_filter is not None:
         if done_filter.lower() in ["true", "1"]:
-            query = query.filter_by(done=True)
+            done = True
         elif done_filter.lower() in ["false", "0"]:
-            query = query.filter_by(done=False)
+            done = False
+    if done is not None:
+        query = query.filter_by(done=done)
+
+    # 🔹 Keyset mode (opt-in): ?cursor= / ?after_id= skips OFFSET and COUNT
+    if "cursor" in request.args or "after_id" in request.args:
+        try:
+            after_id = decode_cursor(request.args.get("cursor"))
+        except InvalidCursor:
+            return {"errors": {"cursor": "Invalid cursor"}}, 400
+        if after_id is None:
+            after_id = request.args.get("after_id", type=int)
+            if after_id is not None and not 0 <= after_id <= MAX_ID:
+                return {"errors": {"after_id": "Invalid after_id"}}, 400
+
+        per_page = keyset_per_page(per_page)
+        rows, next_cursor = keyset_page(
+            query.with_entities(*task_rows.columns), Task.id, after_id, per_page
+        )
+        result = {
+            "tasks": task_rows.dump_many(rows),
+            "per_page": per_page,
+            "next_cursor": next_cursor,
+        }
+        if request.args.get("with_total", "").lower() in ["true", "1"]:
+            result["total"] = task_total(user_id, done)
+
+        current_app.logger.info(
+            "Tasks listed for user %s, after %s", user_id, after_id, extra={"sample": True}
+        )
+        return result, 200
 
-    pagination = query.order_by(Task.id).paginate(
-        page=page, per_page=per_page, error_out=False
+    # 🔹 Plain row tuples + precompiled serializer instead of ORM objects + marshmallow;
+    # the total comes from the stats counters instead of a COUNT(*)
+    pagination = query.with_entities(*task_rows.columns).order_by(Task.id).paginate(
+        page=page, per_page=per_page, error_out=False, count=False
     )
+    total = task_total(user_id, done)
 
     result = {
-        "tasks": tasks_schema.dump(pagination.items),
-        "total": pagination.total,
+        "tasks": task_rows.dump_many(pagination.items),
+        "total": total,
         "page": pagination.page,
-        "pages": pagination.pages,
+        "pages": math.ceil(total / pagination.per_page) if total else 0,
         "per_page": pagination.per_page,
     }
 
-    current_app.logger.info(f"Tasks listed for user {user_id}, page {page}")
+    current_app.logger.info(
+        "Tasks listed for user %s, page %s", user_id, page, extra={"sample": True}
+    )
     return result, 200
 
 
+# 🔹 SEARCH tasks by keyword (ranked, paginated)
+@task_bp.route("/search", methods=["GET"])
+@auth_required()
+@use_read_replica
+@conditional_task_read
+@user_cached("tasks:search", timeout=60)
+def search():
+    user_id = get_jwt_identity()
+
+    terms = search_terms(request.args.get("q"))
+    if not terms:
+        return {"errors": {"q": "Missing search query"}}, 400
+
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 5, type=int), 1), 100)
+
+    result = search_tasks(user_id, terms, page, per_page)
+    current_app.logger.info(
+        "Tasks searched by user %s, page %s", user_id, page, extra={"sample": True}
+    )
+    return result, 200
+
+
+# 🔹 STATS: open/done counters and tasks created per day (?days=, default 30)
+@task_bp.route("/stats", methods=["GET"])
+@auth_required()
+@use_read_replica
+# The per-day window moves at midnight (UTC), so its date is part of the ETag and cache key
+@conditional_task_read(vary=lambda: today().isoformat())
+@user_cached("tasks:stats", timeout=60, vary=lambda: today().isoformat())
+def stats():
+    days = min(max(request.args.get("days", 30, type=int), 1), 366)
+    return get_stats(get_jwt_identity(), days), 200
+
+
 # 🔹 CREATE task
 @task_bp.route("/", methods=["POST"])
-@jwt_required()
+@limiter.limit(lambda: current_app.config["RATELIMIT_TASKS"])
+@auth_required()
 def add_task():
     user_id = get_jwt_identity()
     data = request.get_json() or {}
@@ -56,44 +144,185 @@ def add_task():
         validated = task_schema.load(data)
     except ValidationError as err:
         current_app.logger.warning(
-            f"Validation failed for user {user_id}: {err.messages}"
+            "Validation failed for user %s: %s", user_id, err.messages
         )
         return {"errors": err.messages}, 422
 
     try:
         task = create_task(user_id, validated)
-        current_app.logger.info(f"Task created by user {user_id}: {task.title}")
-        return task_schema.dump(task), 201
+        current_app.logger.info("Task created by user %s: %s", user_id, task["title"])
+        return task, 201
+    except WriteTimeout:
+        raise
     except Exception as e:
-        current_app.logger.error(f"DB error creating task: {str(e)}")
+        current_app.logger.error("DB error creating task: %s", e)
         return {"errors": {"db": "Internal server error"}}, 500
 
 
+# 🔹 EXPORT all tasks as a stream (NDJSON by default, or ?format=csv)
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+    "csv": (csv_chunks, "text/csv"),
+}
+
+
+@task_bp.route("/export", methods=["GET"])
+@auth_required()
+@use_read_replica
+def export_tasks():
+    user_id = get_jwt_identity()
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in EXPORT_FORMATS:
+        return {"errors": {"format": f"Must be one of: {', '.join(EXPORT_FORMATS)}"}}, 400
+
+    chunks, mimetype = EXPORT_FORMATS[fmt]
+    chunk_size = current_app.config["EXPORT_CHUNK_SIZE"]
+    current_app.logger.info("Task export (%s) started for user %s", fmt, user_id)
+    return current_app.response_class(
+        stream_with_context(chunks(user_id, chunk_size)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=tasks.{fmt}"},
+    )
+
+
+# 🔹 IMPORT tasks from a streamed NDJSON (default) or CSV upload
+@task_bp.route("/import", methods=["POST"])
+@auth_required()
+def import_tasks_stream():
+    user_id = get_jwt_identity()
+    fmt = request.args.get("format")
+    if fmt is None:
+        fmt = "csv" if request.mimetype == "text/csv" else "ndjson"
+    if fmt not in ("ndjson", "csv"):
+        return {"errors": {"format": "Must be one of: ndjson, csv"}}, 400
+
+    records = csv_records if fmt == "csv" else ndjson_records
+    chunk_size = current_app.config["IMPORT_CHUNK_SIZE"]
+    logger = current_app.logger
+
+    def generate():
+        try:
+            for event in import_tasks(user_id, records(request.stream), chunk_size):
+                if "progress" in event:
+                    logger.info("Import for user %s: %s", user_id, event["progress"])
+                elif "summary" in event:
+                    logger.info("Import finished for user %s: %s", user_id, event["summary"])
+                yield json.dumps(event, separators=(",", ":")) + "\n"
+        except Exception as e:
+            logger.error("DB error importing tasks: %s", e)
+            yield json.dumps({"errors": {"db": "Internal server error"}}) + "\n"
+
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
+
+
+# 🔹 BATCH create/update/delete in one transaction
+@task_bp.route("/batch", methods=["POST"])
+@auth_required()
+def batch_tasks():
+    user_id = get_jwt_identity()
+    body = request.get_json() or {}
+    operations = body.get("operations") if isinstance(body, dict) else None
+    max_size = current_app.config["TASK_BATCH_MAX_SIZE"]
+
+    if not isinstance(operations, list) or not operations:
+        return {"errors": {"operations": ["Must be a non-empty list"]}}, 422
+    if len(operations) > max_size:
+        return {"errors": {"operations": [f"At most {max_size} operations per batch"]}}, 422
+
+    # Validation pass: nothing is written unless every operation is valid
+    errors, loaded, seen_ids = {}, [], set()
+    is_admin = current_auth().role == "admin"
+    for index, op in enumerate(operations):
+        kind = op.get("op") if isinstance(op, dict) else None
+        try:
+            if kind == "create":
+                loaded.append((index, kind, None, task_schema.load(op.get("data") or {})))
+                continue
+            if kind not in ("update", "delete"):
+                raise ValidationError({"op": ["Must be one of: create, update, delete."]})
+            task_id = op.get("id")
+            if not isinstance(task_id, int) or isinstance(task_id, bool):
+                raise ValidationError({"id": ["Must be an integer."]})
+            if task_id in seen_ids:
+                raise ValidationError({"id": ["Task appears more than once in the batch."]})
+            seen_ids.add(task_id)
+            if kind == "delete" and not is_admin:
+                raise ValidationError({"op": ["Forbidden"]})
+            data = task_update_schema.load(op.get("data") or {}) if kind == "update" else None
+            loaded.append((index, kind, task_id, data))
+        except ValidationError as err:
+            errors[index] = err.messages
+
+    # One query for every task the batch touches
+    tasks = {}
+    if seen_ids:
+        tasks = {
+            task.id: task
+            for task in Task.query.filter(Task.user_id == user_id, Task.id.in_(seen_ids))
+        }
+    for index, kind, task_id, _ in loaded:
+        if task_id is not None and task_id not in tasks:
+            errors.setdefault(index, {})["id"] = ["Not found"]
+
+    if errors:
+        current_app.logger.warning("Batch rejected for user %s: %s", user_id, errors)
+        return {"errors": errors}, 422
+
+    creates = [data for _, kind, _, data in loaded if kind == "create"]
+    updates = [(tasks[task_id], data) for _, kind, task_id, data in loaded if kind == "update"]
+    delete_ids = [task_id for _, kind, task_id, _ in loaded if kind == "delete"]
+
+    try:
+        created, updated = apply_batch(user_id, creates, updates, delete_ids)
+        created = iter(created)
+    except Exception as e:
+        current_app.logger.error("DB error applying batch: %s", e)
+        return {"errors": {"db": "Internal server error"}}, 500
+
+    results = []
+    for index, kind, task_id, _ in loaded:
+        if kind == "create":
+            results.append({"index": index, "op": kind, "status": 201,
+                            "task": next(created)})
+        elif kind == "update":
+            results.append({"index": index, "op": kind, "status": 200,
+                            "task": updated[task_id]})
+        else:
+            results.append({"index": index, "op": kind, "status": 200, "id": task_id})
+
+    current_app.logger.info("Batch of %s operations applied by user %s", len(results), user_id)
+    return {"results": results}, 200
+
+
 # 🔹 GET single task
 @task_bp.route("/<int:task_id>", methods=["GET"])
-@jwt_required()
+@auth_required()
+@use_read_replica
+@conditional_task_read
 def get_task(task_id):
     user_id = get_jwt_identity()
     task = Task.query.filter_by(id=task_id, user_id=user_id).first()
 
     if not task:
-        current_app.logger.warning(f"Task {task_id} not found for user {user_id}")
+        current_app.logger.warning("Task %s not found for user %s", task_id, user_id)
         return {"errors": {"task": "Not found"}}, 404
 
-    current_app.logger.info(f"Task {task_id} retrieved by user {user_id}")
+    current_app.logger.info("Task %s retrieved by user %s", task_id, user_id)
     return task_schema.dump(task), 200
 
 
 # 🔹 UPDATE task
 @task_bp.route("/<int:task_id>", methods=["PATCH"])
-@jwt_required()
+@auth_required()
 def edit_task(task_id):
     user_id = get_jwt_identity()
     task = Task.query.filter_by(id=task_id, user_id=user_id).first()
 
     if not task:
         current_app.logger.warning(
-            f"Update failed: Task {task_id} not found for user {user_id}"
+            "Update failed: Task %s not found for user %s", task_id, user_id
         )
         return {"errors": {"task": "Not found"}}, 404
 
@@ -102,23 +331,27 @@ def edit_task(task_id):
         validated = task_update_schema.load(data)
     except ValidationError as err:
         current_app.logger.warning(
-            f"Validation failed on update by user {user_id}: {err.messages}"
+            "Validation failed on update by user %s: %s", user_id, err.messages
         )
         return {"errors": err.messages}, 422
 
     try:
         updated_task = update_task(task, validated)
-        current_app.logger.info(f"Task {task_id} updated by user {user_id}")
-        return task_schema.dump(updated_task), 200
+        if updated_task is None:
+            return {"errors": {"task": "Not found"}}, 404
+        current_app.logger.info("Task %s updated by user %s", task_id, user_id)
+        return updated_task, 200
+    except WriteTimeout:
+        raise
     except Exception as e:
-        current_app.logger.error(f"DB error updating task: {str(e)}")
+        current_app.logger.error("DB error updating task: %s", e)
         return {"errors": {"db": "Internal server error"}}, 500
 
 
 # 🔹 DELETE task
 # Only admins can delete tasks
 @task_bp.route("/<int:task_id>", methods=["DELETE"])
-@jwt_required()
+@auth_required()
 @role_required("admin")
 def delete_task(task_id):
     user_id = get_jwt_identity()
@@ -126,17 +359,15 @@ def delete_task(task_id):
 
     if not task:
         current_app.logger.warning(
-            f"Delete failed: Task {task_id} not found for user {user_id}"
+            "Delete failed: Task %s not found for user %s", task_id, user_id
         )
         return {"errors": {"task": "Not found"}}, 404
 
     try:
-        db.session.delete(task)
-        db.session.commit()
-        cache.clear()
-        current_app.logger.info(f"Task {task_id} deleted by user {user_id}")
+        remove_task(task)
+        current_app.logger.info("Task %s deleted by user %s", task_id, user_id)
         return {"message": "Task deleted"}, 200  # or 204 with empty body
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"DB error deleting task: {str(e)}")
+        current_app.logger.error("DB error deleting task: %s", e)
         return {"errors": {"db": "Internal server error"}}, 500
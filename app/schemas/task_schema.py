@@ -1,5 +1,8 @@
 from marshmallow import Schema, fields
 
+from app.models import Task
+from app.schemas.fast_serializer import RowSerializer
+
 # 🔹 Schema classes
 class TaskSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -18,3 +21,6 @@ class TaskUpdateSchema(Schema):
 task_schema = TaskSchema()
 tasks_schema = TaskSchema(many=True)
 task_update_schema = TaskUpdateSchema()
+
+# 🔹 Fast path for reads: fetch with_entities(*task_rows.columns), then task_rows.dump_many(rows)
+task_rows = RowSerializer(task_schema, Task)
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from flask import request
+from flask_jwt_extended import get_jwt_identity
+
+from app.extensions import cache
+
+
+# 🔹 Hit/miss counters for the per-user task cache (process-local)
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    """Return a snapshot of the per-user cache counters."""
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats["hits"] = 0
+        _stats["misses"] = 0
+
+
+def _version_key(user_id):
+    return f"tasks:ver:{user_id}"
+
+
+def user_cache_version(user_id):
+    """Current cache generation for a user's task pages.
+
+    A missing stamp (first use or evicted) is replaced with a fresh one, so
+    pages cached under an older stamp can never be served again.
+    """
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = time.time_ns()
+        cache.set(_version_key(user_id), version, timeout=0)
+    return version
+
+
+def bump_user_cache_version(user_id):
+    """Invalidate every cached task page of one user.
+
+    Only the user's stamp changes; old entries are left to expire on their own.
+    """
+    cache.set(_version_key(user_id), time.time_ns(), timeout=0)
+
+
+def user_cache_key(user_id, prefix):
+    args = sorted(request.args.items(multi=True))
+    args_hash = hashlib.md5(repr(args).encode("utf-8")).hexdigest()
+    return f"{prefix}:{user_id}:{user_cache_version(user_id)}:{args_hash}"
+
+
+def user_cached(prefix, timeout=None, vary=None):
+    """Cache a view's ``(body, status)`` result per JWT identity.
+
+    Must be applied below ``@jwt_required()`` so the identity is available.
+    ``vary`` (a function returning a string) is added to the key for views
+    that depend on more than the user's tasks. Responses carry an
+    ``X-Cache: HIT|MISS`` header.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorated(*args, **kwargs):
+            key = user_cache_key(get_jwt_identity(), prefix)
+            if vary is not None:
+                key = f"{key}:{vary()}"
+            cached = cache.get(key)
+            if cached is not None:
+                _record("hits")
+                body, status = cached
+                return body, status, {"X-Cache": "HIT"}
+
+            _record("misses")
+            body, status = fn(*args, **kwargs)
+            if status == 200:
+                cache.set(key, (body, status), timeout=timeout)
+            return body, status, {"X-Cache": "MISS"}
+        return decorated
+    return wrapper
@@ -0,0 +1,62 @@
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.extensions import db
+from app.models import User
+
+
+def user_tasks_version(user_id):
+    return db.session.execute(
+        db.select(User.tasks_version).where(User.id == user_id)
+    ).scalar()
+
+
+def url_etag(user_id, version, path, args):
+    """ETag for ``path`` + sorted ``(name, value)`` query ``args`` at a tasks version."""
+    url_hash = hashlib.md5(repr((path, args)).encode("utf-8")).hexdigest()[:16]
+    return f"{user_id}-{version}-{url_hash}"
+
+
+def task_read_etag(user_id, version, vary=None):
+    """Strong ETag for the current URL, valid while the user's tasks are unchanged.
+
+    ``vary`` is anything else the response depends on (e.g. today's date).
+    """
+    args = sorted(request.args.items(multi=True))
+    if vary is not None:
+        args.append(("", vary))
+    return url_etag(user_id, version, request.path, args)
+
+
+def conditional_task_read(fn=None, *, vary=None):
+    """Answer ``If-None-Match`` with 304 before the view runs any Task query.
+
+    The ETag comes from ``users.tasks_version`` (one primary-key lookup),
+    which every write path bumps in its own transaction. A view whose body
+    also depends on something else passes ``vary``, a function returning a
+    string that is added to the ETag. Apply below ``@auth_required()``.
+    """
+    if fn is None:
+        return lambda fn: conditional_task_read(fn, vary=vary)
+
+    @wraps(fn)
+    def decorated(*args, **kwargs):
+        user_id = get_jwt_identity()
+        version = user_tasks_version(user_id)
+        if version is None:
+            return fn(*args, **kwargs)
+
+        etag = task_read_etag(user_id, version, vary() if vary is not None else None)
+        if request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+        else:
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    return decorated
@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+
+from app.extensions import db
+from app.models import Task
+from app.schemas.task_schema import task_schema, task_rows
+
+EXPORT_FIELDS = list(task_schema.dump_fields)
+
+
+def iter_user_tasks(user_id, chunk_size):
+    """Yield lists of serialized tasks, fetched ``chunk_size`` rows at a time."""
+    stmt = (
+        db.select(*task_rows.columns)
+        .filter_by(user_id=user_id)
+        .order_by(Task.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for rows in db.session.execute(stmt).partitions():
+        yield task_rows.dump_many(rows)
+
+
+def ndjson_chunks(user_id, chunk_size):
+    for tasks in iter_user_tasks(user_id, chunk_size):
+        yield "".join(
+            json.dumps(task, separators=(",", ":")) + "\n"
+            for task in tasks
+        )
+
+
+def csv_chunks(user_id, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for tasks in iter_user_tasks(user_id, chunk_size):
+        writer.writerows(tasks)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
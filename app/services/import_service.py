@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from marshmallow import ValidationError
+
+from app.extensions import db
+from app.models import Task
+from app.schemas.task_schema import task_schema
+from app.services.search_service import index_rows
+from app.services.stats_service import record_task_changes
+from app.services.task_service import stamp_tasks_changed, tasks_changed
+
+# Fields written by export but owned by the server on import
+IGNORED_FIELDS = {name for name, field in task_schema.fields.items() if field.dump_only}
+
+
+def ndjson_records(stream):
+    """Yield ``(line_no, record_or_error)`` from a binary NDJSON stream."""
+    for line_no, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw.decode("utf-8"))
+        except UnicodeDecodeError:
+            yield line_no, ValidationError({"line": ["Invalid UTF-8"]})
+            continue
+        except ValueError:
+            yield line_no, ValidationError({"line": ["Invalid JSON"]})
+            continue
+        if not isinstance(record, dict):
+            yield line_no, ValidationError({"line": ["Expected a JSON object"]})
+            continue
+        yield line_no, record
+
+
+def csv_records(stream):
+    """Yield ``(line_no, record)`` from a binary CSV stream with a header row.
+
+    Quoted cells may span lines, so the reader cannot resync after bytes
+    that are not UTF-8: they are reported as an error on the next line and
+    end the import.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+    try:
+        for record in reader:
+            # Empty cells mean "not provided" (e.g. description exported as None)
+            yield reader.line_num, {k: v for k, v in record.items() if k and v != ""}
+    except UnicodeDecodeError:
+        yield reader.line_num + 1, ValidationError({"line": ["Invalid UTF-8, import stopped"]})
+
+
+def import_tasks(user_id, records, chunk_size):
+    """Validate records and insert them in chunks, yielding progress events.
+
+    Events are dicts: ``{"error": ...}`` for each rejected line,
+    ``{"progress": ...}`` after every committed chunk and a final
+    ``{"summary": ...}``. Only one chunk of rows is held in memory.
+    """
+    imported = failed = lines = 0
+    pending = []
+
+    def flush():
+        nonlocal imported
+        if db.session.get_bind().dialect.insert_executemany_returning:
+            inserted = db.session.execute(
+                db.insert(Task).returning(Task.id, Task.created_at, sort_by_parameter_order=True),
+                pending,
+            ).all()
+            index_rows({**row, "id": task_id} for row, (task_id, _) in zip(pending, inserted))
+            created = [created_at for _, created_at in inserted]
+        else:
+            # e.g. MySQL: no RETURNING for executemany (nor an FTS index to fill)
+            now = datetime.utcnow()
+            db.session.execute(db.insert(Task), [{**row, "created_at": now} for row in pending])
+            created = [now] * len(pending)
+        record_task_changes(
+            user_id, added=[(row["done"], created_at) for row, created_at in zip(pending, created)]
+        )
+        stamp_tasks_changed(user_id)
+        db.session.commit()
+        tasks_changed(user_id)
+        imported += len(pending)
+        pending.clear()
+
+    for line_no, record in records:
+        lines = line_no
+        if isinstance(record, dict):
+            record = {k: v for k, v in record.items() if k not in IGNORED_FIELDS}
+        try:
+            if isinstance(record, ValidationError):
+                raise record
+            data = task_schema.load(record)
+        except ValidationError as err:
+            failed += 1
+            yield {"error": {"line": line_no, "errors": err.messages}}
+            continue
+
+        pending.append({
+            "title": data["title"],
+            "description": data.get("description"),
+            "done": data.get("done", False),
+            "user_id": user_id,
+        })
+        if len(pending) >= chunk_size:
+            try:
+                flush()
+            except Exception:
+                db.session.rollback()
+                raise
+            yield {"progress": {"imported": imported, "failed": failed, "lines": lines}}
+
+    if pending:
+        try:
+            flush()
+        except Exception:
+            db.session.rollback()
+            raise
+    yield {"summary": {"imported": imported, "failed": failed, "lines": lines}}
@@ -0,0 +1,57 @@
+import base64
+import json
+
+
+# Largest id a 64-bit integer column (and SQLite's bind) can hold
+MAX_ID = 2**63 - 1
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def check_after_id(after_id):
+    """``after_id`` if it is a usable id, else InvalidCursor."""
+    if isinstance(after_id, bool) or not isinstance(after_id, int) or not 0 <= after_id <= MAX_ID:
+        raise InvalidCursor("Invalid cursor")
+    return after_id
+
+
+def keyset_per_page(per_page):
+    return min(max(per_page, 1), MAX_PER_PAGE)
+
+
+def encode_cursor(last_id):
+    """Opaque cursor pointing just after ``last_id``."""
+    raw = json.dumps({"after_id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the ``after_id`` carried by a cursor (``None`` for an empty one)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return check_after_id(data["after_id"])
+    except (ValueError, KeyError, TypeError, OverflowError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+def keyset_page(query, id_column, after_id, per_page):
+    """Fetch one page ordered by ``id_column`` starting after ``after_id``.
+
+    One extra row is read to know whether a next page exists, so no COUNT
+    or OFFSET scan is needed.
+    """
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    rows = query.order_by(id_column).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1].id)
+    return rows, next_cursor
@@ -0,0 +1,58 @@
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.db_routing import READ_ONLY_KEY, read_engines
+from app.extensions import cache
+
+# Local copy of recent writers; the cache entry covers other processes
+_recent_writes = {}
+_recent_lock = threading.Lock()
+
+
+def _key(user_id):
+    return f"tasks:rw:{user_id}"
+
+
+def note_user_write(user_id):
+    """Pin the user's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    window = current_app.config["READ_YOUR_WRITES_SECONDS"]
+    if not window or not read_engines():
+        return
+    now = time.monotonic()
+    with _recent_lock:
+        _recent_writes[str(user_id)] = now + window
+        if len(_recent_writes) > 10000:
+            for uid, until in list(_recent_writes.items()):
+                if until <= now:
+                    del _recent_writes[uid]
+    cache.set(_key(user_id), 1, timeout=max(int(window), 1))
+
+
+def wrote_recently(user_id):
+    with _recent_lock:
+        until = _recent_writes.get(str(user_id))
+    if until is not None and until > time.monotonic():
+        return True
+    return cache.get(_key(user_id)) is not None
+
+
+def use_read_replica(fn):
+    """Serve a read-only view from a read engine when one is configured.
+
+    Apply below ``@auth_required()``. Users who wrote within the
+    read-your-writes window stay on the primary, so their new task can't
+    vanish because a replica is behind.
+    """
+    @wraps(fn)
+    def decorated(*args, **kwargs):
+        if read_engines():
+            user_id = get_jwt_identity()
+            request.environ[READ_ONLY_KEY] = not (
+                current_app.config["READ_YOUR_WRITES_SECONDS"] and wrote_recently(user_id)
+            )
+        return fn(*args, **kwargs)
+    return decorated
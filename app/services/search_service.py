@@ -0,0 +1,164 @@
+import math
+import re
+import weakref
+
+import sqlalchemy as sa
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Task
+from app.schemas.task_schema import task_rows
+
+FTS_TABLE = "tasks_fts"
+MAX_TERMS = 16
+
+# 🔹 rowid = tasks.id; "owner" holds "u<user_id>" so MATCH itself scopes results to one user
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, description, owner, tokenize='unicode61 remove_diacritics 2')"
+)
+
+_INSERT_SQL = sa.text(
+    f"INSERT INTO {FTS_TABLE} (rowid, title, description, owner) "
+    "VALUES (:id, :title, :description, :owner)"
+)
+_DELETE_SQL = sa.text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(
+    sa.bindparam("ids", expanding=True)
+)
+
+_fts = sa.table(FTS_TABLE, sa.column("rowid"))
+_fts_ref = sa.literal_column(FTS_TABLE)
+# bm25 column weights: title, description, owner
+_rank = sa.func.bm25(_fts_ref, 10.0, 1.0, 0.0)
+
+# Engines known to have the FTS table, or known never to (not SQLite)
+_fts_engines = weakref.WeakKeyDictionary()
+
+
+@event.listens_for(Task.__table__, "after_create")
+def _create_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(CREATE_FTS_SQL)
+
+
+@event.listens_for(Task.__table__, "before_drop")
+def _drop_fts(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def fts_enabled():
+    """True when the session's database has the FTS5 index (SQLite only).
+
+    A missing table is looked up again on every call, so running processes
+    start using the index once ``flask search-backfill`` has created it.
+    """
+    engine = db.session.get_bind()
+    enabled = _fts_engines.get(engine)
+    if enabled is None:
+        if engine.dialect.name != "sqlite":
+            enabled = _fts_engines[engine] = False
+        # Inspect on the session's own connection: a separate one would end its
+        # transaction when the pool hands out a single shared connection
+        elif sa.inspect(db.session.connection()).has_table(FTS_TABLE):
+            enabled = _fts_engines[engine] = True
+        else:
+            enabled = False
+    return enabled
+
+
+def _owner(user_id):
+    return f"u{user_id}"
+
+
+def index_rows(rows):
+    """Add new tasks to the index, in the caller's transaction.
+
+    ``rows`` are dicts with ``id``, ``title``, ``description`` and ``user_id``.
+    """
+    params = [
+        {"id": row["id"], "title": row["title"], "description": row.get("description") or "",
+         "owner": _owner(row["user_id"])}
+        for row in rows
+    ]
+    if params and fts_enabled():
+        db.session.execute(_INSERT_SQL, params)
+
+
+def index_tasks(tasks, replace=False):
+    """Index (or with ``replace=True`` re-index) flushed Task objects."""
+    tasks = list(tasks)
+    if not tasks or not fts_enabled():
+        return
+    if replace:
+        unindex_tasks([task.id for task in tasks])
+    index_rows(
+        {"id": t.id, "title": t.title, "description": t.description, "user_id": t.user_id}
+        for t in tasks
+    )
+
+
+def unindex_tasks(task_ids):
+    if task_ids and fts_enabled():
+        db.session.execute(_DELETE_SQL, {"ids": list(task_ids)})
+
+
+def rebuild_search_index():
+    """Recreate the index from the tasks table; returns the number of rows indexed."""
+    engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return None
+    with engine.begin() as conn:
+        conn.exec_driver_sql(CREATE_FTS_SQL)
+        conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+        conn.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, owner) "
+            "SELECT id, title, coalesce(description, ''), 'u' || user_id FROM tasks"
+        )
+        count = conn.exec_driver_sql(f"SELECT count(*) FROM {FTS_TABLE}").scalar()
+    _fts_engines[engine] = True
+    return count
+
+
+def search_terms(q):
+    """Split a user query into plain word terms (FTS syntax is never passed through)."""
+    return re.findall(r"\w+", q or "")[:MAX_TERMS]
+
+
+def search_tasks(user_id, terms, page, per_page):
+    """Ranked page of the user's tasks matching every term (prefix match).
+
+    Uses the FTS5 index ordered by bm25 when available, otherwise a LIKE scan
+    that ranks title matches first.
+    """
+    if fts_enabled():
+        phrase = " ".join(f'"{term}"*' for term in terms)
+        # Terms are limited to the content columns, or "u1" would match the owner column
+        condition = _fts_ref.match(f'owner:"{_owner(user_id)}" AND {{title description}}: ({phrase})')
+        base = db.select(*task_rows.columns).select_from(_fts).join(
+            Task, Task.id == _fts.c.rowid
+        ).where(condition, Task.user_id == user_id)
+        count = db.select(sa.func.count()).select_from(_fts).where(condition)
+        order = (_rank, Task.id)
+    else:
+        in_title = sa.and_(*[Task.title.icontains(t, autoescape=True) for t in terms])
+        matches = [
+            sa.or_(Task.title.icontains(t, autoescape=True),
+                   Task.description.icontains(t, autoescape=True))
+            for t in terms
+        ]
+        base = db.select(*task_rows.columns).where(Task.user_id == user_id, *matches)
+        count = db.select(sa.func.count()).select_from(Task).where(Task.user_id == user_id, *matches)
+        order = (sa.case((in_title, 0), else_=1), Task.id)
+
+    total = db.session.scalar(count)
+    rows = db.session.execute(
+        base.order_by(*order).limit(per_page).offset((page - 1) * per_page)
+    ).all()
+    return {
+        "tasks": task_rows.dump_many(rows),
+        "total": total,
+        "page": page,
+        "pages": math.ceil(total / per_page) if total else 0,
+        "per_page": per_page,
+    }
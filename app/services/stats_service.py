@@ -0,0 +1,159 @@
+import importlib
+from collections import Counter
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+from app.extensions import db
+from app.models import Task, TaskDailyStats, TaskStats
+
+# Dialects with INSERT ... ON CONFLICT; imported on first use (postgresql is a slow import)
+_UPSERT_DIALECTS = ("sqlite", "postgresql")
+
+
+def _upsert_insert(dialect_name):
+    if dialect_name not in _UPSERT_DIALECTS:
+        return None
+    return importlib.import_module(f"sqlalchemy.dialects.{dialect_name}").insert
+
+
+def today():
+    """Current UTC date; created_at is stored in UTC, so days are UTC days."""
+    return datetime.utcnow().date()
+
+
+def _day(created_at):
+    return created_at.date() if created_at else today()
+
+
+def _increment(model, keys, deltas):
+    """``UPDATE model SET col = col + delta`` for one row, inserting it if missing."""
+    deltas = {col: n for col, n in deltas.items() if n}
+    if not deltas:
+        return
+    insert = _upsert_insert(db.session.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(model).values(**keys, **deltas).on_conflict_do_update(
+            index_elements=list(keys),
+            set_={col: getattr(model, col) + n for col, n in deltas.items()},
+        )
+        db.session.execute(stmt)
+        return
+
+    where = [getattr(model, col) == value for col, value in keys.items()]
+    updated = db.session.execute(
+        sa.update(model).where(*where).values({col: getattr(model, col) + n for col, n in deltas.items()})
+    )
+    if not updated.rowcount:
+        db.session.execute(sa.insert(model).values(**keys, **deltas))
+
+
+def record_task_changes(user_id, added=(), removed=(), done_change=0):
+    """Fold task writes into the user's counters, in the caller's transaction.
+
+    ``added``/``removed`` are ``(done, created_at)`` pairs of inserted and
+    deleted tasks; ``done_change`` is the net number of kept tasks switched
+    to done (negative when switched back).
+    """
+    total = done = 0
+    days = Counter()
+    for is_done, created_at in added:
+        total += 1
+        done += bool(is_done)
+        days[_day(created_at)] += 1
+    for is_done, created_at in removed:
+        total -= 1
+        done -= bool(is_done)
+        days[_day(created_at)] -= 1
+    done += done_change
+
+    _increment(TaskStats, {"user_id": user_id}, {"total": total, "done": done})
+    for day, created in sorted(days.items()):
+        _increment(TaskDailyStats, {"user_id": user_id, "day": day}, {"created": created})
+
+
+def task_total(user_id, done=None):
+    """Number of the user's tasks (optionally only done/open) without a COUNT."""
+    row = db.session.execute(
+        db.select(TaskStats.total, TaskStats.done).where(TaskStats.user_id == user_id)
+    ).first()
+    total, done_count = row if row else (0, 0)
+    if done is None:
+        return total
+    return done_count if done else total - done_count
+
+
+def get_stats(user_id, days=30):
+    """Counters plus the last ``days`` days of tasks created per day."""
+    total = task_total(user_id)
+    done = task_total(user_id, done=True)
+    since = today() - timedelta(days=days - 1)
+    rows = db.session.execute(
+        db.select(TaskDailyStats.day, TaskDailyStats.created)
+        .where(TaskDailyStats.user_id == user_id, TaskDailyStats.day >= since,
+               TaskDailyStats.created != 0)
+        .order_by(TaskDailyStats.day)
+    ).all()
+    return {
+        "total": total,
+        "done": done,
+        "open": total - done,
+        "created_per_day": [{"date": day.isoformat(), "created": created} for day, created in rows],
+    }
+
+
+def reconcile_stats(user_id=None):
+    """Recompute counters from the tasks table and fix any drift.
+
+    Returns the ids of users whose stored counters were wrong.
+    """
+    from app.services.task_service import stamp_tasks_changed, tasks_changed
+
+    def scoped(query, column):
+        return query.where(column == user_id) if user_id is not None else query
+
+    # A task without created_at counts as created today, as in _day()
+    day = sa.func.coalesce(sa.func.date(Task.created_at, type_=sa.Date), today(), type_=sa.Date)
+    actual = {
+        uid: (total, int(done or 0))
+        for uid, total, done in db.session.execute(scoped(
+            db.select(Task.user_id, sa.func.count(), sa.func.sum(sa.cast(Task.done, sa.Integer)))
+            .group_by(Task.user_id), Task.user_id))
+    }
+    actual_days = {
+        (uid, d): n
+        for uid, d, n in db.session.execute(scoped(
+            db.select(Task.user_id, day, sa.func.count()).group_by(Task.user_id, day),
+            Task.user_id))
+    }
+    stored = {
+        uid: (total, done)
+        for uid, total, done in db.session.execute(scoped(
+            db.select(TaskStats.user_id, TaskStats.total, TaskStats.done), TaskStats.user_id))
+    }
+    stored_days = {
+        (uid, d): n
+        for uid, d, n in db.session.execute(scoped(
+            db.select(TaskDailyStats.user_id, TaskDailyStats.day, TaskDailyStats.created)
+            .where(TaskDailyStats.created != 0), TaskDailyStats.user_id))
+    }
+
+    drifted = {uid for uid in actual.keys() | stored.keys()
+               if actual.get(uid, (0, 0)) != stored.get(uid, (0, 0))}
+    drifted |= {uid for uid, d in actual_days.keys() | stored_days.keys()
+                if actual_days.get((uid, d), 0) != stored_days.get((uid, d), 0)}
+
+    for uid in sorted(drifted):
+        db.session.execute(sa.delete(TaskStats).where(TaskStats.user_id == uid))
+        db.session.execute(sa.delete(TaskDailyStats).where(TaskDailyStats.user_id == uid))
+        total, done = actual.get(uid, (0, 0))
+        db.session.add(TaskStats(user_id=uid, total=total, done=done))
+        db.session.add_all(
+            TaskDailyStats(user_id=u, day=d, created=n)
+            for (u, d), n in actual_days.items() if u == uid
+        )
+        stamp_tasks_changed(uid)  # cached/ETagged stats are stale now
+    db.session.commit()
+    for uid in drifted:
+        tasks_changed(uid)
+    return sorted(drifted)
@@ -1,18 +1,136 @@
-from app.extensions import db, cache
-from app.models import Task
+from app.extensions import db, writer
+from app.models import Task, User
+from app.schemas.task_schema import task_schema
+from app.services.cache_service import bump_user_cache_version
+from app.services.read_routing import note_user_write
+from app.services.search_service import index_tasks, unindex_tasks
+from app.services.stats_service import record_task_changes
 
-def create_task(user_id, data):
-    task = Task(title=data["title"], done=data.get("done", False), user_id=user_id)
+TASK_FIELDS = ("title", "description", "done")
+
+
+def stamp_tasks_changed(user_id):
+    """Bump the user's tasks_version inside the current transaction.
+
+    Call before committing any change to a user's tasks; it backs the ETags
+    of GET /tasks/ and GET /tasks/<id>.
+    """
+    db.session.execute(
+        db.update(User)
+        .where(User.id == user_id)
+        .values(tasks_version=User.tasks_version + 1)
+    )
+
+
+def tasks_changed(user_id):
+    """Call after committing any change to a user's tasks."""
+    bump_user_cache_version(user_id)
+    note_user_write(user_id)
+
+
+def _new_task(user_id, data):
+    return Task(
+        title=data["title"],
+        description=data.get("description"),
+        done=data.get("done", False),
+        user_id=user_id,
+    )
+
+
+def _apply_fields(task, data):
+    for field in TASK_FIELDS:
+        if field in data:
+            setattr(task, field, data[field])
+
+
+def _stage_create(user_id, data):
+    task = _new_task(user_id, data)
     db.session.add(task)
-    db.session.commit()
-    cache.clear()
-    return task
+    db.session.flush()  # assigns the id the search index is keyed on
+    index_tasks([task])
+    record_task_changes(user_id, added=[(task.done, task.created_at)])
+    stamp_tasks_changed(user_id)
+    return task_schema.dump(task), user_id
+
+
+def _stage_update(task_id, data):
+    task = db.session.get(Task, task_id)
+    if task is None:  # deleted since the caller looked it up
+        return None, None
+    was_done = bool(task.done)
+    _apply_fields(task, data)
+    if "title" in data or "description" in data:
+        db.session.flush()
+        index_tasks([task], replace=True)
+    record_task_changes(task.user_id, done_change=bool(task.done) - was_done)
+    stamp_tasks_changed(task.user_id)
+    return task_schema.dump(task), task.user_id
+
+
+def create_task(user_id, data):
+    """Create a task and return it serialized (through the group-commit writer)."""
+    return writer.run(_stage_create, user_id, data)
+
 
 def update_task(task, data):
-    if "title" in data:
-        task.title = data["title"]
-    if "done" in data:
-        task.done = data["done"]
+    """Update a task and return it serialized, or ``None`` if it no longer exists.
+
+    Serializing before the commit also saves the reload an expired instance
+    would need afterwards.
+    """
+    return writer.run(_stage_update, task.id, data)
+
+
+def remove_task(task):
+    user_id = task.user_id
+    unindex_tasks([task.id])
+    record_task_changes(user_id, removed=[(task.done, task.created_at)])
+    db.session.delete(task)
+    stamp_tasks_changed(user_id)
     db.session.commit()
-    cache.clear()
-    return task
+    tasks_changed(user_id)
+
+
+def apply_batch(user_id, creates, updates, delete_ids):
+    """Apply validated batch operations in a single transaction.
+
+    ``creates`` is a list of loaded payloads, ``updates`` a list of
+    ``(task, payload)`` pairs and ``delete_ids`` a list of task ids already
+    checked to belong to ``user_id``. Returns the created tasks (in order)
+    and the updated ones (by id), serialized before the commit expires them,
+    so no task is reloaded one query at a time afterwards.
+    """
+    try:
+        new_tasks = [_new_task(user_id, data) for data in creates]
+        db.session.add_all(new_tasks)
+        was_done = sum(bool(task.done) for task, _ in updates)
+        for task, data in updates:
+            _apply_fields(task, data)
+        db.session.flush()
+        index_tasks(new_tasks)
+        index_tasks(
+            [task for task, data in updates if "title" in data or "description" in data],
+            replace=True,
+        )
+        removed = []
+        if delete_ids:
+            doomed = Task.query.filter(Task.user_id == user_id, Task.id.in_(delete_ids))
+            removed = doomed.with_entities(Task.done, Task.created_at).all()
+            doomed.delete(synchronize_session="fetch")
+            unindex_tasks(delete_ids)
+        record_task_changes(
+            user_id,
+            added=[(task.done, task.created_at) for task in new_tasks],
+            removed=removed,
+            done_change=sum(bool(task.done) for task, _ in updates) - was_done,
+        )
+        stamp_tasks_changed(user_id)
+        created = [task_schema.dump(task) for task in new_tasks]
+        updated = {task.id: task_schema.dump(task) for task, _ in updates}
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    tasks_changed(user_id)
+    return created, updated
@@ -0,0 +1,131 @@
+import logging
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger("app.sql")
+
+def add_query_observer(app, fn):
+    """Call ``fn(statement, parameters, seconds)`` after every statement on the app's engines.
+
+    /metrics, the request profiler and the per-request stats below all
+    observe through here instead of each timing statements themselves.
+    Observers belong to the app, so an app with them disabled runs none.
+    """
+    observers = app.extensions.setdefault("sql_observers", [])
+    if fn not in observers:
+        observers.append(fn)
+
+
+def observe_engines(app, engines):
+    """Time the statements of ``engines`` for the app's observers (after they are added)."""
+    observers = app.extensions.get("sql_observers")
+    if not observers:
+        return
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        seconds = time.perf_counter() - starts.pop() if starts else 0.0
+        for fn in observers:
+            fn(statement, parameters, seconds)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def parameter_shape(parameters):
+    """Types (never values) of a statement's parameters, safe to log."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"  # executemany
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class RequestQueries:
+    """Statements run on behalf of one request."""
+
+    __slots__ = ("count", "seconds", "selects")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.selects = Counter()
+
+    def repeated(self, threshold):
+        """``(statement, times)`` for SELECTs run at least ``threshold`` times."""
+        return [(s, n) for s, n in self.selects.most_common() if n >= threshold]
+
+
+class SQLInstrumentation:
+    """Per-request SQL statement counts and time, slow-query log and N+1 hints.
+
+    Statements slower than ``SQL_SLOW_QUERY_MS`` are logged with their
+    parameter shape. A request that runs the same SELECT
+    ``SQL_N_PLUS_ONE_THRESHOLD`` times or more is logged as an N+1 suspect
+    (SQLAlchemy statements are parameterised, so a lazy load per row shows up
+    as one repeated text). Repeated writes are not flagged: on SQLite an
+    ordered ``INSERT ... RETURNING`` of many rows is one statement per row.
+    With ``SQL_DEBUG_HEADERS`` the totals are sent back as ``X-SQL-Count``,
+    ``X-SQL-Time-Ms`` and ``X-SQL-Max-Repeat``.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["sql_instrumentation"] = self
+        if not app.config.get("SQL_INSTRUMENTATION_ENABLED", True):
+            return
+        self.slow_seconds = app.config["SQL_SLOW_QUERY_MS"] / 1000
+        self.n_plus_one_threshold = app.config["SQL_N_PLUS_ONE_THRESHOLD"]
+        self.debug_headers = app.config["SQL_DEBUG_HEADERS"]
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        add_query_observer(app, self._observe)
+
+    def _before_request(self):
+        g._sql_queries = RequestQueries()
+
+    def _observe(self, statement, parameters, seconds):
+        queries = g.get("_sql_queries") if has_request_context() else None
+        if queries is not None:
+            queries.count += 1
+            queries.seconds += seconds
+            if statement.lstrip()[:6].upper() == "SELECT":
+                queries.selects[statement] += 1
+        if seconds >= self.slow_seconds:
+            logger.warning(
+                "Slow query (%.1f ms) on %s: %s params=%s",
+                seconds * 1000, _endpoint() if has_request_context() else "-",
+                " ".join(statement.split()), parameter_shape(parameters),
+            )
+
+    def _after_request(self, response):
+        queries = g.pop("_sql_queries", None)
+        if queries is None:
+            return response
+        repeated = queries.repeated(self.n_plus_one_threshold)
+        for statement, times in repeated:
+            logger.warning("Possible N+1 on %s %s: %s x %s",
+                           request.method, _endpoint(), times, " ".join(statement.split()))
+        if self.debug_headers:
+            response.headers["X-SQL-Count"] = str(queries.count)
+            response.headers["X-SQL-Time-Ms"] = f"{queries.seconds * 1000:.3f}"
+            response.headers["X-SQL-Max-Repeat"] = str(max(queries.selects.values(), default=0))
+        return response
+
+
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
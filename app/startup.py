@@ -0,0 +1,58 @@
+"""Process start-up helpers: fork safety for preloaded apps and heap freezing.
+
+With ``gunicorn --preload`` the app is built once in the master and the
+workers are forked from it. Connections, threads and process pools do not
+survive a fork in a usable state, so every app registered here resets them
+in the child before it serves a request. The password hasher's pool
+workers are started with "spawn" (a fresh interpreter, no fork handlers),
+so the reset never runs in them.
+"""
+import gc
+import os
+import weakref
+
+_apps = weakref.WeakSet()
+_registered = False
+
+
+def init_fork_safety(app):
+    global _registered
+    _apps.add(app)
+    if not _registered and hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+        _registered = True
+
+
+def _after_fork_in_child():
+    for app in list(_apps):
+        reset_after_fork(app)
+
+
+def reset_after_fork(app):
+    from app.extensions import db, hasher, limiter, metrics, writer
+    from app.logging_setup import restart_log_listener
+
+    # Pooled connections are the parent's sockets/file handles: drop them without
+    # closing (close=False), so the parent's connections stay intact
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines + app.extensions.get("read_engines", []):
+        engine.dispose(close=False)
+
+    hasher.after_fork()
+    writer.after_fork()
+    metrics.after_fork()
+    strategy = getattr(limiter, "_limiter", None)
+    if hasattr(strategy, "after_fork"):
+        strategy.after_fork()
+    restart_log_listener(app)
+
+
+def freeze_heap():
+    """Move everything allocated so far out of the collector's reach.
+
+    Collections in a forked worker then never touch (and copy) the pages
+    holding the preloaded modules and app objects.
+    """
+    gc.collect()
+    gc.freeze()
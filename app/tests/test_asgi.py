@@ -0,0 +1,124 @@
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("a2wsgi")
+
+from starlette.testclient import TestClient
+
+from app.asgi import async_database_url, create_asgi_app
+from app.config import TestingConfig
+from app.extensions import db
+
+
+@pytest.fixture
+def asgi_client(tmp_path):
+    class AsgiConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'tasks.db'}"  # shared by both engines
+
+    app = create_asgi_app(AsgiConfig)
+    with app.state.flask_app.app_context():
+        db.create_all()
+    with TestClient(app) as client:
+        yield client
+
+
+def login(client, username="tester"):
+    client.post("/auth/register", json={"username": username, "password": "testpass"})
+    response = client.post("/auth/login", json={"username": username, "password": "testpass"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_async_database_url():
+    assert str(async_database_url("sqlite:///tasks.db")) == "sqlite+aiosqlite:///tasks.db"
+    assert async_database_url("postgresql://u@h/db").drivername == "postgresql+asyncpg"
+
+
+def test_task_crud_matches_the_wsgi_contract(asgi_client):
+    headers = login(asgi_client)
+    assert asgi_client.get("/auth/me", headers=headers).json()["username"] == "tester"
+    assert asgi_client.get("/tasks/").status_code == 401
+
+    created = asgi_client.post("/tasks/", json={"title": "Write docs"}, headers=headers)
+    assert created.status_code == 201
+    task_id = created.json()["id"]
+    asgi_client.post("/tasks/", json={"title": "Ship it"}, headers=headers)
+    assert asgi_client.post("/tasks/", json={}, headers=headers).status_code == 422
+
+    listed = asgi_client.get("/tasks/?per_page=1", headers=headers)
+    assert listed.status_code == 200
+    body = listed.json()
+    assert (body["total"], body["pages"], body["page"]) == (2, 2, 1)
+    assert body["tasks"][0]["title"] == "Write docs"
+
+    keyset = asgi_client.get("/tasks/?cursor=&per_page=1&with_total=1", headers=headers).json()
+    assert keyset["total"] == 2 and keyset["next_cursor"]
+
+    etag = listed.headers["ETag"]
+    assert asgi_client.get("/tasks/?per_page=1", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    updated = asgi_client.patch(f"/tasks/{task_id}", json={"done": True}, headers=headers)
+    assert updated.status_code == 200 and updated.json()["done"] is True
+    assert asgi_client.get("/tasks/?per_page=1", headers={**headers, "If-None-Match": etag}).status_code == 200
+    assert asgi_client.get("/tasks/?done=true", headers=headers).json()["total"] == 1
+    assert asgi_client.get(f"/tasks/{task_id}", headers=headers).json()["done"] is True
+    assert asgi_client.get("/tasks/999", headers=headers).status_code == 404
+    assert asgi_client.delete(f"/tasks/{task_id}", headers=headers).status_code == 403
+
+
+def test_other_routes_fall_through_to_flask(asgi_client):
+    headers = login(asgi_client)
+    asgi_client.post("/tasks/", json={"title": "Buy milk"}, headers=headers)
+
+    stats = asgi_client.get("/tasks/stats", headers=headers)
+    assert stats.status_code == 200 and stats.json()["total"] == 1
+    assert asgi_client.post("/auth/login", json={"username": "tester", "password": "nope"}).status_code == 401
+
+
+def test_login_checks_for_rehash_off_the_event_loop(asgi_client, monkeypatch):
+    import asyncio
+    from app.extensions import hasher
+
+    on_loop = []
+    needs_rehash = hasher.needs_rehash
+
+    def spy(pwhash):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return needs_rehash(pwhash)
+
+    monkeypatch.setattr(hasher, "needs_rehash", spy)
+    login(asgi_client)
+    assert on_loop == [False]
+
+
+def test_token_checks_match_the_wsgi_path(asgi_client, monkeypatch):
+    from app.extensions import jwt
+
+    headers = login(asgi_client)
+    assert asgi_client.get("/tasks/", headers=headers).status_code == 200  # token now cached
+
+    monkeypatch.setattr(jwt, "_token_in_blocklist_callback", lambda header, claims: True)
+    res = asgi_client.get("/tasks/", headers=headers)
+    assert res.status_code == 401 and res.json() == {"msg": "Token has been revoked"}
+    assert asgi_client.get("/tasks/stats", headers=headers).status_code == 401  # same as Flask
+
+
+def test_rate_limits_are_per_endpoint_like_flask_limiter(tmp_path):
+    class LimitedConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'tasks.db'}"
+        RATELIMIT_ENABLED = True
+        RATELIMIT_STORAGE_URI = f"sqlite:///{tmp_path / 'limits.db'}"
+        RATELIMIT_TASKS = "2 per minute"
+
+    app = create_asgi_app(LimitedConfig)
+    with app.state.flask_app.app_context():
+        db.create_all()
+    with TestClient(app) as client:
+        headers = login(client)
+        assert [client.get("/tasks/", headers=headers).status_code for _ in range(3)] == [200, 200, 429]
+        assert client.post("/tasks/", json={"title": "t"}, headers=headers).status_code == 201  # own bucket
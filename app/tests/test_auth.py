@@ -17,3 +17,107 @@ def test_register_and_login(client):
     assert res.status_code == 200
     data = res.get_json()
     assert "access_token" in data
+
+
+def test_login_rehashes_outdated_password(app, client):
+    from app.extensions import db, hasher
+    from app.models import User
+
+    client.post("/auth/register", json={"username": "old", "password": "pw"})
+    old_hash = User.query.filter_by(username="old").first().password_hash
+
+    app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"
+    hasher.init_app(app)
+
+    res = client.post("/auth/login", json={"username": "old", "password": "pw"})
+    assert res.status_code == 200
+    db.session.expire_all()
+    new_hash = User.query.filter_by(username="old").first().password_hash
+    assert new_hash != old_hash
+    assert new_hash.startswith("pbkdf2:sha256:2000$")
+
+
+def test_hashing_in_process_pool(app):
+    from app.extensions import hasher
+
+    app.config["PASSWORD_HASH_WORKERS"] = 1
+    hasher.init_app(app)
+    try:
+        pwhash = hasher.hash("secret")
+        assert hasher.verify(pwhash, "secret")
+        assert not hasher.verify(pwhash, "wrong")
+        assert hasher._executor._mp_context.get_start_method() == "spawn"
+    finally:
+        hasher.shutdown()
+
+
+def test_hashing_overload_returns_503(app, client):
+    from app.extensions import hasher
+
+    app.config["PASSWORD_HASH_MAX_PENDING"] = 0
+    app.config["PASSWORD_HASH_QUEUE_TIMEOUT"] = 0
+    hasher.init_app(app)
+
+    res = client.post("/auth/register", json={"username": "x", "password": "pw"})
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == "1"
+
+
+def test_me_is_served_from_token_claims(client, auth_headers, monkeypatch):
+    from app.models import User
+
+    def no_db(*args, **kwargs):
+        raise AssertionError("/auth/me should not query users")
+    monkeypatch.setattr(User, "query", property(no_db))
+
+    res = client.get("/auth/me", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.get_json() == {"id": 1, "username": "tester", "role": "user"}
+
+
+def test_token_is_verified_once_per_request_and_cached(app, client, monkeypatch):
+    from app.auth import context
+    from app.extensions import db
+    from app.models import User
+
+    client.post("/auth/register", json={"username": "boss", "password": "pw"})
+    User.query.filter_by(username="boss").first().role = "admin"
+    db.session.commit()
+    token = client.post("/auth/login", json={"username": "boss", "password": "pw"}).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    task_id = client.post("/tasks/", json={"title": "t"}, headers=headers).get_json()["id"]
+
+    calls = []
+    real_decode = context.decode_token
+    monkeypatch.setattr(context, "decode_token", lambda t: calls.append(t) or real_decode(t))
+    app.extensions["jwt_verify_cache"].clear()
+
+    # auth_required + role_required on the same request: one verification
+    assert client.delete(f"/tasks/{task_id}", headers=headers).status_code == 200
+    assert len(calls) == 1
+
+    # Hot token: served from the verified-token LRU
+    client.get("/tasks/", headers=headers)
+    assert len(calls) == 1
+
+    assert client.get("/tasks/", headers={"Authorization": "Bearer nope"}).status_code == 422
+
+
+def test_auth_context_sets_the_same_request_state_as_flask_jwt_extended(app, auth_headers):
+    # load_auth_context fills flask_jwt_extended's private request state by hand;
+    # this fails if an upgrade renames or adds any of it
+    from flask import g
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    from app.auth.context import load_auth_context
+
+    def jwt_state():
+        return {k: v for k, v in vars(g).items() if k.startswith("_jwt_extended")}
+
+    with app.test_request_context(headers=auth_headers):
+        verify_jwt_in_request()
+        expected = jwt_state()
+    for _ in range(2):  # token verified, then served from the verified-token cache
+        with app.test_request_context(headers=auth_headers):
+            load_auth_context()
+            assert jwt_state() == expected
+            assert get_jwt_identity() == expected["_jwt_extended_jwt"]["sub"]
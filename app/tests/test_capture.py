@@ -0,0 +1,95 @@
+import base64
+import io
+import json
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+
+
+def _app(tmp_path, sample_rate=1.0):
+    class CaptureConfig(TestingConfig):
+        CAPTURE_ENABLED = True
+        CAPTURE_FILE = str(tmp_path / "capture.jsonl")
+        CAPTURE_SAMPLE_RATE = sample_rate
+
+    app = create_app(CaptureConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _records(tmp_path):
+    path = tmp_path / "capture.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_capture_records_requests_with_secrets_redacted(tmp_path):
+    client = _app(tmp_path).test_client()
+    # buffered: the test client then closes the response, as a WSGI server would
+    client.post("/auth/register", json={"username": "cap", "password": "s3cret"}, buffered=True)
+    token = client.post("/auth/login", json={"username": "cap", "password": "s3cret"},
+                        buffered=True).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    res = client.post("/tasks/", json={"title": "captured"}, headers=headers, buffered=True)
+    assert res.status_code == 201  # the app still saw the body
+    client.get("/tasks/?page=2", headers=headers, buffered=True)
+
+    raw = (tmp_path / "capture.jsonl").read_text()
+    assert "s3cret" not in raw and token not in raw
+
+    register, login, create, listing = _records(tmp_path)
+    assert login["body"] == {"username": "cap", "password": "***"}
+    assert create["method"] == "POST" and create["body"] == {"title": "captured"}
+    assert create["status"] == 201 and create["duration_ms"] >= 0
+    assert listing["path"] == "/tasks/" and listing["query"] == "page=2"
+    assert create["user"] == listing["user"] and len(create["user"]) == 16
+    assert register["user"] is None
+
+
+def test_capture_disabled_or_unsampled_writes_nothing(tmp_path):
+    app = create_app(TestingConfig)
+    assert "CaptureMiddleware" not in type(app.wsgi_app).__name__
+
+    client = _app(tmp_path, sample_rate=0.0).test_client()
+    client.get("/", buffered=True)
+    assert _records(tmp_path) == []
+
+
+def test_user_ref_rejects_tokens_without_an_object_payload():
+    from app.capture import user_ref
+
+    def token(payload):
+        return "Bearer h." + base64.urlsafe_b64encode(payload).decode().rstrip("=") + ".s"
+
+    assert user_ref(token(b"[1, 2]"), b"k") == "invalid"
+    assert user_ref(token(b"7"), b"k") == "invalid"
+    assert len(user_ref(token(b'{"sub": "1"}'), b"k")) == 16
+
+
+def test_user_ref_is_keyed():
+    import hashlib
+    from app.capture import user_ref
+
+    header = "Bearer h." + base64.urlsafe_b64encode(b'{"sub": "1"}').decode().rstrip("=") + ".s"
+    assert user_ref(header, b"a") != user_ref(header, b"b")
+    assert user_ref(header, b"a") != hashlib.sha256(b"1").hexdigest()[:16]
+
+
+def test_omitted_bodies_are_not_read(tmp_path):
+    from app.capture import CaptureMiddleware
+
+    class Stream(io.BytesIO):
+        reads = 0
+
+        def read(self, *args):
+            Stream.reads += 1
+            return super().read(*args)
+
+    middleware = CaptureMiddleware(None, str(tmp_path / "capture.jsonl"), b"k", max_body=4)
+    for length, content_type in [(10, "application/json"), (3, "text/plain")]:
+        environ = {"CONTENT_LENGTH": str(length), "CONTENT_TYPE": content_type, "wsgi.input": Stream(b"x" * length)}
+        assert middleware._read_body(environ) == {"_omitted": length}
+    assert Stream.reads == 0
@@ -0,0 +1,30 @@
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.db_profile import resolve_profile
+from app.extensions import db
+
+
+def test_auto_profile_resolution():
+    assert resolve_profile("auto", "sqlite:///:memory:") == "default"
+    assert resolve_profile("auto", "sqlite:////tmp/tasks.db") == "sqlite"
+    assert resolve_profile("auto", "postgresql://u:p@db/tasks") == "server"
+    assert resolve_profile("default", "sqlite:////tmp/tasks.db") == "default"
+    with pytest.raises(ValueError):
+        resolve_profile("turbo", "sqlite://")
+
+
+def test_sqlite_profile_applies_pragmas(tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'tasks.db'}"
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        assert app.config["SQLALCHEMY_ENGINE_OPTIONS"]["pool_size"] == 10
+        with db.engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("busy_timeout") == 5000
+            assert pragma("synchronous") == 1  # NORMAL
+        db.engine.dispose()
@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import Future
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Task, User
+from app.services.task_service import _stage_create
+
+
+def test_concurrent_creates_are_group_committed(tmp_path):
+    class GroupConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'group.db'}"
+        GROUP_COMMIT_ENABLED = True
+        GROUP_COMMIT_MAX_WAIT_MS = 20
+
+    app = create_app(GroupConfig)
+    writer = app.extensions["group_commit"]
+    batch_sizes = []
+    commit_batch = writer._commit_batch
+    writer._commit_batch = lambda batch: batch_sizes.append(len(batch)) or commit_batch(batch)
+
+    client = app.test_client()
+    client.post("/auth/register", json={"username": "g", "password": "pw"})
+    token = client.post("/auth/login", json={"username": "g", "password": "pw"}).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    statuses, start = [], threading.Barrier(8)
+
+    def create(n):
+        own = app.test_client()
+        start.wait()
+        for i in range(5):
+            statuses.append(own.post("/tasks/", json={"title": f"{n}-{i}"}, headers=headers).status_code)
+
+    threads = [threading.Thread(target=create, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.shutdown()
+
+    assert statuses == [201] * 40
+    assert sum(batch_sizes) == 40 and max(batch_sizes) > 1
+    assert client.get("/tasks/stats", headers=headers).get_json()["total"] == 40
+    with app.app_context():
+        assert db.session.execute(db.text("PRAGMA synchronous")).scalar() == 2  # FULL
+
+
+def test_failed_batch_falls_back_to_individual_commits(app):
+    user = User(username="u", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+
+    def broken_stage():
+        db.session.add(Task(title="half-written", user_id=user.id))
+        raise ValueError("bad write")
+
+    futures = [Future(), Future(), Future()]
+    app.extensions["group_commit"]._commit_batch([
+        (_stage_create, (user.id, {"title": "a"}), futures[0]),
+        (broken_stage, (), futures[1]),
+        (_stage_create, (user.id, {"title": "b"}), futures[2]),
+    ])
+
+    assert futures[0].result()["title"] == "a"
+    assert isinstance(futures[1].exception(), ValueError)
+    assert futures[2].result()["title"] == "b"
+    assert sorted(t.title for t in Task.query.all()) == ["a", "b"]
+
+
+def test_failed_cache_invalidation_still_resolves_every_write(app, monkeypatch):
+    from app.services import task_service
+
+    user = User(username="u", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+
+    def broken_invalidation(user_id):
+        raise ConnectionError("cache down")
+
+    monkeypatch.setattr(task_service, "tasks_changed", broken_invalidation)
+    writer = app.extensions["group_commit"]
+    futures = [Future(), Future()]
+    writer._commit_batch([(_stage_create, (user.id, {"title": t}), f) for t, f in zip("ab", futures)])
+    assert [f.result()["title"] for f in futures] == ["a", "b"]
+    assert writer._commit_one(_stage_create, (user.id, {"title": "c"}))["title"] == "c"
+    assert Task.query.count() == 3
+
+
+def test_dead_writer_thread_is_restarted(app):
+    writer = app.extensions["group_commit"]
+    writer._thread = threading.Thread(target=lambda: None)
+    writer._thread.start()
+    writer._thread.join()
+
+    writer._ensure_started()
+    try:
+        assert writer._thread.is_alive()
+    finally:
+        writer.shutdown()
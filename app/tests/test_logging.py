@@ -0,0 +1,51 @@
+import json
+import logging
+
+from app.logging_setup import JsonFormatter, SamplingFilter
+
+
+def _record(msg, *args, level=logging.INFO, **extra):
+    record = logging.makeLogRecord({"msg": msg, "args": args, "levelno": level,
+                                    "levelname": logging.getLevelName(level)})
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_renders_lazy_args_and_extras():
+    line = JsonFormatter().format(_record("Task %s deleted by user %s", 3, "1", request_id="abc"))
+    entry = json.loads(line)
+    assert entry["message"] == "Task 3 deleted by user 1"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc"
+
+
+def test_sampling_only_applies_to_marked_records():
+    never = SamplingFilter({"INFO": 0.0})
+    assert not never.filter(_record("Tasks listed", sample=True))
+    assert never.filter(_record("Task created"))
+    assert never.filter(_record("Tasks listed", level=logging.WARNING, sample=True))
+    assert SamplingFilter({"INFO": 1.0}).filter(_record("Tasks listed", sample=True))
+
+
+def test_each_app_applies_its_own_log_config(tmp_path):
+    from flask.logging import default_handler
+    from app import create_app
+    from app.config import ProductionConfig, TestingConfig
+
+    class DevConfig(TestingConfig):
+        LOG_DIR = str(tmp_path / "dev")
+
+    class ProdConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+        LOG_DIR = str(tmp_path / "prod")
+        GC_FREEZE = False
+
+    prod = create_app(ProdConfig)
+    assert default_handler not in prod.logger.handlers
+    dev = create_app(DevConfig)
+    assert default_handler in dev.logger.handlers  # console logs in development
+
+    dev.logger.warning("from dev")
+    dev.extensions["log_listener"].stop()
+    assert "from dev" in (tmp_path / "dev" / "app.log").read_text()
+    assert "from dev" not in (tmp_path / "prod" / "app.log").read_text()
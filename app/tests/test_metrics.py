@@ -0,0 +1,56 @@
+def test_metrics_endpoint_reports_requests_and_queries(client, auth_headers):
+    client.post("/tasks/", json={"title": "t"}, headers=auth_headers)
+    client.get("/tasks/", headers=auth_headers)
+    client.get("/tasks/999", headers=auth_headers)
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.mimetype == "text/plain"
+    body = res.get_data(as_text=True)
+
+    assert 'http_requests_total{method="GET",endpoint="/tasks/<int:task_id>",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",endpoint="/tasks/",le="+Inf"}' in body
+    assert 'db_queries_total{endpoint="/tasks/"}' in body
+    assert "http_requests_in_flight 1" in body  # the scrape itself
+    assert 'task_cache_requests_total{result="miss"}' in body
+
+
+def test_metrics_shards_are_summed_across_threads():
+    import threading
+    from app.metrics import Metrics
+
+    metrics = Metrics()
+    threads = [
+        threading.Thread(target=metrics.observe_request, args=("GET", "/x", 200, 0.02))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snap = metrics.snapshot()
+    assert snap["status"][("GET", "/x", 200)] == 4
+    assert sum(snap["latency"][("GET", "/x")][:-1]) == 4
+
+
+def test_in_flight_ignores_contexts_that_skipped_before_request(app, client):
+    with app.test_request_context("/tasks/"):
+        pass
+    assert "http_requests_in_flight 1" in client.get("/metrics").get_data(as_text=True)
+
+
+def test_finished_threads_shards_are_folded_into_retired():
+    import gc
+    import threading
+    from app.metrics import Metrics
+
+    metrics = Metrics()
+    for _ in range(5):
+        t = threading.Thread(target=metrics.observe_request, args=("GET", "/x", 200, 0.02))
+        t.start()
+        t.join()
+    gc.collect()
+
+    assert metrics._shards == []
+    assert metrics.snapshot()["status"][("GET", "/x", 200)] == 5
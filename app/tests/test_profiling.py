@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, profiler
+from app.profiling import profile_token
+
+
+def test_disabled_profiler_adds_no_hooks(app):
+    hooks = app.before_request_funcs.get(None, []) + app.after_request_funcs.get(None, [])
+    assert profiler._before_request not in hooks
+    assert profiler._after_request not in hooks
+
+
+@pytest.mark.parametrize("mode", ["sampling", "cprofile"])
+def test_signed_header_writes_profile(tmp_path, mode):
+    class ProfilingConfig(TestingConfig):
+        PROFILING_ENABLED = True
+        PROFILING_MODE = mode
+        PROFILING_DIR = str(tmp_path / "profiles")
+
+    app = create_app(ProfilingConfig)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post("/auth/register", json={"username": "tester", "password": "testpass"})
+    token = client.post("/auth/login", json={"username": "tester", "password": "testpass"}).get_json()["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+
+    assert "X-Profile-Id" not in client.get("/tasks/", headers=auth).headers
+    assert "X-Profile-Id" not in client.get("/tasks/", headers={**auth, "X-Profile": "forged.token"}).headers
+    assert not list((tmp_path / "profiles").iterdir())
+
+    response = client.get("/tasks/", headers={**auth, "X-Profile": profile_token(app), "X-Request-ID": "../abc 1"})
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Id"] == "..abc1"
+
+    meta_file, = (tmp_path / "profiles").glob("*.json")
+    meta = json.loads(meta_file.read_text())
+    assert meta["endpoint"] == "/tasks/" and meta["status"] == 200 and meta["mode"] == mode
+    assert meta["sql_count"] > 0 and meta["sql_ms"] >= 0
+
+    folded = meta_file.with_suffix(".folded").read_text().splitlines()
+    for line in folded:
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+    if mode == "cprofile":
+        assert any("list_tasks" in line for line in folded)
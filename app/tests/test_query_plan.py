@@ -0,0 +1,21 @@
+from app.query_plan import check_query_plans, explain, hot_queries
+from app.extensions import db
+
+
+def test_hot_queries_use_indexes(app):
+    assert check_query_plans() == {}
+
+
+def test_check_detects_full_scan(app):
+    db.session.execute(db.text("DROP INDEX ix_tasks_user_id_id"))
+    db.session.execute(db.text("DROP INDEX ix_tasks_user_id_done_id"))
+    db.session.commit()
+
+    problems = check_query_plans()
+    assert "list_tasks" in problems
+    assert any(line.startswith("SCAN") for line in problems["list_tasks"])
+
+
+def test_explain_reports_index_search(app):
+    plan = explain(hot_queries()["list_tasks_done"], db.engine)
+    assert any("ix_tasks_user_id_done_id" in line for line in plan)
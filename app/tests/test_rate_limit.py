@@ -0,0 +1,97 @@
+from limits import parse
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.rate_limit import LocalBudgetRateLimiter, SQLiteStorage
+
+
+def test_sqlite_storage_is_shared_between_instances(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'limits.db'}"
+    a, b = SQLiteStorage(uri), SQLiteStorage(uri)  # e.g. two worker processes
+
+    assert a.incr("k", 60) == 1
+    assert b.incr("k", 60, amount=2) == 3
+    assert a.get("k") == 3 and a.get_expiry("k") > 0
+    assert a.incr("short", -1) == 1  # already expired window
+    assert a.incr("short", 60) == 1  # starts over
+    b.clear("k")
+    assert a.get("k") == 0
+
+
+def test_local_budget_skips_storage_until_near_the_limit(tmp_path):
+    storage = SQLiteStorage(f"sqlite:///{tmp_path / 'limits.db'}")
+    increments = []
+    incr = storage.incr
+    storage.incr = lambda key, expiry, amount=1: increments.append(amount) or incr(key, expiry, amount)
+
+    limiter = LocalBudgetRateLimiter(storage)
+    item = parse("100/minute")
+    allowed = [limiter.hit(item, "user:1") for _ in range(120)]
+
+    assert allowed == [True] * 100 + [False] * 20  # still exact
+    assert increments[:3] == [1, 10, 10]
+    assert len(increments) < 80
+    assert limiter.hit(item, "user:2")  # keys are independent
+
+
+def test_lease_refund_stays_in_its_window(tmp_path):
+    storage = SQLiteStorage(f"sqlite:///{tmp_path / 'limits.db'}")
+    limiter = LocalBudgetRateLimiter(storage)
+    item = parse("100/minute")
+    key = item.key_for("user:1")
+
+    assert limiter.hit(item, "user:1")
+    storage.incr(key, 60, amount=55)  # other workers, so the next lease is over half
+    amounts = []
+    incr = storage.incr
+
+    def incr_then_window_ends(k, expiry, amount=1):
+        amounts.append(amount)
+        count = incr(k, expiry, amount)
+        storage.clear(k)  # the window ends before any refund
+        return count
+
+    storage.incr = incr_then_window_ends
+    assert limiter.hit(item, "user:1")
+    assert amounts == [10]  # leased, nothing handed back into the next window
+
+    assert storage.incr(key, 60, amount=-5) == 0  # and storage never goes negative
+
+
+def test_limits_are_per_user_and_configured_per_route(tmp_path):
+    class LimitedConfig(TestingConfig):
+        RATELIMIT_ENABLED = True
+        RATELIMIT_STORAGE_URI = f"sqlite:///{tmp_path / 'limits.db'}"
+        RATELIMIT_LOGIN = "3 per minute"
+        RATELIMIT_TASKS = "2 per minute"
+
+    app = create_app(LimitedConfig)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    def login(username):
+        client.post("/auth/register", json={"username": username, "password": "pw"})
+        res = client.post("/auth/login", json={"username": username, "password": "pw"})
+        return {"Authorization": f"Bearer {res.get_json()['access_token']}"}
+
+    alice, bob = login("alice"), login("bob")
+    assert [client.get("/tasks/", headers=alice).status_code for _ in range(3)] == [200, 200, 429]
+    assert client.get("/tasks/", headers=bob).status_code == 200  # same IP, own quota
+
+    client.post("/auth/login", json={"username": "alice", "password": "pw"})
+    res = client.post("/auth/login", json={"username": "alice", "password": "pw"})
+    assert res.status_code == 429
+    assert res.get_json()["error"] == "Too many requests"
+
+
+def test_local_budget_is_exact_across_workers(tmp_path):
+    # Ten worker processes sharing one storage, each client hit landing on the next worker
+    uri = f"sqlite:///{tmp_path / 'limits.db'}"
+    workers = [LocalBudgetRateLimiter(SQLiteStorage(uri)) for _ in range(10)]
+    item = parse("100/minute")
+    allowed = [workers[i % 10].hit(item, "user:1") for i in range(200)]
+
+    assert sum(allowed) == 100
+    assert all(allowed[:90])  # leases are capped, so 429s only start near the limit
@@ -0,0 +1,61 @@
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+
+
+def _app(tmp_path, reader_url):
+    class ReplicaConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        READ_DATABASE_URLS = [reader_url]
+
+    return create_app(ReplicaConfig)
+
+
+@pytest.fixture
+def login():
+    def login(client):
+        client.post("/auth/register", json={"username": "r", "password": "pw"})
+        res = client.post("/auth/login", json={"username": "r", "password": "pw"})
+        return {"Authorization": f"Bearer {res.get_json()['access_token']}"}
+    return login
+
+
+def test_reads_go_to_replica_outside_read_your_writes_window(tmp_path, login):
+    # A "replica" that never receives the writes makes the routing visible
+    app = _app(tmp_path, f"sqlite:///{tmp_path / 'replica.db'}")
+    with app.app_context():
+        replica = app.extensions["read_engines"][0]
+        db.metadata.create_all(bind=replica)
+        client = app.test_client()
+        headers = login(client)
+
+        task = client.post("/tasks/", json={"title": "mine"}, headers=headers).get_json()
+        assert client.get("/tasks/", headers=headers).get_json()["total"] == 1
+        assert client.get(f"/tasks/{task['id']}", headers=headers).status_code == 200
+
+        app.config["READ_YOUR_WRITES_SECONDS"] = 0
+        assert client.get("/tasks/", headers=headers).get_json()["total"] == 0
+        assert client.get(f"/tasks/{task['id']}", headers=headers).status_code == 404
+
+        # Writes still land on the primary
+        client.patch(f"/tasks/{task['id']}", json={"done": True}, headers=headers)
+        with db.engines[None].connect() as conn:
+            assert conn.exec_driver_sql("SELECT done FROM tasks").scalar() == 1
+        for engine in [db.engine] + app.extensions["read_engines"]:
+            engine.dispose()
+
+
+def test_read_only_sqlite_uri_reader(tmp_path, login):
+    app = _app(tmp_path, f"sqlite:///file:{tmp_path / 'primary.db'}?mode=ro&uri=true")
+    app.config["READ_YOUR_WRITES_SECONDS"] = 0
+    with app.app_context():
+        client = app.test_client()
+        headers = login(client)
+        client.post("/tasks/", json={"title": "shared"}, headers=headers)
+
+        tasks = client.get("/tasks/", headers=headers).get_json()["tasks"]
+        assert [t["title"] for t in tasks] == ["shared"]
+        for engine in [db.engine] + app.extensions["read_engines"]:
+            engine.dispose()
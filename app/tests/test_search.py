@@ -0,0 +1,81 @@
+import json
+
+from app.extensions import db
+from app.services import search_service
+
+
+def _login(client, username):
+    client.post("/auth/register", json={"username": username, "password": "pw"})
+    res = client.post("/auth/login", json={"username": username, "password": "pw"})
+    return {"Authorization": f"Bearer {res.get_json()['access_token']}"}
+
+
+def _titles(client, headers, q, **args):
+    res = client.get("/tasks/search", query_string={"q": q, **args}, headers=headers)
+    assert res.status_code == 200
+    return [t["title"] for t in res.get_json()["tasks"]]
+
+
+def test_search_is_ranked_scoped_and_kept_in_sync(client, auth_headers):
+    post = lambda data: client.post("/tasks/", json=data, headers=auth_headers).get_json()
+    post({"title": "Buy milk", "description": "and bread"})
+    bread = post({"title": "Bake bread", "description": "sourdough bread"})
+    post({"title": "Call mom"})
+    client.post("/tasks/", json={"title": "bread for someone else"}, headers=_login(client, "other"))
+
+    assert _titles(client, auth_headers, "bread") == ["Bake bread", "Buy milk"]
+    assert _titles(client, auth_headers, "brea mil") == ["Buy milk"]  # prefix, all terms
+    page = client.get("/tasks/search?q=bread&per_page=1&page=2", headers=auth_headers).get_json()
+    assert page["total"] == 2 and page["pages"] == 2 and len(page["tasks"]) == 1
+
+    client.patch(f"/tasks/{bread['id']}", json={"title": "Bake cake", "description": ""},
+                 headers=auth_headers)
+    assert _titles(client, auth_headers, "cake") == ["Bake cake"]
+    assert _titles(client, auth_headers, "bread") == ["Buy milk"]
+
+    client.post("/tasks/batch", json={"operations": [
+        {"op": "create", "data": {"title": "batch bread"}},
+    ]}, headers=auth_headers)
+    client.post("/tasks/import", data=json.dumps({"title": "imported bread"}),
+                headers=auth_headers, content_type="application/x-ndjson")
+    assert sorted(_titles(client, auth_headers, "bread")) == ["Buy milk", "batch bread", "imported bread"]
+
+    # FTS query syntax in user input is neutralised, not passed through
+    assert _titles(client, auth_headers, '" OR * NEAR(') == []
+    assert client.get("/tasks/search?q=%20*", headers=auth_headers).status_code == 400
+
+
+def test_search_backfill_and_like_fallback(app, client, auth_headers, monkeypatch):
+    client.post("/tasks/", json={"title": "Water plants"}, headers=auth_headers)
+    with app.app_context():
+        db.session.execute(db.text("DELETE FROM tasks_fts"))
+        db.session.commit()
+    assert _titles(client, auth_headers, "plants") == []
+
+    result = app.test_cli_runner().invoke(args=["search-backfill"])
+    assert "Indexed 1 tasks." in result.output
+    assert _titles(client, auth_headers, "plants") == ["Water plants"]
+
+    monkeypatch.setattr(search_service, "fts_enabled", lambda: False)
+    client.post("/tasks/", json={"title": "Repot", "description": "plants"}, headers=auth_headers)
+    assert _titles(client, auth_headers, "PLANT") == ["Water plants", "Repot"]
+
+
+def test_index_created_by_another_process_is_picked_up(app, client, auth_headers):
+    with app.app_context():
+        db.session.execute(db.text("DROP TABLE tasks_fts"))
+        db.session.commit()
+        search_service._fts_engines.pop(db.engine, None)
+        assert not search_service.fts_enabled()
+        db.session.rollback()
+        # what `flask search-backfill` does in its own process
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(search_service.CREATE_FTS_SQL)
+        assert search_service.fts_enabled()
+
+
+def test_terms_do_not_match_the_owner_column(client, auth_headers):
+    client.post("/tasks/", json={"title": "Water plants"}, headers=auth_headers)
+    client.post("/tasks/", json={"title": "u1 checklist"}, headers=auth_headers)
+    assert _titles(client, auth_headers, "u") == ["u1 checklist"]
+    assert _titles(client, auth_headers, "u1") == ["u1 checklist"]
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.json_provider import OrjsonProvider
+from app.models import Task
+from app.schemas.task_schema import tasks_schema, task_rows
+from flask.json.provider import DefaultJSONProvider
+
+
+def test_row_serializer_matches_marshmallow(app):
+    db.session.add_all([
+        Task(title="plain", user_id=1),
+        Task(title="naïve ✓", description="with text", done=True, user_id=1),
+        Task(title="no date", user_id=1, created_at=None),
+    ])
+    db.session.commit()
+
+    rows = Task.query.with_entities(*task_rows.columns).order_by(Task.id).all()
+    tasks = Task.query.order_by(Task.id).all()
+    assert task_rows.dump_many(rows) == tasks_schema.dump(tasks)
+
+
+@pytest.mark.parametrize("payload", [
+    {"tasks": [{"id": 1, "title": "x", "description": None, "done": False}], "total": 1},
+    {"title": "naïve ✓"},
+    {"errors": {1: {"id": ["Not found"]}, 10: {"op": ["Forbidden"]}}},
+    {"when": datetime(2024, 5, 1, 12, 30)},
+    [1, 2.5, "three", None, True],
+])
+def test_orjson_provider_is_byte_compatible(app, payload):
+    fast, default = OrjsonProvider(app), DefaultJSONProvider(app)
+    assert fast.response(payload).get_data() == default.response(payload).get_data()
+
+    app.debug = True
+    try:
+        assert fast.response(payload).get_data() == default.response(payload).get_data()
+    finally:
+        app.debug = False
+
+
+def test_orjson_provider_floats_parse_to_the_same_values(app):
+    import json
+    import math
+
+    payload = [0.1, 2.5, 1e-7, 1e16, 1e22, -0.0, float("nan"), float("inf")]
+    fast = json.loads(OrjsonProvider(app).response(payload).get_data())
+    default = json.loads(DefaultJSONProvider(app).response(payload).get_data())
+
+    assert fast[:6] == default[:6]  # spelled differently, e.g. 1e-7 vs 1e-07
+    assert math.isnan(default[6]) and math.isinf(default[7])
+    assert fast[6:] == [None, None]  # orjson writes standard JSON
+
+
+def test_orjson_provider_is_opt_in(app):
+    assert app.config["JSON_PROVIDER"] == "default"
+    assert type(app.json) is DefaultJSONProvider
@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Task
+from app.sql_instrumentation import add_query_observer, parameter_shape
+
+
+@pytest.fixture
+def debug_client():
+    class DebugConfig(TestingConfig):
+        SQL_DEBUG_HEADERS = True
+        SQL_SLOW_QUERY_MS = 0  # log every statement as slow
+
+    app = create_app(DebugConfig)
+
+    @app.route("/n-plus-one/<int:n>")
+    def n_plus_one(n):
+        for task_id in range(1, n + 1):
+            Task.query.filter_by(id=task_id).first()
+        return {"ok": True}
+
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def _auth(client):
+    client.post("/auth/register", json={"username": "tester", "password": "testpass"})
+    token = client.post("/auth/login", json={"username": "tester", "password": "testpass"}).get_json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape({"id": 1, "title": "secret"}) == {"id": "int", "title": "str"}
+    assert parameter_shape((1, "secret")) == ["int", "str"]
+    assert parameter_shape([(1, "a"), (2, "b")]) == "2 x ['int', 'str']"
+
+
+def test_debug_headers_and_slow_query_log(debug_client, caplog):
+    headers = _auth(debug_client)
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        res = debug_client.get("/tasks/", headers=headers)
+
+    assert res.status_code == 200
+    assert int(res.headers["X-SQL-Count"]) == 3  # version stamp, page, counters
+    assert float(res.headers["X-SQL-Time-Ms"]) >= 0
+    assert res.headers["X-SQL-Max-Repeat"] == "1"
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow query")]
+    assert sum("on /tasks/:" in message for message in slow) == 3
+    assert "tester" not in "".join(slow)  # parameter types only, never values
+
+
+def test_repeated_statement_is_flagged_as_n_plus_one(debug_client, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        res = debug_client.get("/n-plus-one/6")
+    assert res.headers["X-SQL-Max-Repeat"] == "6"
+    flagged = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Possible N+1")]
+    assert len(flagged) == 1 and "/n-plus-one/<int:n>: 6 x SELECT" in flagged[0]
+
+
+def test_batch_serializes_without_reloading_each_task(debug_client):
+    headers = _auth(debug_client)
+    for i in range(6):
+        debug_client.post("/tasks/", json={"title": f"t{i}"}, headers=headers)
+
+    res = debug_client.post("/tasks/batch", headers=headers, json={"operations": [
+        {"op": "update", "id": task_id, "data": {"done": True}} for task_id in range(1, 7)
+    ] + [{"op": "create", "data": {"title": "new"}} for _ in range(6)]})
+
+    assert res.status_code == 200
+    assert all(r["task"]["done"] for r in res.get_json()["results"][:6])
+    assert int(res.headers["X-SQL-Max-Repeat"]) == 1
+
+
+def test_observers_belong_to_their_app():
+    class QuietConfig(TestingConfig):
+        SQL_INSTRUMENTATION_ENABLED = False
+        METRICS_ENABLED = False
+        PROFILING_ENABLED = False
+
+    observed, quiet = create_app(TestingConfig), create_app(QuietConfig)
+    statements = []
+    add_query_observer(observed, lambda statement, parameters, seconds: statements.append(statement))
+    assert "sql_observers" not in quiet.extensions
+
+    with quiet.app_context():
+        db.session.execute(db.text("SELECT 1"))
+    assert statements == []
+
+    with observed.app_context():
+        db.session.execute(db.text("SELECT 2"))
+    assert statements == ["SELECT 2"]
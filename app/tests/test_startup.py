@@ -0,0 +1,92 @@
+import os
+
+import pytest
+import sqlalchemy as sa
+
+from app import create_app
+from app.config import ProductionConfig, TestingConfig
+from app.extensions import db, hasher, writer
+
+
+def test_production_startup_skips_schema_and_docs(tmp_path):
+    class ProdConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'tasks.db'}"
+        GC_FREEZE = False  # would freeze the test process's heap
+
+    app = create_app(ProdConfig)
+    assert "flasgger" not in app.blueprints
+    assert "migrate" not in app.extensions  # only loaded by the `flask db` commands
+    with app.app_context():
+        assert sa.inspect(db.engine).get_table_names() == []  # left to the migrations
+        db.engine.dispose()
+
+
+def test_migrations_build_the_model_schema_from_an_empty_database(tmp_path):
+    import subprocess
+    import sys
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    uri = f"sqlite:///{tmp_path / 'fresh.db'}"
+    env = {**os.environ, "APP_CONFIG": "production", "DATABASE_URL": uri, "GC_FREEZE": "0",
+           "PYTHONPATH": root}
+    subprocess.run([sys.executable, "-m", "flask", "--app", "app", "db", "upgrade",
+                    "-d", os.path.join(root, "migrations")],
+                   cwd=tmp_path, env=env, check=True, capture_output=True)
+
+    engine = sa.create_engine(uri)
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), db.metadata)
+    engine.dispose()
+    # The FTS5 table is created by raw SQL, so it is not in the metadata
+    assert [d for d in diff if not (d[0] == "remove_table" and d[1].name.startswith("tasks_fts"))] == []
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_gets_fresh_connections_and_threads(tmp_path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'tasks.db'}"
+        LOG_DIR = str(tmp_path / "logs")
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        db.session.execute(sa.text("SELECT 1"))  # parent holds a pooled connection
+        db.session.remove()
+        parent_pool = db.engine.pool
+
+    parent_listener = app.extensions["log_listener"]
+
+    pid = os.fork()
+    if pid == 0:  # child: report through the exit code only
+        try:
+            with app.app_context():
+                ok = (
+                    db.engine.pool is not parent_pool
+                    and db.session.execute(sa.text("SELECT 1")).scalar() == 1
+                    and app.extensions["log_listener"] is not parent_listener
+                    and hasher._executor is None
+                    and writer._thread is None
+                )
+            app.logger.warning("logged in the child")
+            app.extensions["log_listener"].stop()  # flushes the child's queue
+        except BaseException:
+            ok = False
+        os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert "logged in the child" in (tmp_path / "logs" / "app.log").read_text()
+    with app.app_context():
+        assert db.session.execute(sa.text("SELECT 1")).scalar() == 1  # parent unaffected
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_spawned_workers_do_not_build_an_app_from_run_py():
+    import runpy
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    # what a spawned hash worker does with the script that started the server
+    namespace = runpy.run_path(os.path.join(root, "run.py"), run_name="__mp_main__")
+    assert "app" not in namespace
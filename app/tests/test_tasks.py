@@ -7,3 +7,228 @@ def test_create_task(client, auth_headers):
     data = response.get_json()
     assert data["title"] == "My first task"
     assert data["done"] == False
+
+
+def _login(client, username):
+    client.post("/auth/register", json={"username": username, "password": "pw"})
+    res = client.post("/auth/login", json={"username": username, "password": "pw"})
+    return {"Authorization": f"Bearer {res.get_json()['access_token']}"}
+
+
+def test_list_cache_is_invalidated_per_user():
+    from app import create_app
+    from app.config import TestingConfig
+    from app.extensions import db
+    from app.services.cache_service import cache_stats, reset_cache_stats
+
+    class CachedConfig(TestingConfig):
+        CACHE_TYPE = "SimpleCache"
+
+    app = create_app(CachedConfig)
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+        alice, bob = _login(client, "alice"), _login(client, "bob")
+        reset_cache_stats()
+
+        assert client.get("/tasks/", headers=alice).headers["X-Cache"] == "MISS"
+        assert client.get("/tasks/", headers=alice).headers["X-Cache"] == "HIT"
+
+        # Another user's write leaves alice's cached page alone
+        client.post("/tasks/", json={"title": "bob's"}, headers=bob)
+        assert client.get("/tasks/", headers=alice).headers["X-Cache"] == "HIT"
+
+        # Her own write bumps her version
+        client.post("/tasks/", json={"title": "alice's"}, headers=alice)
+        res = client.get("/tasks/", headers=alice)
+        assert res.headers["X-Cache"] == "MISS"
+        assert res.get_json()["total"] == 1
+
+        assert cache_stats()["hits"] == 2
+        db.session.remove()
+        db.drop_all()
+
+
+def test_list_tasks_cursor_pagination(client, auth_headers):
+    for i in range(5):
+        client.post("/tasks/", json={"title": f"task {i}"}, headers=auth_headers)
+
+    res = client.get("/tasks/?cursor=&per_page=2", headers=auth_headers)
+    data = res.get_json()
+    assert [t["title"] for t in data["tasks"]] == ["task 0", "task 1"]
+    assert "total" not in data
+
+    seen = [t["id"] for t in data["tasks"]]
+    while data["next_cursor"]:
+        res = client.get(
+            f"/tasks/?cursor={data['next_cursor']}&per_page=2&with_total=1",
+            headers=auth_headers,
+        )
+        data = res.get_json()
+        assert data["total"] == 5
+        seen += [t["id"] for t in data["tasks"]]
+    assert seen == sorted(seen) and len(seen) == 5
+
+    res = client.get(f"/tasks/?after_id={seen[3]}", headers=auth_headers)
+    assert [t["id"] for t in res.get_json()["tasks"]] == [seen[4]]
+
+    res = client.get("/tasks/?cursor=not-a-cursor", headers=auth_headers)
+    assert res.status_code == 400
+
+
+def test_keyset_rejects_out_of_range_ids_and_clamps_per_page(client, auth_headers):
+    import base64
+
+    def cursor(raw):
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    for bad in ['{"after_id": 1e999}', '{"after_id": 1.5}', f'{{"after_id": {2**63}}}',
+                '{"after_id": -1}', '{"after_id": true}']:
+        assert client.get(f"/tasks/?cursor={cursor(bad)}", headers=auth_headers).status_code == 400
+    assert client.get(f"/tasks/?after_id={2**63}", headers=auth_headers).status_code == 400
+    res = client.get(f"/tasks/?after_id={2**63 - 1}&per_page=100000", headers=auth_headers)
+    assert res.status_code == 200 and res.get_json()["per_page"] == 100
+
+
+def test_batch_applies_all_operations(client, auth_headers):
+    first = client.post("/tasks/", json={"title": "old"}, headers=auth_headers).get_json()
+
+    res = client.post("/tasks/batch", json={"operations": [
+        {"op": "create", "data": {"title": "a"}},
+        {"op": "create", "data": {"title": "b", "done": True}},
+        {"op": "update", "id": first["id"], "data": {"title": "renamed"}},
+    ]}, headers=auth_headers)
+
+    assert res.status_code == 200
+    results = res.get_json()["results"]
+    assert [r["status"] for r in results] == [201, 201, 200]
+    assert results[2]["task"]["title"] == "renamed"
+    assert client.get("/tasks/", headers=auth_headers).get_json()["total"] == 3
+
+
+def test_batch_is_all_or_nothing(client, auth_headers):
+    res = client.post("/tasks/batch", json={"operations": [
+        {"op": "create", "data": {"title": "kept?"}},
+        {"op": "create", "data": {}},
+        {"op": "update", "id": 999, "data": {"done": True}},
+        {"op": "delete", "id": 1},
+    ]}, headers=auth_headers)
+
+    assert res.status_code == 422
+    errors = res.get_json()["errors"]
+    assert set(errors) == {"1", "2", "3"}
+    assert errors["3"]["op"] == ["Forbidden"]  # deletes are admin-only
+    assert client.get("/tasks/", headers=auth_headers).get_json()["total"] == 0
+
+
+def test_batch_rejects_non_object_body(client, auth_headers):
+    for body in ([{"op": "create"}], 1, "operations"):
+        res = client.post("/tasks/batch", json=body, headers=auth_headers)
+        assert res.status_code == 422
+        assert res.get_json()["errors"]["operations"] == ["Must be a non-empty list"]
+
+
+def test_export_streams_ndjson_and_csv(app, client, auth_headers):
+    import json
+    app.config["EXPORT_CHUNK_SIZE"] = 2
+    for i in range(5):
+        client.post("/tasks/", json={"title": f"task {i}"}, headers=auth_headers)
+
+    res = client.get("/tasks/export", headers=auth_headers)
+    assert res.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+    assert [r["title"] for r in rows] == [f"task {i}" for i in range(5)]
+    assert set(rows[0]) == {"id", "title", "description", "done", "user_id", "created_at"}
+
+    res = client.get("/tasks/export?format=csv", headers=auth_headers)
+    lines = res.get_data(as_text=True).splitlines()
+    assert lines[0].split(",")[:2] == ["id", "title"]
+    assert len(lines) == 6
+
+
+def test_import_ndjson_reports_line_errors(app, client, auth_headers):
+    import json
+    app.config["IMPORT_CHUNK_SIZE"] = 2
+    body = "\n".join([
+        json.dumps({"title": "one"}),
+        json.dumps({"title": "two", "done": True}),
+        "{not json",
+        json.dumps({"description": "no title"}),
+        json.dumps({"id": 99, "title": "three", "created_at": "2024-01-01T00:00:00"}),
+    ])
+    res = client.post("/tasks/import", data=body, headers=auth_headers,
+                      content_type="application/x-ndjson")
+    events = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+
+    assert [e["error"]["line"] for e in events if "error" in e] == [3, 4]
+    assert events[-1]["summary"] == {"imported": 3, "failed": 2, "lines": 5}
+    assert any("progress" in e for e in events)
+
+    tasks = client.get("/tasks/?per_page=10", headers=auth_headers).get_json()["tasks"]
+    assert [t["title"] for t in tasks] == ["one", "two", "three"]
+    assert tasks[2]["created_at"] is not None
+
+
+def test_import_reports_invalid_utf8_as_a_line_error(client, auth_headers):
+    import json
+    body = b'{"title": "ok"}\n{"title": "caf\xe9"}\n{"title": "after"}\n'
+    res = client.post("/tasks/import", data=body, headers=auth_headers,
+                      content_type="application/x-ndjson")
+    events = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+
+    assert res.status_code == 200
+    assert events[0]["error"] == {"line": 2, "errors": {"line": ["Invalid UTF-8"]}}
+    assert events[-1]["summary"] == {"imported": 2, "failed": 1, "lines": 3}
+
+    res = client.post("/tasks/import", data=b"title\nfine\ncaf\xe9\n", headers=auth_headers,
+                      content_type="text/csv")
+    events = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+    assert res.status_code == 200
+    assert "error" in events[0] and events[-1]["summary"]["failed"] == 1
+
+
+def test_import_round_trips_csv_export(client, auth_headers):
+    client.post("/tasks/", json={"title": "exported", "done": True}, headers=auth_headers)
+    exported = client.get("/tasks/export?format=csv", headers=auth_headers).get_data()
+
+    res = client.post("/tasks/import", data=exported, headers=auth_headers,
+                      content_type="text/csv")
+    assert '"imported":1' in res.get_data(as_text=True)
+    tasks = client.get("/tasks/", headers=auth_headers).get_json()["tasks"]
+    assert [t["done"] for t in tasks] == [True, True]
+
+
+def test_conditional_get_with_etags(client, auth_headers):
+    task = client.post("/tasks/", json={"title": "polled"}, headers=auth_headers).get_json()
+
+    first = client.get("/tasks/", headers=auth_headers)
+    etag = first.headers["ETag"]
+    single = client.get(f"/tasks/{task['id']}", headers=auth_headers)
+    assert single.headers["ETag"] != etag  # per URL
+
+    res = client.get("/tasks/", headers={**auth_headers, "If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.get_data() == b""
+
+    # Any write changes the stamp
+    client.patch(f"/tasks/{task['id']}", json={"done": True}, headers=auth_headers)
+    res = client.get("/tasks/", headers={**auth_headers, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+    res = client.get(f"/tasks/{task['id']}",
+                     headers={**auth_headers, "If-None-Match": single.headers["ETag"]})
+    assert res.status_code == 200
+    assert client.get("/tasks/999", headers=auth_headers).headers.get("ETag") is None
+
+
+def test_import_without_executemany_returning(app, client, auth_headers, monkeypatch):
+    # e.g. MySQL, which has no RETURNING
+    from app.extensions import db
+    monkeypatch.setattr(db.engine.dialect, "insert_executemany_returning", False)
+    res = client.post("/tasks/import", data='{"title": "a"}\n{"title": "b", "done": true}',
+                      headers=auth_headers, content_type="application/x-ndjson")
+    assert '"imported":2' in res.get_data(as_text=True)
+    stats = client.get("/tasks/stats", headers=auth_headers).get_json()
+    assert (stats["total"], stats["done"]) == (2, 1)
+    assert stats["created_per_day"][0]["created"] == 2
@@ -0,0 +1,92 @@
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+
+
+def _config(tmp_path, **overrides):
+    attrs = {
+        "CACHE_TYPE": "app.two_tier_cache.TwoTierCache",
+        "CACHE_DIR": str(tmp_path / "cache"),
+        "CACHE_L1_MAX_ITEMS": 2,
+        **overrides,
+    }
+    return type("TwoTierConfig", (TestingConfig,), attrs)
+
+
+def _backend(app):
+    return next(iter(app.extensions["cache"].values()))
+
+
+def test_l1_lru_in_front_of_shared_l2(tmp_path):
+    # Two apps sharing one L2 directory stand in for two worker processes
+    a, b = (_backend(create_app(_config(tmp_path))) for _ in range(2))
+
+    a.set("page:1", {"tasks": [1]})
+    value = a.get("page:1")
+    value["tasks"].append(2)  # callers get copies, not the cached object
+    assert a.get("page:1") == {"tasks": [1]}
+    assert b.get("page:1") == {"tasks": [1]}  # from L2, then L1
+
+    a.set("page:2", 2)
+    a.set("page:3", 3)  # evicts page:1 from L1 only
+    assert a.get("page:1") == {"tasks": [1]}
+    stats = a.tier_stats()
+    assert stats["l1_hits"] == 2 and stats["l2_hits"] == 1
+    assert stats["l1_evictions"] == 2 and stats["l1_items"] == 2
+
+    # Version stamps bypass L1, so other workers see a bump immediately
+    a.set("tasks:ver:1", 1)
+    assert b.get("tasks:ver:1") == 1
+    b.set("tasks:ver:1", 2)
+    assert a.get("tasks:ver:1") == 2
+
+
+def test_clear_reaches_other_workers(tmp_path):
+    config = _config(tmp_path, CACHE_L1_GENERATION_CHECK=0)
+    a, b = _backend(create_app(config)), _backend(create_app(config))
+
+    a.set("k", "v")
+    assert b.get("k") == "v"
+    a.clear()
+    assert b.get("k") is None
+
+
+def test_tier_metrics_are_exported(tmp_path):
+    app = create_app(_config(tmp_path))
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post("/auth/register", json={"username": "c", "password": "pw"})
+    token = client.post("/auth/login", json={"username": "c", "password": "pw"}).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/tasks/", headers=headers)
+    assert client.get("/tasks/", headers=headers).headers["X-Cache"] == "HIT"
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'cache_tier_requests_total{tier="l1",result="hit"}' in body
+    assert "cache_l1_max_items 2" in body
+
+
+def test_l1_copy_expires_with_the_l2_entry(tmp_path, monkeypatch):
+    import time
+    from app import two_tier_cache
+
+    a, b = (_backend(create_app(_config(tmp_path, CACHE_L1_TTL=60))) for _ in range(2))
+    a.set("page:1", "v", timeout=5)
+    clock = time.time()
+    monkeypatch.setattr(two_tier_cache.time, "time", lambda: clock + 4)
+    assert b.get("page:1") == "v"  # into b's L1 with 1s left, not 60s
+
+    expires_at, _ = b._l1["page:1"]
+    assert expires_at - time.monotonic() <= 1
+
+
+def test_default_cache_dir_is_per_database(tmp_path, monkeypatch):
+    import tempfile
+    from app.two_tier_cache import default_cache_dir
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    config = _config(tmp_path, CACHE_DIR=None, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'a.db'}")
+    l2 = _backend(create_app(config)).l2
+    assert l2._path == default_cache_dir(f"sqlite:///{tmp_path / 'a.db'}")
+    assert default_cache_dir("sqlite:///a.db") != default_cache_dir("sqlite:///b.db")
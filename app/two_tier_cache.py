@@ -0,0 +1,197 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from flask_caching.backends.base import BaseCache
+from werkzeug.utils import import_string
+
+_GENERATION_KEY = "__two_tier_generation__"
+
+
+class _Entry:
+    """What L2 stores: the value with its wall-clock expiry (``None``: never)."""
+
+    __slots__ = ("expires_at", "value")
+
+    def __init__(self, expires_at, value):
+        self.expires_at = expires_at
+        self.value = value
+
+    def __getstate__(self):
+        return self.expires_at, self.value
+
+    def __setstate__(self, state):
+        self.expires_at, self.value = state
+
+
+def default_cache_dir(database_uri):
+    """A FileSystemCache directory per database, so configs never share entries."""
+    digest = hashlib.sha256(database_uri.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"taskmanager-cache-{digest}")
+
+
+class TwoTierCache(BaseCache):
+    """flask_caching backend: a bounded in-process LRU (L1) over a shared cache (L2).
+
+    Select it with ``CACHE_TYPE = "app.two_tier_cache.TwoTierCache"``; L2 is
+    built from ``CACHE_L2_TYPE`` (``FileSystemCache`` or ``RedisCache``) and
+    the usual ``CACHE_*`` settings (without ``CACHE_DIR``, a directory per
+    database). Every write goes to both tiers. L2 stores each value with its
+    expiry, so an entry copied into L1 never outlives it in L2.
+
+    L1 is only safe for keys whose value never changes under the same key,
+    like the versioned task pages. Mutable keys (``CACHE_L1_VOLATILE_PREFIXES``,
+    e.g. the per-user version stamps that carry invalidations between
+    processes) are kept in L1 for at most ``CACHE_L1_VOLATILE_TTL`` seconds
+    (``0``: always read from L2). ``clear()`` bumps a generation stamp in L2
+    that other processes check every ``CACHE_L1_GENERATION_CHECK`` seconds.
+    """
+
+    def __init__(self, l2, max_items=1024, ttl=60, volatile_prefixes=(), volatile_ttl=0,
+                 generation_check=1.0, default_timeout=300):
+        super().__init__(default_timeout=default_timeout)
+        self.l2 = l2
+        self.max_items = max_items
+        self.ttl = ttl
+        self.volatile_prefixes = tuple(volatile_prefixes)
+        self.volatile_ttl = volatile_ttl
+        self.generation_check = generation_check
+        self._l1 = OrderedDict()  # key -> (expires_at, pickled value)
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(("l1_hits", "l1_misses", "l2_hits", "l2_misses", "l1_evictions"), 0)
+        self._generation = self.l2.get(_GENERATION_KEY)
+        self._next_generation_check = time.monotonic() + generation_check
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        name = config["CACHE_L2_TYPE"]
+        l2_cls = import_string(name if "." in name else f"flask_caching.backends.{name}")
+        if not config.get("CACHE_DIR"):
+            config = {**config, "CACHE_DIR": default_cache_dir(config["SQLALCHEMY_DATABASE_URI"])}
+        l2 = l2_cls.factory(app, config, list(args), dict(kwargs))
+        return cls(
+            l2,
+            max_items=config["CACHE_L1_MAX_ITEMS"],
+            ttl=config["CACHE_L1_TTL"],
+            volatile_prefixes=config["CACHE_L1_VOLATILE_PREFIXES"],
+            volatile_ttl=config["CACHE_L1_VOLATILE_TTL"],
+            generation_check=config["CACHE_L1_GENERATION_CHECK"],
+            default_timeout=kwargs.get("default_timeout", 300),
+        )
+
+    # --- L1 ---
+
+    def _l1_ttl(self, key, timeout):
+        """``timeout``: seconds the value has left in L2 (``None``: no expiry)."""
+        ttl = self.volatile_ttl if key.startswith(self.volatile_prefixes) else self.ttl
+        return min(ttl, timeout) if timeout is not None else ttl
+
+    def _l1_get(self, key):
+        now = time.monotonic()
+        if now >= self._next_generation_check:
+            self._next_generation_check = now + self.generation_check
+            self._sync_generation()
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._l1[key]
+                return None
+            self._l1.move_to_end(key)
+            return entry
+
+    def _l1_put(self, key, value, timeout):
+        ttl = self._l1_ttl(key, timeout)
+        if ttl <= 0 or not self.max_items:
+            return
+        entry = (time.monotonic() + ttl, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._l1[key] = entry
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.max_items:
+                self._l1.popitem(last=False)
+                self._stats["l1_evictions"] += 1
+
+    def _l1_discard(self, key):
+        with self._lock:
+            self._l1.pop(key, None)
+
+    def _sync_generation(self):
+        generation = self.l2.get(_GENERATION_KEY)
+        if generation != self._generation:
+            with self._lock:
+                self._l1.clear()
+            self._generation = generation
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def tier_stats(self):
+        """Per-tier counters plus the current L1 size and limit."""
+        with self._lock:
+            stats = dict(self._stats, l1_items=len(self._l1))
+        stats["l1_max_items"] = self.max_items
+        return stats
+
+    # --- Cache API ---
+
+    def get(self, key):
+        entry = self._l1_get(key)
+        if entry is not None:
+            self._count("l1_hits")
+            return pickle.loads(entry[1])
+        self._count("l1_misses")
+
+        entry = self.l2.get(key)
+        if entry is None:
+            self._count("l2_misses")
+            return None
+        self._count("l2_hits")
+        if not isinstance(entry, _Entry):
+            return entry  # written before expiries were stored: L2 only
+        if entry.expires_at is None:
+            self._l1_put(key, entry.value, None)
+        else:
+            self._l1_put(key, entry.value, entry.expires_at - time.time())
+        return entry.value
+
+    def set(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        result = self.l2.set(key, self._entry(value, timeout), timeout=timeout)
+        if result:
+            self._l1_put(key, value, timeout or None)
+        else:
+            self._l1_discard(key)
+        return result
+
+    def add(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        added = self.l2.add(key, self._entry(value, timeout), timeout=timeout)
+        if added:
+            self._l1_put(key, value, timeout or None)
+        return added
+
+    @staticmethod
+    def _entry(value, timeout):
+        return _Entry(time.time() + timeout if timeout else None, value)
+
+    def delete(self, key):
+        self._l1_discard(key)
+        return self.l2.delete(key)
+
+    def has(self, key):
+        return self._l1_get(key) is not None or self.l2.has(key)
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        cleared = self.l2.clear()
+        self._generation = time.time_ns()
+        self.l2.set(_GENERATION_KEY, self._generation, timeout=0)
+        return cleared
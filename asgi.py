@@ -0,0 +1,5 @@
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
+
+# Run with: uvicorn asgi:app --workers 4
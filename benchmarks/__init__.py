@@ -0,0 +1,6 @@
+"""Performance benchmarks. Run from the repo root, e.g. ``python -m benchmarks.bench_import``.
+
+``seed``, ``micro``, ``load`` and ``compare`` form the regression suite: seed a
+database, time each endpoint in-process and under concurrent HTTP load, write
+JSON results and compare them against a saved baseline.
+"""
@@ -0,0 +1,74 @@
+"""Same load mix against the WSGI app (threaded werkzeug) and the ASGI app (uvicorn).
+
+    python -m benchmarks.bench_asgi --threads 64 --duration 10
+
+Both servers run in this process on a seeded file database; ``--threads`` is
+the number of concurrent keep-alive connections.
+"""
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from app.config import TestingConfig
+from benchmarks.common import make_app, print_results, write_results
+from benchmarks.load import run_load, serve_in_thread
+from benchmarks.seed import seed
+
+
+def serve_asgi_in_thread(db_path):
+    import uvicorn
+
+    from app.asgi import create_asgi_app
+
+    config = type("BenchConfig", (TestingConfig,), {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}"})
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(
+        create_asgi_app(config), log_level="warning", access_log=False, backlog=4096,
+    ))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per user")
+    parser.add_argument("--threads", type=int, default=64, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per server")
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--out", help="write results as JSON (see benchmarks.compare)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        app = make_app(db_path, DB_ENGINE_PROFILE="sqlite")
+        ranges = seed(app, args.users, args.tasks)
+
+        results = {}
+        server, base_url = serve_in_thread(app)
+        wsgi = run_load(base_url, ranges, args.threads, args.duration, args.per_page)
+        server.shutdown()
+
+        server, base_url = serve_asgi_in_thread(db_path)
+        asgi = run_load(base_url, ranges, args.threads, args.duration, args.per_page)
+        server.should_exit = True
+
+        for op in wsgi:
+            results[f"wsgi {op}"] = wsgi[op]
+            results[f"asgi {op}"] = asgi[op]
+
+    print_results(results)
+    for name in ("wsgi", "asgi"):
+        print(f"{name}: {results[f'{name} all']['ops_per_s']:.1f} req/s over {args.threads} connections")
+    if args.out:
+        write_results(args.out, "asgi", results, threads=args.threads, duration=args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Per-request auth overhead: jwt_required + role_required vs the auth context."""
+import argparse
+import time
+
+from flask_jwt_extended import create_access_token, get_jwt, verify_jwt_in_request
+
+from app import create_app
+from app.auth.context import load_auth_context
+from app.config import TestingConfig
+
+
+def legacy_auth():
+    # What delete_task used to do: @jwt_required() then @role_required("admin")
+    verify_jwt_in_request()
+    verify_jwt_in_request()
+    return get_jwt().get("role") == "admin"
+
+
+def context_auth():
+    load_auth_context()
+    return load_auth_context().role == "admin"
+
+
+def per_request_us(app, headers, fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with app.test_request_context("/tasks/1", method="DELETE", headers=headers):
+            assert fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        token = create_access_token(identity="1", additional_claims={"role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    baseline = per_request_us(app, headers, lambda: True, args.iterations)
+    results = {
+        "jwt_required + role_required": per_request_us(app, headers, legacy_auth, args.iterations),
+    }
+    app.extensions["jwt_verify_cache"].maxsize = 0
+    results["auth context, LRU off"] = per_request_us(app, headers, context_auth, args.iterations)
+    app.extensions["jwt_verify_cache"].maxsize = 1024
+    results["auth context, LRU warm"] = per_request_us(app, headers, context_auth, args.iterations)
+
+    print(f"request context only: {baseline:7.1f} us/request")
+    for name, us in results.items():
+        print(f"{name:29s}: {us - baseline:7.1f} us/request auth overhead")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""POST /tasks/ throughput over HTTP: one commit per request vs group commit.
+
+    python -m benchmarks.bench_group_commit --threads 16 --duration 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.common import make_app, summarize
+from benchmarks.load import Client, login_all, serve_in_thread
+from benchmarks.seed import seed
+
+MODES = {
+    "per-request commit, synchronous=NORMAL": {},
+    "per-request commit, synchronous=FULL": {
+        "SQLITE_PRAGMAS": {"journal_mode": "WAL", "synchronous": "FULL", "busy_timeout": 5000},
+    },
+    "group commit, synchronous=FULL": {"GROUP_COMMIT_ENABLED": True},
+    "group commit, synchronous=NORMAL": {"GROUP_COMMIT_ENABLED": True, "GROUP_COMMIT_SYNCHRONOUS": "NORMAL"},
+}
+
+
+def run(overrides, threads, duration):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"), DB_ENGINE_PROFILE="sqlite", **overrides)
+        seed(app, 1, 0)
+        server, base_url = serve_in_thread(app)
+        headers = {"Authorization": f"Bearer {login_all(base_url, ['bench_0'])['bench_0']}"}
+        latencies, errors = [], []
+        deadline = time.perf_counter() + duration
+
+        def worker():
+            client = Client(base_url)
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                status, _ = client.request("POST", "/tasks/", {"title": "bench"}, headers)
+                (latencies if status == 201 else errors).append(time.perf_counter() - start)
+            client.close()
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        server.shutdown()
+        app.extensions["group_commit"].shutdown()
+        return summarize(latencies, duration, errors=len(errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for name, overrides in MODES.items():
+        stats = run(overrides, args.threads, args.duration)
+        print(f"{name:40s} {stats['ops_per_s']:8.1f} writes/s  p95 {stats['p95_ms']:7.2f} ms  "
+              f"errors {stats['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Rows/second of POST /tasks/import against one create_task() per row."""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import User
+from app.services.task_service import create_task
+
+
+def make_app(path):
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def login(client):
+    client.post("/auth/register", json={"username": "bench", "password": "bench"})
+    res = client.post("/auth/login", json={"username": "bench", "password": "bench"})
+    return {"Authorization": f"Bearer {res.get_json()['access_token']}"}
+
+
+def bench_per_row(app, rows):
+    with app.app_context():
+        user = User.query.filter_by(username="bench").first()
+        start = time.perf_counter()
+        for i in range(rows):
+            create_task(user.id, {"title": f"task {i}"})
+        return time.perf_counter() - start
+
+
+def bench_import(app, headers, rows, chunk_size):
+    app.config["IMPORT_CHUNK_SIZE"] = chunk_size
+    body = "".join(json.dumps({"title": f"task {i}"}) + "\n" for i in range(rows))
+    client = app.test_client()
+    start = time.perf_counter()
+    res = client.post("/tasks/import", data=body, headers=headers,
+                      content_type="application/x-ndjson")
+    summary = json.loads(res.get_data(as_text=True).splitlines()[-1])["summary"]
+    elapsed = time.perf_counter() - start
+    assert summary["imported"] == rows, summary
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--import-rows", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        headers = login(app.test_client())
+
+        per_row = bench_per_row(app, args.rows)
+        bulk = bench_import(app, headers, args.import_rows, args.chunk_size)
+
+    print(f"create_task per row : {args.rows / per_row:10.0f} rows/s ({args.rows} rows)")
+    print(f"POST /tasks/import  : {args.import_rows / bulk:10.0f} rows/s "
+          f"({args.import_rows} rows, chunk {args.chunk_size})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Serialize a page of tasks: ORM + marshmallow + stdlib json vs rows + RowSerializer + orjson."""
+import argparse
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.json_provider import OrjsonProvider
+from app.models import Task
+from app.schemas.task_schema import tasks_schema, task_rows
+
+
+def timed(fn, iterations):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-page", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(db.insert(Task), [
+            {"title": f"task {i}", "description": "some text", "done": i % 2 == 0, "user_id": 1}
+            for i in range(args.per_page)
+        ])
+        db.session.commit()
+        default_json, fast_json = DefaultJSONProvider(app), OrjsonProvider(app)
+        query = Task.query.filter_by(user_id=1).order_by(Task.id).limit(args.per_page)
+
+        def marshmallow_path():
+            db.session.expunge_all()
+            return default_json.response({"tasks": tasks_schema.dump(query.all())})
+
+        def fast_path():
+            rows = query.with_entities(*task_rows.columns).all()
+            return fast_json.response({"tasks": task_rows.dump_many(rows)})
+
+        assert marshmallow_path().get_data() == fast_path().get_data()
+
+        rows = query.with_entities(*task_rows.columns).all()
+        tasks = query.all()
+        results = {
+            "fetch + dump + encode, marshmallow": timed(marshmallow_path, args.iterations),
+            "fetch + dump + encode, fast path": timed(fast_path, args.iterations),
+            "dump only, marshmallow": timed(lambda: tasks_schema.dump(tasks), args.iterations),
+            "dump only, RowSerializer": timed(lambda: task_rows.dump_many(rows), args.iterations),
+        }
+
+    print(f"{args.per_page} tasks per page")
+    for name, ms in results.items():
+        print(f"  {name:36s}: {ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Concurrent read/write throughput on file SQLite: stock engine vs the "sqlite" profile."""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Task, User
+from app.services.task_service import create_task
+
+
+def make_app(path, profile):
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        DB_ENGINE_PROFILE = profile
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(username="bench", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def worker(app, kind, deadline, results):
+    ops = errors = 0
+    latencies = []
+    with app.app_context():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if kind == "write":
+                    create_task(1, {"title": "bench"})
+                else:
+                    Task.query.filter_by(user_id=1).order_by(Task.id.desc()).limit(20).all()
+                    db.session.rollback()  # end the read transaction like a request would
+                ops += 1
+                latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+        db.session.remove()
+    results.append((kind, ops, errors, latencies))
+
+
+def run(profile, readers, writers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"), profile)
+        results = []
+        deadline = time.perf_counter() + seconds
+        threads = [
+            threading.Thread(target=worker, args=(app, kind, deadline, results))
+            for kind in ["read"] * readers + ["write"] * writers
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        with app.app_context():
+            db.engine.dispose()
+
+    print(f"[{profile}]")
+    for kind in ("read", "write"):
+        rows = [r for r in results if r[0] == kind]
+        ops = sum(r[1] for r in rows)
+        errors = sum(r[2] for r in rows)
+        latencies = sorted(l for r in rows for l in r[3]) or [0.0]
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        print(f"  {kind:5s}: {ops / seconds:8.0f} ops/s  p99 {p99:7.1f} ms  locked errors {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    for profile in ("default", "sqlite"):
+        run(profile, args.readers, args.writers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
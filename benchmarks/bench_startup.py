@@ -0,0 +1,66 @@
+"""Cold start per config: import time, create_app time and time to first request.
+
+    python -m benchmarks.bench_startup --runs 5
+
+Each run is a fresh interpreter on an already migrated database, like a new
+worker process; medians are reported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+status = app.test_client().post("/auth/login", json={"username": "nobody", "password": "x"}).status_code
+first = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "create_app_ms": (created - imported) * 1000,
+                  "first_request_ms": (first - created) * 1000, "total_ms": (first - start) * 1000,
+                  "status": status}))
+"""
+
+
+def probe(config, env):
+    env = {**env, "APP_CONFIG": config}
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", PROBE], env=env, cwd=env["BENCH_CWD"],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--configs", default="development,production")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])),
+            "BENCH_CWD": tmp,  # logs/ is written relative to the working directory
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "CACHE_TYPE": "SimpleCache",
+            "RATELIMIT_STORAGE_URI": "memory://",
+        }
+        probe("development", env)  # creates the schema once, as the migrations would
+
+        for config in args.configs.split(","):
+            runs = [probe(config, env) for _ in range(args.runs)]
+            medians = {key: statistics.median(run[key] for run in runs)
+                       for key in ("import_ms", "create_app_ms", "first_request_ms", "total_ms")}
+            print(f"{config:12s} import {medians['import_ms']:7.1f} ms  create_app {medians['create_app_ms']:7.1f} ms  "
+                  f"first request {medians['first_request_ms']:6.1f} ms  total {medians['total_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Helpers shared by the benchmark scripts."""
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+
+
+def make_app(db_path, create_tables=True, **overrides):
+    """App on a file-backed SQLite database, configured like TestingConfig."""
+    attrs = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}", **overrides}
+    app = create_app(type("BenchConfig", (TestingConfig,), attrs))
+    if create_tables:
+        with app.app_context():
+            db.create_all()
+    return app
+
+
+def login(client, username, password="bench"):
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    return {"Authorization": f"Bearer {res.get_json()['access_token']}"}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed=None, errors=0):
+    """Latency stats in milliseconds for a list of durations in seconds."""
+    values = sorted(latencies)
+    summary = {
+        "count": len(values),
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+    if elapsed:
+        summary["ops_per_s"] = round(len(values) / elapsed, 1)
+    return summary
+
+
+def timed_calls(fn, iterations):
+    """Call ``fn`` ``iterations`` times and return the per-call durations."""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def write_results(path, kind, results, **meta):
+    document = {
+        "kind": kind,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "meta": meta,
+        "results": results,
+    }
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+    return document
+
+
+def print_results(results):
+    for name, stats in results.items():
+        extra = f"  {stats['ops_per_s']:9.1f} ops/s" if "ops_per_s" in stats else ""
+        print(f"  {name:40s} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+              f"p99 {stats['p99_ms']:8.2f} ms{extra}")
@@ -0,0 +1,52 @@
+"""Compare a benchmark result file against a baseline.
+
+    python -m benchmarks.compare results/baseline.json results/latest.json --metric p95_ms
+
+Exits with status 1 when any case got slower than ``--tolerance`` allows,
+so it can gate CI.
+"""
+import argparse
+import json
+
+
+def compare(baseline, current, metric="p95_ms", tolerance=0.10):
+    """Return ``(rows, regressions)`` for cases present in both result sets."""
+    rows, regressions = [], []
+    for name, stats in current["results"].items():
+        before = baseline["results"].get(name, {}).get(metric)
+        after = stats.get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change))
+        if change > tolerance:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="p95_ms")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows, regressions = compare(baseline, current, args.metric, args.tolerance)
+    print(f"{'case':40s} {'baseline':>10s} {'current':>10s} {'change':>8s}")
+    for name, before, after, change in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:40s} {before:10.2f} {after:10.2f} {change:+7.1%}{flag}")
+    if regressions:
+        raise SystemExit(f"{len(regressions)} case(s) slower than baseline by more than "
+                         f"{args.tolerance:.0%} on {args.metric}")
+
+
+if __name__ == "__main__":
+    main()
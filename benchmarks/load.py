@@ -0,0 +1,191 @@
+"""Multithreaded HTTP load driver with a realistic endpoint mix.
+
+    python -m benchmarks.load --threads 8 --duration 20 --out results/load.json
+
+By default a seeded app is served in-process by werkzeug's threaded server;
+``--url`` points the driver at an already running deployment instead (its
+users must have been created with ``benchmarks.seed``).
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.common import print_results, summarize, write_results
+from benchmarks.seed import PASSWORD, seed
+
+# 🔹 Weighted operation mix; reads dominate, as in real traffic
+MIX = (
+    ("list tasks", 50),
+    ("list tasks done filter", 10),
+    ("list tasks keyset", 10),
+    ("get task", 15),
+    ("add task", 10),
+    ("edit task", 5),
+)
+
+
+class Client:
+    """Keep-alive HTTP client for one worker thread."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        for attempt in (0, 1):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.conn.request(method, path, payload, headers)
+                res = self.conn.getresponse()
+                data = res.read()
+                if res.getheader("Connection", "").lower() == "close" or res.version == 10:
+                    self.close()
+                return res.status, data
+            except (http.client.HTTPException, ConnectionError):
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def login_all(base_url, usernames):
+    client, tokens = Client(base_url), {}
+    for username in usernames:
+        status, data = client.request("POST", "/auth/login",
+                                      {"username": username, "password": PASSWORD})
+        if status != 200:
+            raise SystemExit(f"login failed for {username}: {status}")
+        tokens[username] = json.loads(data)["access_token"]
+    client.close()
+    return tokens
+
+
+def worker(base_url, users, per_page, deadline, seed_value, samples):
+    rng = random.Random(seed_value)
+    names = [name for name, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    client = Client(base_url)
+    while time.perf_counter() < deadline:
+        token, (low, high) = rng.choice(users)
+        headers = {"Authorization": f"Bearer {token}"}
+        op = rng.choices(names, weights)[0]
+        pages = max(1, (high - low + 1) // per_page)
+        if op == "list tasks":
+            args = ("GET", f"/tasks/?page={rng.randint(1, pages)}&per_page={per_page}")
+        elif op == "list tasks done filter":
+            args = ("GET", f"/tasks/?page={rng.randint(1, max(1, pages // 2))}"
+                           f"&per_page={per_page}&done={rng.choice(['true', 'false'])}")
+        elif op == "list tasks keyset":
+            args = ("GET", f"/tasks/?after_id={rng.randint(low, high)}&per_page={per_page}")
+        elif op == "get task":
+            args = ("GET", f"/tasks/{rng.randint(low, high)}")
+        elif op == "add task":
+            args = ("POST", "/tasks/", {"title": "load test"})
+        else:
+            args = ("PATCH", f"/tasks/{rng.randint(low, high)}", {"done": rng.random() < 0.5})
+
+        start = time.perf_counter()
+        try:
+            status, _ = client.request(*args, headers=headers)
+            ok = status < 400
+        except OSError:
+            ok = False
+        samples.append((op, time.perf_counter() - start, ok))
+    client.close()
+
+
+def run_load(base_url, ranges, threads, duration, per_page, seed_value=1):
+    tokens = login_all(base_url, sorted(ranges))
+    users = [(tokens[name], ranges[name]) for name in sorted(ranges)]
+    samples = []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    pool = [
+        threading.Thread(target=worker,
+                         args=(base_url, users, per_page, deadline, seed_value + i, samples))
+        for i in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for op, _ in MIX + (("all", 0),):
+        picked = [s for s in samples if op == "all" or s[0] == op]
+        results[op] = summarize([s[1] for s in picked if s[2]], elapsed,
+                                errors=sum(1 for s in picked if not s[2]))
+    return results
+
+
+def serve_in_thread(app):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive between requests
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="target an existing server instead of an in-process one")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per user")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if args.url:
+            base_url = args.url.rstrip("/")
+            # 🔹 Seeded ids are contiguous per user, in seeding order
+            ranges = {f"bench_{n}": (n * args.tasks + 1, (n + 1) * args.tasks)
+                      for n in range(args.users)}
+        else:
+            from benchmarks.common import make_app
+
+            app = make_app(os.path.join(tmp, "bench.db"), DB_ENGINE_PROFILE="sqlite")
+            ranges = seed(app, args.users, args.tasks)
+            server, base_url = serve_in_thread(app)
+        try:
+            results = run_load(base_url, ranges, args.threads, args.duration, args.per_page)
+        finally:
+            if server is not None:
+                server.shutdown()
+
+    write_results(args.out, "load", results, url=args.url or "in-process", users=args.users,
+                  tasks_per_user=args.tasks, threads=args.threads, duration=args.duration,
+                  per_page=args.per_page)
+    print(f"{args.threads} threads for {args.duration:.0f}s against {args.url or 'in-process server'}")
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
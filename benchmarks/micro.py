@@ -0,0 +1,87 @@
+"""Per-endpoint microbenchmarks on a seeded database.
+
+    python -m benchmarks.micro --users 5 --tasks 5000 --out results/micro.json
+
+Each case runs in-process through the Flask test client, so the numbers
+cover routing, auth, the query and serialization, but no network.
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import login, make_app, print_results, summarize, timed_calls, write_results
+from benchmarks.seed import seed
+
+
+def list_cases(tasks, per_page):
+    """``GET /tasks/`` at increasing page depths, with and without filters."""
+    last_page = max(1, -(-tasks // per_page))
+    cases = {}
+    for depth in sorted({1, 10, 100, last_page}):
+        if depth <= last_page:
+            cases[f"list page={depth}"] = f"/tasks/?page={depth}&per_page={per_page}"
+    for done in ("true", "false"):
+        cases[f"list page=1 done={done}"] = f"/tasks/?page=1&per_page={per_page}&done={done}"
+        cases[f"list page={last_page // 2 or 1} done={done}"] = (
+            f"/tasks/?page={last_page // 2 or 1}&per_page={per_page}&done={done}"
+        )
+    cases["list keyset first page"] = f"/tasks/?after_id=0&per_page={per_page}"
+    return cases
+
+
+def run(app, username, tasks, per_page, iterations):
+    client = app.test_client()
+    headers = login(client, username)
+    results = {}
+
+    def bench(name, fn):
+        fn()  # warm up
+        results[name] = summarize(timed_calls(fn, iterations))
+
+    def get(url):
+        res = client.get(url, headers=headers)
+        assert res.status_code == 200, (url, res.status_code)
+
+    for name, url in list_cases(tasks, per_page).items():
+        bench(name, lambda url=url: get(url))
+
+    first_id = client.get("/tasks/?after_id=0&per_page=1", headers=headers).get_json()["tasks"][0]["id"]
+    bench("get task", lambda: get(f"/tasks/{first_id}"))
+    bench("add task", lambda: client.post("/tasks/", json={"title": "bench"}, headers=headers))
+    bench("edit task", lambda: client.patch(f"/tasks/{first_id}", json={"done": True}, headers=headers))
+    bench("login", lambda: client.post("/auth/login", json={"username": username, "password": "bench"}))
+
+    with app.app_context():
+        from app.models import Task
+        from app.schemas.task_schema import task_rows
+
+        rows = Task.query.filter_by(user_id=1).limit(per_page).with_entities(*task_rows.columns).all()
+        bench(f"serialize {per_page} tasks", lambda: app.json.response({"tasks": task_rows.dump_many(rows)}))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--tasks", type=int, default=5000, help="tasks per user")
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--hash-method", help="PASSWORD_HASH_METHOD for the login case "
+                                              "(default: the cheap testing method)")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    overrides = {"PASSWORD_HASH_METHOD": args.hash_method} if args.hash_method else {}
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"), **overrides)
+        seed(app, args.users, args.tasks)
+        results = run(app, "bench_0", args.tasks, args.per_page, args.iterations)
+
+    write_results(args.out, "micro", results, users=args.users, tasks_per_user=args.tasks,
+                  per_page=args.per_page, iterations=args.iterations)
+    print(f"{args.users} users x {args.tasks} tasks, {args.iterations} iterations per case")
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
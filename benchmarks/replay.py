@@ -0,0 +1,167 @@
+"""Replay captured traffic (see ``CAPTURE_ENABLED``) against a local build.
+
+    python -m benchmarks.replay logs/capture.jsonl --speed 2 --out results/replay-new.json
+    python -m benchmarks.compare results/replay-old.json results/replay-new.json
+
+Requests are re-issued at their recorded pace divided by ``--speed``
+(``--speed 0`` sends as fast as the worker threads allow). Recorded users
+are mapped onto seeded ``bench_<n>`` users, tokens and passwords are
+rewritten for them and task ids are moved into their seeded id range.
+Run it on two builds and compare the result files for latency deltas.
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import print_results, summarize, write_results
+from benchmarks.load import Client, login_all, serve_in_thread
+from benchmarks.seed import PASSWORD, seed
+
+_TASK_ID = re.compile(r"^/tasks/(\d+)$")
+_NUMBER = re.compile(r"/\d+")
+
+
+def load_records(path):
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return sorted(records, key=lambda r: r["ts"])
+
+
+def label(record):
+    return f"{record['method']} {_NUMBER.sub('/<id>', record['path'])}"
+
+
+class Rewriter:
+    """Maps recorded users, credentials and task ids onto the seeded data."""
+
+    def __init__(self, ranges, tokens):
+        self.names = sorted(ranges)
+        self.ranges = ranges
+        self.tokens = tokens
+        self.users = {}
+        self.registered = 0
+
+    def user_for(self, ref):
+        if ref not in self.users:
+            self.users[ref] = self.names[len(self.users) % len(self.names)]
+        return self.users[ref]
+
+    def __call__(self, record):
+        """``(method, path, body, headers)`` to send, or ``None`` to skip."""
+        body = record.get("body")
+        if isinstance(body, dict) and "_omitted" in body:
+            return None
+        path = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+        headers = {}
+
+        if record["path"] == "/auth/register":
+            self.registered += 1
+            body = {"username": f"replay_{os.getpid()}_{self.registered}", "password": PASSWORD}
+        elif record["path"] == "/auth/login":
+            body = {"username": self.user_for(f"login:{(body or {}).get('username')}"),
+                    "password": PASSWORD}
+        elif record.get("user"):
+            name = self.user_for(record["user"])
+            headers["Authorization"] = f"Bearer {self.tokens[name]}"
+            match = _TASK_ID.match(record["path"])
+            if match:
+                low, high = self.ranges[name]
+                task_id = low + int(match.group(1)) % (high - low + 1)
+                path = path.replace(match.group(0), f"/tasks/{task_id}", 1)
+        return record["method"], path, body, headers
+
+
+def replay(base_url, records, rewriter, speed, threads):
+    local = threading.local()
+    samples, skipped = [], 0
+
+    def send(record, request):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = Client(base_url)
+        start = time.perf_counter()
+        try:
+            status, _ = client.request(*request[:3], headers=request[3])
+        except OSError:
+            status = None
+        samples.append((label(record), time.perf_counter() - start, status, record.get("status")))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        first_ts = records[0]["ts"] if records else 0
+        for record in records:
+            if speed:
+                delay = (record["ts"] - first_ts) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            request = rewriter(record)
+            if request is None:
+                skipped += 1
+                continue
+            pool.submit(send, record, request)
+    elapsed = time.perf_counter() - started
+
+    recorded = {}
+    for record in records:
+        recorded.setdefault(label(record), []).append(record.get("duration_ms", 0) / 1000)
+
+    results = {}
+    for name in sorted({s[0] for s in samples}) + ["all"]:
+        picked = [s for s in samples if name == "all" or s[0] == name]
+        ok = [s for s in picked if s[2] is not None and s[2] < 500]
+        stats = summarize([s[1] for s in ok], elapsed, errors=len(picked) - len(ok))
+        stats["status_mismatches"] = sum(1 for s in picked if s[2] != s[3])
+        if name in recorded:
+            stats["recorded_p50_ms"] = summarize(recorded[name])["p50_ms"]
+        results[name] = stats
+    return results, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="JSONL file written by the capture middleware")
+    parser.add_argument("--url", help="target an existing server instead of an in-process one")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="rate multiplier over the recorded pace; 0 = no pacing")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--users", type=int, help="seeded users (default: one per recorded user)")
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per seeded user")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    records = load_records(args.capture)
+    users = args.users or max(1, len({r["user"] for r in records if r.get("user")}))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if args.url:
+            base_url = args.url.rstrip("/")
+            ranges = {f"bench_{n}": (n * args.tasks + 1, (n + 1) * args.tasks) for n in range(users)}
+        else:
+            from benchmarks.common import make_app
+
+            app = make_app(os.path.join(tmp, "bench.db"), DB_ENGINE_PROFILE="sqlite")
+            ranges = seed(app, users, args.tasks)
+            server, base_url = serve_in_thread(app)
+        try:
+            rewriter = Rewriter(ranges, login_all(base_url, sorted(ranges)))
+            results, skipped = replay(base_url, records, rewriter, args.speed, args.threads)
+        finally:
+            if server is not None:
+                server.shutdown()
+
+    write_results(args.out, "replay", results, capture=args.capture, records=len(records),
+                  skipped=skipped, speed=args.speed, threads=args.threads, users=users,
+                  tasks_per_user=args.tasks, url=args.url or "in-process")
+    print(f"Replayed {len(records) - skipped} of {len(records)} requests at {args.speed}x "
+          f"({skipped} skipped: body not captured)")
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
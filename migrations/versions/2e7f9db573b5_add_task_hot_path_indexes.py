@@ -0,0 +1,28 @@
+"""add task hot path indexes
+
+Revision ID: 2e7f9db573b5
+Revises: 5f3c8a1d2b60
+Create Date: 2026-10-18 09:12:40.118422
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e7f9db573b5'
+down_revision = '5f3c8a1d2b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_user_id_id', ['user_id', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_user_id_done_id', ['user_id', 'done', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_user_id_done_id')
+        batch_op.drop_index('ix_tasks_user_id_id')
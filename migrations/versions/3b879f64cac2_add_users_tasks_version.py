@@ -0,0 +1,26 @@
+"""add users.tasks_version
+
+Revision ID: 3b879f64cac2
+Revises: 2e7f9db573b5
+Create Date: 2026-10-18 11:04:52.630117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b879f64cac2'
+down_revision = '2e7f9db573b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tasks_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('tasks_version')
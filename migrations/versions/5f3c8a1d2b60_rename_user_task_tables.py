@@ -0,0 +1,42 @@
+"""rename user/task tables to users/tasks
+
+Revision ID: 5f3c8a1d2b60
+Revises: a2a02e2dd8c3
+Create Date: 2026-10-19 09:30:12.402871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f3c8a1d2b60'
+down_revision = 'a2a02e2dd8c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The models were renamed to users/tasks (and gained users.role) without a
+    # migration; databases built by create_all() already have them
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'user' in tables and 'users' not in tables:
+        op.rename_table('user', 'users')
+    if 'task' in tables and 'tasks' not in tables:
+        op.rename_table('task', 'tasks')
+
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('users')}
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        if 'role' not in columns:
+            batch_op.add_column(sa.Column('role', sa.String(length=20), nullable=True))
+        batch_op.alter_column('password_hash', existing_type=sa.String(length=128),
+                              type_=sa.String(length=200), existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('password_hash', existing_type=sa.String(length=200),
+                              type_=sa.String(length=128), existing_nullable=False)
+        batch_op.drop_column('role')
+    op.rename_table('tasks', 'task')
+    op.rename_table('users', 'user')
@@ -0,0 +1,35 @@
+"""add tasks_fts full-text index
+
+Revision ID: 7c41d2e9a8f3
+Revises: 3b879f64cac2
+Create Date: 2026-10-18 17:20:11.408213
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c41d2e9a8f3'
+down_revision = '3b879f64cac2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases fall back to LIKE queries
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts "
+        "USING fts5(title, description, owner, tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "INSERT INTO tasks_fts (rowid, title, description, owner) "
+        "SELECT id, title, coalesce(description, ''), 'u' || user_id FROM tasks"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE IF EXISTS tasks_fts")
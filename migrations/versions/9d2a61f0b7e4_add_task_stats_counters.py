@@ -0,0 +1,49 @@
+"""add task_stats and task_daily_stats counters
+
+Revision ID: 9d2a61f0b7e4
+Revises: 7c41d2e9a8f3
+Create Date: 2026-10-18 18:02:37.915340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2a61f0b7e4'
+down_revision = '7c41d2e9a8f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('task_daily_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('created', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    # Backfill from existing tasks; `flask reconcile-stats` repairs any later drift
+    op.execute(
+        "INSERT INTO task_stats (user_id, total, done) "
+        "SELECT user_id, count(*), sum(CASE WHEN done THEN 1 ELSE 0 END) FROM tasks GROUP BY user_id"
+    )
+    # Tasks without created_at count as created today (UTC), like stats_service._day()
+    op.execute(
+        "INSERT INTO task_daily_stats (user_id, day, created) "
+        "SELECT user_id, coalesce(date(created_at), CURRENT_DATE), count(*) FROM tasks "
+        "GROUP BY user_id, coalesce(date(created_at), CURRENT_DATE)"
+    )
+
+
+def downgrade():
+    op.drop_table('task_daily_stats')
+    op.drop_table('task_stats')
@@ -1,6 +1,8 @@
 from app import create_app
 
-app = create_app()
-
+# Only when run as a script: the password hasher's spawned workers re-import this
+# module as __mp_main__ and must not build an app of their own.
+# Servers use the factory instead, e.g. gunicorn "app:create_app()".
 if __name__ == "__main__":
+    app = create_app()
     app.run(debug=True)